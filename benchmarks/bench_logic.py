@@ -0,0 +1,254 @@
+"""
+Micro-benchmarks for the hot functions of settings.Logic.
+Times colour_set, filter_words, get_best_word, lie_detector, get_best_lie (each
+lie strategy), levenshtein_distance and the batched levenshtein_distances for each word
+length on the real dictionary and on synthetic ones (random words drawn from
+the real per-position letter frequencies). Setup such as building the feedback matrix is not timed. Cases
+that run out of memory are recorded as errors rather than stopping the run.
+Results are written as JSON; --compare flags cases slower than a saved
+baseline by more than --threshold and exits with status 1 if there are any.
+
+Usage: python -m benchmarks.bench_logic [--lengths 5,6,7] [--sizes real,10000,100000,1000000]
+       [--repeat N] [--output PATH] [--compare BASELINE] [--threshold 0.25]
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from settings import Logic
+from settings.Logic import (
+    load_valid_words, colour_set, filter_words, get_best_word, lie_detector, get_best_lie,
+    levenshtein_distance, levenshtein_distances, get_feedback_matrix, get_pattern_string,
+    init_extreme_candidates
+)
+
+WORDS_FILE = "Files/valid-wordle-words.txt"
+OUTPUT = "benchmarks/results-logic.json"
+PAIR_SAMPLE = 2000
+
+# A case prepares its inputs untimed and returns (timed callable, calls per run).
+Case = Callable[[List[str], random.Random], Tuple[Callable[[], Any], int]]
+
+
+def synthetic_words(size: int, word_length: int, rng: random.Random) -> List[str]:
+    """Distinct random words following the real dictionary's per-position letter frequencies."""
+    real = load_valid_words(WORDS_FILE, 5)
+    letters = Logic.words_to_array(real, 5) - ord("A")
+    frequencies = np.stack([np.bincount(letters[:, p], minlength=26) + 1 for p in range(5)])
+    frequencies = frequencies / frequencies.sum(axis=1, keepdims=True)
+
+    generator = np.random.default_rng(rng.randrange(2 ** 32))
+    words: set = set()
+    while len(words) < size:
+        batch = np.stack([generator.choice(26, size, p=frequencies[p % 5])
+                          for p in range(word_length)], axis=1)
+        codes = (batch + ord("A")).astype(np.uint32)
+        packed = codes.tobytes().decode("utf-32-le")
+        words.update(packed[i:i + word_length] for i in range(0, len(packed), word_length))
+    return sorted(rng.sample(sorted(words), size))
+
+
+def sample_pairs(words: List[str], rng: random.Random) -> List[Tuple[str, str]]:
+    return [(rng.choice(words), rng.choice(words)) for _ in range(PAIR_SAMPLE)]
+
+
+def opening(words: List[str], rng: random.Random) -> Tuple[str, str]:
+    """A (guess, pattern) first turn against a random secret."""
+    guess, secret = rng.choice(words), rng.choice(words)
+    return guess, get_pattern_string(colour_set(guess, secret, len(guess)))
+
+
+def case_colour_set(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+    pairs = sample_pairs(words, rng)
+    length = len(words[0])
+    return lambda: [colour_set(guess, secret, length) for guess, secret in pairs], len(pairs)
+
+
+def case_filter_words(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+    get_feedback_matrix(words)
+    guess, pattern = opening(words, rng)
+    return lambda: filter_words(pattern, guess, words), 1
+
+
+def case_get_best_word(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+    get_feedback_matrix(words)
+    guess, pattern = opening(words, rng)
+    candidates = filter_words(pattern, guess, words) or words[:3]
+    return lambda: get_best_word(candidates), 1
+
+
+def case_lie_detector(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+    get_feedback_matrix(words)
+    guess, pattern = opening(words, rng)
+    candidates = init_extreme_candidates(words)
+    return lambda: lie_detector(pattern, guess, candidates), 1
+
+
+def lie_case(strategy: str) -> Case:
+    """get_best_lie on the second turn of a game, as the EXTREME host calls it."""
+    def case(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+        get_feedback_matrix(words)
+        history = [opening(words, rng)]
+        guess, secret = rng.choice(words), rng.choice(words)
+        return lambda: get_best_lie(guess, words, len(guess), strategy, secret, history, rng), 1
+    return case
+
+
+def case_levenshtein(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+    # Pairwise calls against a sample of candidates (any cache cleared first).
+    query = rng.choice(words)
+    sample = [rng.choice(words) for _ in range(PAIR_SAMPLE)]
+
+    def run() -> Any:
+        clear = getattr(levenshtein_distance, "cache_clear", None)
+        if clear:
+            clear()
+        return [levenshtein_distance(word, query) for word in sample]
+    return run, len(sample)
+
+
+def case_levenshtein_distances(words: List[str], rng: random.Random) -> Tuple[Callable[[], Any], int]:
+    # The batched kernel against the whole dictionary, as the edit bot's first turns see it.
+    query = rng.choice(words)
+    return lambda: levenshtein_distances(query, words), len(words)
+
+
+CASES: Dict[str, Case] = {
+    "colour_set": case_colour_set,
+    "filter_words": case_filter_words,
+    "get_best_word": case_get_best_word,
+    "lie_detector": case_lie_detector,
+    "get_best_lie": lie_case("window"),
+    "get_best_lie_misleading": lie_case("misleading"),
+    "get_best_lie_plausible": lie_case("plausible"),
+    "levenshtein_distance": case_levenshtein,
+    "levenshtein_distances": case_levenshtein_distances,
+}
+
+
+def time_case(case: Case, words: List[str], seed: int, repeat: int) -> Dict[str, Any]:
+    """Runs one case repeat times; returns its timings or the error it raised."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    try:
+        run, calls = case(words, rng)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+    except MemoryError as e:
+        return {"error": f"MemoryError: {e}"}
+    median = statistics.median(times)
+    return {
+        "min_ms": min(times) * 1000,
+        "median_ms": median * 1000,
+        "calls": calls,
+        "per_call_us": median * 1e6 / calls,
+    }
+
+
+def run_suite(lengths: List[int], sizes: List[str], repeat: int, seed: int,
+              functions: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Times every selected function on every (length, dictionary) pair."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for length in lengths:
+        for size in sizes:
+            if size == "real":
+                words = load_valid_words(WORDS_FILE, length)
+            else:
+                words = synthetic_words(int(size), length, random.Random(seed + length))
+            if not words:
+                continue
+            # Each dictionary gets its own feedback matrix; drop the last one first.
+            Logic._FEEDBACK_MATRICES.clear()
+            Logic.use_dictionary(words)
+            for name, case in CASES.items():
+                if functions and name not in functions:
+                    continue
+                key = f"{name}/len{length}/{size}"
+                results[key] = dict(time_case(case, words, seed, repeat), words=len(words))
+                print(format_result(key, results[key]), flush=True)
+    Logic._FEEDBACK_MATRICES.clear()
+    Logic._DICTIONARY_WORDS.clear()
+    return results
+
+
+def format_result(key: str, result: Dict[str, Any]) -> str:
+    if "error" in result:
+        return f"{key:<40} {result['error']}"
+    return (f"{key:<40} {result['median_ms']:10.3f} ms  (min {result['min_ms']:.3f}, "
+            f"{result['per_call_us']:.2f} us/call)")
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[str]:
+    """Returns a line for every case whose median grew by more than threshold (or that now fails)."""
+    regressions = []
+    for key, result in current.items():
+        base = baseline.get(key)
+        if base is None or "error" in base:
+            continue
+        if "error" in result:
+            regressions.append(f"{key}: now fails ({result['error']})")
+            continue
+        ratio = result["median_ms"] / base["median_ms"] if base["median_ms"] else 1.0
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {base['median_ms']:.3f} ms -> {result['median_ms']:.3f} ms "
+                               f"({ratio:.2f}x)")
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def main() -> None:
+    """Runs the suite, writes the results and compares them with a baseline if given."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lengths", default="5,6,7")
+    parser.add_argument("--sizes", default="real,10000,100000,1000000")
+    parser.add_argument("--functions", default="", help="comma-separated subset of " + ",".join(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=OUTPUT)
+    parser.add_argument("--compare", metavar="BASELINE", help="results file to compare against")
+    parser.add_argument("--current", help="compare this results file instead of running the suite")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.current:
+        results = load_results(args.current)
+    else:
+        lengths = [int(n) for n in args.lengths.split(",")]
+        sizes = [s.strip() for s in args.sizes.split(",")]
+        functions = [f.strip() for f in args.functions.split(",") if f.strip()]
+        results = run_suite(lengths, sizes, args.repeat, args.seed, functions)
+        report = {
+            "meta": {"python": sys.version.split()[0], "numpy": np.__version__,
+                     "platform": platform.platform(), "repeat": args.repeat, "seed": args.seed},
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"wrote {args.output}")
+
+    if args.compare:
+        regressions = compare(results, load_results(args.compare), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%} against {args.compare}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark for the full-dictionary guess scorer.
+Times get_best_word from a cold start (empty feedback matrix) on the
+candidate sets left after a typical opening guess.
+
+Usage: python -m benchmarks.bench_solver [--repeat N]
+"""
+import argparse
+import time
+from typing import List
+
+from settings import Logic
+from settings.Logic import load_valid_words, filter_words, get_best_word, SCORING_METRICS
+
+WORDS_FILE = "Files/valid-wordle-words.txt"
+OPENINGS = [("CRANE", "xxyxx"), ("SLATE", "xyxxg"), ("AUDIO", "yxxxx")]
+TARGET_SECONDS = 1.0
+
+
+def time_cold_turn(words: List[str], guess: str, pattern: str, metric: str) -> float:
+    """Times one second-turn solve with the shared feedback matrix dropped first."""
+    Logic._FEEDBACK_MATRICES.clear()
+    start = time.perf_counter()
+    candidates = filter_words(pattern, guess, words)
+    get_best_word(candidates, metric)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Runs the benchmark and prints one line per opening and metric."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    words = load_valid_words(WORDS_FILE, 5)
+    slowest = 0.0
+    for metric in SCORING_METRICS:
+        for guess, pattern in OPENINGS:
+            best = min(time_cold_turn(words, guess, pattern, metric) for _ in range(args.repeat))
+            slowest = max(slowest, best)
+            print(f"{metric:<9} {guess} {pattern}  {best * 1000:8.1f} ms")
+
+    status = "OK" if slowest < TARGET_SECONDS else "SLOW"
+    print(f"slowest cold turn: {slowest * 1000:.1f} ms (target < {TARGET_SECONDS * 1000:.0f} ms) {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark for the import cost of the PvE module at startup.
+Each scenario runs in a fresh interpreter. "lazy" is what startup pays now;
+"eager" adds the google.genai import and client construction that used to
+run at import time (and now runs only on the first VS GEMINI AI game).
+
+Usage: python -m benchmarks.bench_startup [--repeat N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+SCENARIOS: Dict[str, str] = {
+    "lazy": "import modes.PveMode",
+    "eager": (
+        "import modes.PveMode\n"
+        "from google import genai\n"
+        "genai.Client(api_key='benchmark-key')"
+    ),
+}
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(elapsed, 'google.genai' in sys.modules)
+"""
+
+
+def time_scenario(code: str) -> List[str]:
+    """Runs one scenario in a fresh interpreter and returns its (seconds, genai loaded) line."""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    env.pop("WORDLE_FAKE_GEMINI", None)
+    result = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], env=env,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1].split()
+
+
+def main() -> None:
+    """Runs every scenario and prints the median import time."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    medians: Dict[str, float] = {}
+    for name, code in SCENARIOS.items():
+        runs = [time_scenario(code) for _ in range(args.repeat)]
+        medians[name] = statistics.median(float(seconds) for seconds, _ in runs)
+        print(f"{name:<6} {medians[name] * 1000:8.1f} ms  (google.genai loaded: {runs[0][1]})")
+
+    print(f"saved at startup: {(medians['eager'] - medians['lazy']) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Bot tournament: every strategy plays every dictionary word (or a seeded sample).
+The host is a headless PlayerEngine (EXTREME for "extreme-lies", so one turn
+gets a get_best_lie pattern, chosen by --lie-strategy); games are spread
+across a process pool, one strategy at a time. Each strategy reports its guess
+distribution, failure rate, time per move (mean and p99) and games per second.
+
+Strategies:
+  solver        opening book, then the get_best_word scorer (SolverState)
+  edit          get_edit_distance_guess (through the neighbour index), the PvE EDIT bot
+  random        a random remaining candidate
+  extreme       the EXTREME lie-detector solver (ExtremeState) with an honest host
+  extreme-lies  the same solver against a host that lies once
+
+Usage: python -m benchmarks.bench_tournament [--length N] [--sample N] [--seed S]
+       [--strategies solver,edit] [--lie-strategy window] [--workers N] [--json PATH]
+"""
+import argparse
+import json
+import os
+import random
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from settings.Dictionary import get_dictionary, WORDS_FILE
+from settings.Logic import LIE_STRATEGIES, use_dictionary
+from settings.Engine import PlayerEngine, GUESS, INVALID, edit_bot_guess, local_bot_guess
+from settings.OpeningBook import OpeningBook, get_opening_book
+from settings.NeighborIndex import NeighborIndex, get_neighbor_index
+from settings.Solver import SolverState, ExtremeState
+
+STRATEGIES = ("solver", "edit", "random", "extreme", "extreme-lies")
+CHUNK_SIZE = 64
+
+
+class Contestant:
+    """One strategy playing games against a headless host."""
+
+    def __init__(self, strategy: str, words: Any, book: Optional[OpeningBook] = None,
+                 max_attempts: int = 6, neighbors: Optional[NeighborIndex] = None,
+                 lie_strategy: str = "window") -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.book = book
+        self.neighbors = neighbors
+        word_list = list(getattr(words, "words", words))
+        difficulty = "EXTREME" if strategy == "extreme-lies" else "NORMAL"
+        self.host = PlayerEngine(words, difficulty, len(word_list[0]), max_attempts,
+                                 lie_strategy=lie_strategy)
+        self.words = self.host.words
+        self.base_state: SolverState
+        if strategy.startswith("extreme"):
+            self.base_state = ExtremeState.from_words(word_list, lie_budget=1)
+        else:
+            self.base_state = SolverState.from_words(word_list)
+
+    def choose(self, state: SolverState, last_guess: str, rng: random.Random) -> str:
+        """The strategy's next guess."""
+        if len(state) == 0:
+            return rng.choice(self.words)
+        if self.strategy == "edit":
+            return edit_bot_guess(state, last_guess, self.words, rng, self.neighbors)
+        if self.strategy == "random":
+            return state.matrix.words[int(rng.choice(state.candidate_ids))]
+        if self.strategy == "solver":
+            return local_bot_guess(state, self.book)
+        if not state.history and self.book:
+            return self.book.opener
+        return state.best_guess()
+
+    def play(self, secret_word: str, seed: int) -> Tuple[int, List[float]]:
+        """
+        Plays one game. Returns the guesses needed (0 if it was lost) and the
+        seconds each move took, counting the state update for the last feedback.
+        """
+        rng = random.Random(seed)
+        self.host.rng = rng
+        self.host.new_round(secret_word)
+        state = self.base_state.clone()
+        move_times: List[float] = []
+        feedback: Optional[Tuple[str, str]] = None
+        last_guess = ""
+
+        while True:
+            start = time.perf_counter()
+            if feedback is not None:
+                state.apply(*feedback)
+            guess = self.choose(state, last_guess, rng)
+            move_times.append(time.perf_counter() - start)
+
+            snapshot = self.host.step((GUESS, guess))
+            if snapshot.event == INVALID:
+                raise ValueError(f"{self.strategy} guessed a word outside the dictionary: {guess}")
+            if snapshot.won:
+                return len(snapshot.guesses), move_times
+            if snapshot.game_over:
+                return 0, move_times
+            feedback = (guess, "".join(t[2] for t in snapshot.guesses[-1]))
+            last_guess = guess
+
+
+def game_seed(seed: int, strategy: str, secret_word: str) -> int:
+    """Per-game seed, independent of how games are split across workers."""
+    return zlib.crc32(f"{seed}:{strategy}:{secret_word}".encode())
+
+
+# --- Worker processes ---
+_WORKER: Dict[str, Any] = {}
+
+
+def init_worker(word_length: int, words_file: str, max_attempts: int,
+                lie_strategy: str = "window") -> None:
+    """Loads the dictionary and opening book once per worker process."""
+    words = get_dictionary(word_length, words_file)
+    # The host only accepts its own words, so the solvers must guess from them too.
+    use_dictionary(words.words)
+    _WORKER.update(words=words, book=get_opening_book(words.words, word_length),
+                   neighbors=get_neighbor_index(words.words, word_length),
+                   max_attempts=max_attempts, lie_strategy=lie_strategy, contestants={})
+
+
+def play_chunk(strategy: str, secret_words: List[str], seed: int) -> Tuple[List[int], List[float]]:
+    """Plays a chunk of games in a worker; returns the guesses per game and all move times."""
+    contestants = _WORKER["contestants"]
+    if strategy not in contestants:
+        contestants[strategy] = Contestant(strategy, _WORKER["words"], _WORKER["book"],
+                                           _WORKER["max_attempts"], _WORKER["neighbors"],
+                                           _WORKER["lie_strategy"])
+    contestant = contestants[strategy]
+    guesses: List[int] = []
+    move_times: List[float] = []
+    for secret_word in secret_words:
+        used, times = contestant.play(secret_word, game_seed(seed, strategy, secret_word))
+        guesses.append(used)
+        move_times.extend(times)
+    return guesses, move_times
+
+
+# --- Reporting ---
+def summarize(guesses: Sequence[int], move_times: Sequence[float], seconds: float,
+              max_attempts: int) -> Dict[str, Any]:
+    """Aggregates one strategy's games into the reported statistics."""
+    counts = np.bincount(np.asarray(guesses, dtype=np.intp), minlength=max_attempts + 1)
+    times_ms = np.asarray(move_times, dtype=np.float64) * 1000
+    solved = int(counts[1:].sum())
+    games = len(guesses)
+    distribution = {str(n): int(counts[n]) for n in range(1, max_attempts + 1)}
+    distribution["X"] = int(counts[0])
+    return {
+        "games": games,
+        "solved": solved,
+        "failure_rate": (games - solved) / games if games else 0.0,
+        "mean_guesses": float(sum(n * counts[n] for n in range(1, max_attempts + 1)) / solved)
+        if solved else 0.0,
+        "distribution": distribution,
+        "moves": len(times_ms),
+        "mean_move_ms": float(times_ms.mean()) if len(times_ms) else 0.0,
+        "p99_move_ms": float(np.percentile(times_ms, 99)) if len(times_ms) else 0.0,
+        "seconds": seconds,
+        "games_per_second": games / seconds if seconds > 0 else 0.0,
+    }
+
+
+def format_table(results: Dict[str, Dict[str, Any]], max_attempts: int) -> str:
+    """Renders the results as a fixed-width text table."""
+    columns = [str(n) for n in range(1, max_attempts + 1)] + ["X"]
+    header = (f"{'strategy':<13}{'games':>7}{'fail':>8}{'mean':>6}  "
+              + "".join(f"{c:>6}" for c in columns)
+              + f"{'move ms':>10}{'p99 ms':>9}{'games/s':>10}")
+    lines = [header, "-" * len(header)]
+    for strategy, stats in results.items():
+        lines.append(
+            f"{strategy:<13}{stats['games']:>7}{stats['failure_rate']:>8.2%}{stats['mean_guesses']:>6.2f}  "
+            + "".join(f"{stats['distribution'][c]:>6}" for c in columns)
+            + f"{stats['mean_move_ms']:>10.2f}{stats['p99_move_ms']:>9.2f}{stats['games_per_second']:>10.1f}")
+    return "\n".join(lines)
+
+
+def run_tournament(strategies: Sequence[str], secret_words: List[str], word_length: int,
+                   max_attempts: int = 6, seed: int = 0, workers: Optional[int] = None,
+                   words_file: str = WORDS_FILE,
+                   lie_strategy: str = "window") -> Dict[str, Dict[str, Any]]:
+    """Plays every secret word with each strategy across a process pool."""
+    chunks = [secret_words[i:i + CHUNK_SIZE] for i in range(0, len(secret_words), CHUNK_SIZE)]
+    results: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(word_length, words_file, max_attempts, lie_strategy)) as pool:
+        for strategy in strategies:
+            start = time.perf_counter()
+            guesses: List[int] = []
+            move_times: List[float] = []
+            for chunk_guesses, chunk_times in pool.map(play_chunk, [strategy] * len(chunks),
+                                                      chunks, [seed] * len(chunks)):
+                guesses.extend(chunk_guesses)
+                move_times.extend(chunk_times)
+            results[strategy] = summarize(guesses, move_times, time.perf_counter() - start,
+                                          max_attempts)
+    return results
+
+
+def main() -> None:
+    """Runs the tournament and prints the table (and writes JSON if asked)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--length", type=int, default=5)
+    parser.add_argument("--words", default=WORDS_FILE)
+    parser.add_argument("--sample", type=int, default=0, help="games per strategy (0: every word)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    parser.add_argument("--max-attempts", type=int, default=6)
+    parser.add_argument("--lie-strategy", choices=LIE_STRATEGIES, default="window",
+                        help="how the extreme-lies host lies")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--json", help="also write the results as JSON to this path ('-' for stdout)")
+    args = parser.parse_args()
+
+    strategies = [s.strip() for s in args.strategies.split(",") if s.strip()]
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)} (choose from {', '.join(STRATEGIES)})")
+
+    # Build the opening book and neighbour index (if stale) once here rather than in every worker.
+    words = get_dictionary(args.length, args.words)
+    use_dictionary(words.words)
+    get_opening_book(words.words, args.length)
+    get_neighbor_index(words.words, args.length)
+    secret_words = list(words.words)
+    if 0 < args.sample < len(secret_words):
+        secret_words = random.Random(args.seed).sample(secret_words, args.sample)
+
+    results = run_tournament(strategies, secret_words, args.length, args.max_attempts,
+                             args.seed, args.workers, args.words, args.lie_strategy)
+    print(format_table(results, args.max_attempts))
+
+    if args.json:
+        report = {"length": args.length, "seed": args.seed, "sample": len(secret_words),
+                  "max_attempts": args.max_attempts, "lie_strategy": args.lie_strategy,
+                  "workers": args.workers, "strategies": results}
+        if args.json == "-":
+            print(json.dumps(report, indent=2))
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
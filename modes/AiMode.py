@@ -4,29 +4,36 @@ In this mode, the User enters a secret word (mentally), and the AI tries to gues
 The user provides feedback (Green/Yellow/Gray) for the AI's suggestions.
 """
 import sys
-import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 import pygame
 
-from settings.Logic import (
-    load_valid_words, filter_words, get_best_word, lie_detector,
-    init_extreme_candidates, Button
+from settings.Button import Button
+from settings.Dictionary import get_dictionary
+from settings.Engine import (
+    SolverEngine, solve_turn, degraded_turn, PATTERN, MARK, DELETE, SUBMIT, RESOLVE, RESTART
 )
+from settings.OpeningBook import OpeningBook, get_opening_book
+from settings.DecisionTree import load_decision_tree
+from settings.Worker import SolverWorker, draw_spinner
+from settings.RenderCache import RENDER_CACHE
+from settings.FrameLoop import FrameLoop
+from settings.Compositor import Compositor
+from settings.Profiler import PROFILER
 from settings.Constants import (
     WIDTH, HEIGHT, FONT_NAME, FONT_SIZE_TITLE, FONT_SIZE_MED,
     FONT_SIZE_SMALL, COLOR_PANEL_BG, COLOR_CORRECT, COLOR_PRESENT,
     COLOR_ABSENT, COLOR_BORDER, COLOR_BLUE, COLOR_ACCENT,
-    COLOR_TEXT, COLOR_BG, COLOR_RED
+    COLOR_TEXT, COLOR_RED
 )
 
 
 def get_fonts() -> Dict[str, pygame.font.Font]:
     """Initializes and returns the required fonts."""
     return {
-        "large": pygame.font.SysFont(FONT_NAME, FONT_SIZE_TITLE, bold=True),
-        "med": pygame.font.SysFont(FONT_NAME, FONT_SIZE_MED, bold=True),
-        "small": pygame.font.SysFont(FONT_NAME, FONT_SIZE_SMALL),
-        "result": pygame.font.SysFont(FONT_NAME, 40, bold=True)
+        "large": RENDER_CACHE.font(FONT_NAME, FONT_SIZE_TITLE, bold=True),
+        "med": RENDER_CACHE.font(FONT_NAME, FONT_SIZE_MED, bold=True),
+        "small": RENDER_CACHE.font(FONT_NAME, FONT_SIZE_SMALL),
+        "result": RENDER_CACHE.font(FONT_NAME, 40, bold=True)
     }
 
 
@@ -41,23 +48,18 @@ def draw_tile(screen: pygame.Surface, x: int, y: int, size: int,
     elif color_code == 'x':
         bg_color = COLOR_ABSENT
 
-    rect = pygame.Rect(x, y, size, size)
-    pygame.draw.rect(screen, bg_color, rect, border_radius=4)
-    pygame.draw.rect(screen, COLOR_BORDER, rect, 2, border_radius=4)
-
-    if letter:
-        text_surf = font.render(letter, True, COLOR_TEXT)
-        text_rect = text_surf.get_rect(center=rect.center)
-        screen.blit(text_surf, text_rect)
+    screen.blit(RENDER_CACHE.tile(letter, size, bg_color, COLOR_BORDER, COLOR_TEXT,
+                                  radius=4, font=font), (x, y))
 
 
+@PROFILER.traced(category="draw")
 def draw_history_panel(screen: pygame.Surface, rect: pygame.Rect,
                        history: List[Tuple[str, str]], fonts: Dict[str, pygame.font.Font]) -> None:
     """Draws the list of previous guesses made by the AI."""
     pygame.draw.rect(screen, COLOR_PANEL_BG, rect, border_radius=10)
     pygame.draw.rect(screen, COLOR_BLUE, rect, 2, border_radius=10)
 
-    title = fonts["med"].render("HISTORY", True, COLOR_BLUE)
+    title = RENDER_CACHE.text("HISTORY", fonts["med"], COLOR_BLUE)
     screen.blit(title, (rect.x + 20, rect.y + 20))
 
     start_y = rect.y + 70
@@ -66,7 +68,7 @@ def draw_history_panel(screen: pygame.Surface, rect: pygame.Rect,
 
     for i, (word, pattern) in enumerate(history):
         # Draw Index
-        idx_surf = fonts["small"].render(f"{i + 1}.", True, COLOR_ACCENT)
+        idx_surf = RENDER_CACHE.text(f"{i + 1}.", fonts["small"], COLOR_ACCENT)
         screen.blit(idx_surf, (rect.x + 15, start_y + 10))
 
         # Draw Word Tiles
@@ -76,6 +78,7 @@ def draw_history_panel(screen: pygame.Surface, rect: pygame.Rect,
         start_y += tile_size + 10
 
 
+@PROFILER.traced(category="draw")
 def draw_input_panel(screen: pygame.Surface, rect: pygame.Rect, current_suggestion: str,
                      input_pattern: str, message: str, word_length: int,
                      fonts: Dict[str, pygame.font.Font]) -> None:
@@ -84,9 +87,9 @@ def draw_input_panel(screen: pygame.Surface, rect: pygame.Rect, current_suggesti
     pygame.draw.rect(screen, COLOR_CORRECT, rect, 2, border_radius=10)
 
     # Labels
-    screen.blit(fonts["small"].render("AI SUGGESTION:", True, COLOR_CORRECT), (rect.x + 20, rect.y + 20))
-    screen.blit(fonts["large"].render(current_suggestion, True, COLOR_TEXT), (rect.x + 20, rect.y + 50))
-    screen.blit(fonts["small"].render("ENTER PATTERN (Click or Type G/Y/X):", True, COLOR_ACCENT),
+    screen.blit(RENDER_CACHE.text("AI SUGGESTION:", fonts["small"], COLOR_CORRECT), (rect.x + 20, rect.y + 20))
+    screen.blit(RENDER_CACHE.text(current_suggestion, fonts["large"], COLOR_TEXT), (rect.x + 20, rect.y + 50))
+    screen.blit(RENDER_CACHE.text("ENTER PATTERN (Click or Type G/Y/X):", fonts["small"], COLOR_ACCENT),
                 (rect.x + 20, rect.y + 130))
 
     # Tiles
@@ -104,23 +107,32 @@ def draw_input_panel(screen: pygame.Surface, rect: pygame.Rect, current_suggesti
 
     # Message
     msg_color = COLOR_PRESENT if "Error" in message else COLOR_TEXT
-    msg_surf = fonts["small"].render(message, True, msg_color)
+    msg_surf = RENDER_CACHE.text(message, fonts["small"], msg_color)
     screen.blit(msg_surf, (rect.centerx - msg_surf.get_width() // 2, rect.y + 270))
 
 
+@PROFILER.traced(category="draw")
 def draw_stats_panel(screen: pygame.Surface, rect: pygame.Rect, words_left: int,
-                     attempts: int, fonts: Dict[str, pygame.font.Font]) -> None:
+                     attempts: int, fonts: Dict[str, pygame.font.Font],
+                     lie_turn: Optional[int] = None, turn_ms: Optional[float] = None) -> None:
     """Draws the statistics panel (Possible words remaining)."""
     pygame.draw.rect(screen, COLOR_PANEL_BG, rect, border_radius=10)
     pygame.draw.rect(screen, COLOR_RED, rect, 2, border_radius=10)
 
-    screen.blit(fonts["med"].render("STATISTICS", True, COLOR_RED), (rect.x + 20, rect.y + 20))
-    screen.blit(fonts["med"].render(f"POSSIBLE WORDS: {words_left}", True, COLOR_TEXT),
+    screen.blit(RENDER_CACHE.text("STATISTICS", fonts["med"], COLOR_RED), (rect.x + 20, rect.y + 20))
+    screen.blit(RENDER_CACHE.text(f"POSSIBLE WORDS: {words_left}", fonts["med"], COLOR_TEXT),
                 (rect.x + 40, rect.y + 80))
-    screen.blit(fonts["med"].render(f"ATTEMPTS: {attempts}", True, COLOR_TEXT),
+    screen.blit(RENDER_CACHE.text(f"ATTEMPTS: {attempts}", fonts["med"], COLOR_TEXT),
                 (rect.x + 40, rect.y + 140))
+    if lie_turn is not None:
+        screen.blit(RENDER_CACHE.text(f"SUSPECTED LIE: TURN {lie_turn + 1}", fonts["med"], COLOR_PRESENT),
+                    (rect.x + 40, rect.y + 200))
+    if turn_ms is not None:
+        screen.blit(RENDER_CACHE.text(f"LAST TURN: {turn_ms:.0f} ms", fonts["small"], COLOR_ACCENT),
+                    (rect.x + 40, rect.y + 260))
 
 
+@PROFILER.traced(category="draw")
 def draw_end_message(screen: pygame.Surface, panel_rect: pygame.Rect, won: bool,
                      word: str, fonts: Dict[str, pygame.font.Font]) -> None:
     """Draws the overlay when the game ends."""
@@ -135,54 +147,53 @@ def draw_end_message(screen: pygame.Surface, panel_rect: pygame.Rect, won: bool,
     msg = "VICTORY!" if won else "GAME OVER"
     color = COLOR_CORRECT if won else COLOR_RED
 
-    text_surf = fonts["result"].render(msg, True, color)
+    text_surf = RENDER_CACHE.text(msg, fonts["result"], color)
     text_rect = text_surf.get_rect(center=(center_x, center_y - 80))
     screen.blit(text_surf, text_rect)
 
     if not won:
-        sub_text = fonts["small"].render("No matching words found in dictionary.", True, COLOR_TEXT)
+        sub_text = RENDER_CACHE.text("No matching words found in dictionary.", fonts["small"], COLOR_TEXT)
         sub_rect = sub_text.get_rect(center=(center_x, center_y - 20))
         screen.blit(sub_text, sub_rect)
 
     if won:
         word_msg = f"The word was: {word}"
-        word_surf = fonts["result"].render(word_msg, True, (255, 255, 255))
+        word_surf = RENDER_CACHE.text(word_msg, fonts["result"], (255, 255, 255))
         word_rect = word_surf.get_rect(center=(center_x, center_y + 20))
         screen.blit(word_surf, word_rect)
 
 
 def run_ai_mode(difficulty: str, word_length: int = 5) -> str:
     """
-    Main loop for the AI Solver Mode.
+    Main loop for the AI Solver Mode (the rules live in SolverEngine).
     """
     pygame.init()
     screen = pygame.display.get_surface()
     fonts = get_fonts()
 
-    # Load Words
-    try:
-        possible_words = load_valid_words("Files/valid-wordle-words.txt", length=word_length)
-    except FileNotFoundError:
-        possible_words = ["ERROR"]
+    # Shared dictionary (RESTART goes back to a clone of the initial state)
+    valid_words = get_dictionary(word_length).words
+
+    if not valid_words:
+        valid_words = ["ERROR"]
 
-    # Extreme Mode Setup
-    extreme_candidates: Dict[str, int] = {}
-    if difficulty == "EXTREME":
-        extreme_candidates = init_extreme_candidates(possible_words)
+    def book_ready(ready: OpeningBook) -> None:
+        # Called from the builder thread; the next game (or reply) uses it.
+        engine.book = ready
 
-    if not possible_words:
-        possible_words = ["ERROR"]
+    # A stale opening book is rebuilt in the background; the live solver opens until then.
+    # A prebuilt decision tree (normal mode only) picks every guess without computation.
+    book = get_opening_book(valid_words, word_length, on_ready=book_ready)
+    tree = load_decision_tree(valid_words, word_length) if difficulty != "EXTREME" else None
+    engine = SolverEngine(valid_words, difficulty, book, tree)
+    state = engine.snapshot()
 
-    # Game State
-    guessed_history: List[Tuple[str, str]] = []
-    current_suggestion = random.choice(possible_words)
-    input_pattern: List[str] = []
-    attempts = 1
-    message = "Click boxes or type G/Y/X"
-    game_state = "PLAYING"
+    # Turns are computed on a worker thread while the engine is THINKING.
+    worker = SolverWorker()
+    turn_ms: Optional[float] = None
 
-    clock = pygame.time.Clock()
-    running = True
+    frame_loop = FrameLoop()
+    compositor = Compositor()
 
     # Layout Rects
     history_rect = pygame.Rect(20, 20, 400, HEIGHT - 40)
@@ -208,131 +219,105 @@ def run_ai_mode(difficulty: str, word_length: int = 5) -> str:
     restart_btn = Button(restart_x, btn_y, end_btn_w, end_btn_h, "RESTART", (60, 60, 70))
     home_btn = Button(home_x, btn_y, end_btn_w, end_btn_h, "HOME", (60, 60, 70))
 
-    while running:
-        # --- Logic Helper ---
-        def execute_turn() -> None:
-            nonlocal game_state, current_suggestion, attempts, message, possible_words, extreme_candidates
-
-            pat_str = "".join(input_pattern)
-
-            if pat_str == ("g" * word_length):
-                game_state = "WON"
-                guessed_history.append((current_suggestion, pat_str))
-            else:
-                guessed_history.append((current_suggestion, pat_str))
-                attempts += 1
-                message = "CALCULATING..."
-
-                # Render loading state immediately
-                screen.fill(COLOR_BG)
-                draw_history_panel(screen, history_rect, guessed_history, fonts)
-                draw_input_panel(screen, input_rect, current_suggestion, pat_str, message, word_length, fonts)
-                draw_stats_panel(screen, stats_rect, len(possible_words), attempts, fonts)
-                pygame.display.flip()
-
-                # Filter Logic
-                if difficulty == "EXTREME":
-                    extreme_candidates = lie_detector(pat_str, current_suggestion, extreme_candidates)
-                    possible_words = list(extreme_candidates.keys())
-                else:
-                    possible_words = filter_words(pat_str, current_suggestion, possible_words)
-
-                # Determine Next Step
-                if not possible_words:
-                    game_state = "LOST"
-                elif len(possible_words) == 1:
-                    current_suggestion = possible_words[0]
-                    message = "SOLVED! Word found."
-                    game_state = "WON"
-                else:
-                    if pat_str == ("x" * word_length) or len(extreme_candidates) > 10000:
-                        current_suggestion = random.choice(possible_words)
-                    else:
-                        current_suggestion = get_best_word(possible_words)
-                    message = "Type pattern for new word"
-
-                input_pattern.clear()
+    # Tile hit boxes for clicking colours
+    tile_size = 80
+    total_width = (word_length * tile_size) + ((word_length - 1) * 10)
+    start_x = input_rect.x + (input_rect.width - total_width) // 2
+    tile_rects = [pygame.Rect(start_x + i * (tile_size + 10), input_rect.y + 170, tile_size, tile_size)
+                  for i in range(word_length)]
+    pattern_keys = {pygame.K_g: "g", pygame.K_y: "y", pygame.K_x: "x"}
+
+    def act(action: Tuple) -> None:
+        """Steps the engine and hands a newly submitted turn to the worker."""
+        nonlocal state, turn_ms
+        state = engine.step(action)
+        if action[0] == RESTART:
+            worker.cancel()
+            turn_ms = None
+        elif state.status == "THINKING" and engine.pending is not None and worker.current is None:
+            worker.submit(solve_turn, *engine.pending, cancellable=True)
+
+    while True:
+        # --- Worker Handoff ---
+        message = state.message
+        finished = worker.poll()
+        if finished is not None:
+            job, result = finished
+            turn_ms = job.elapsed() * 1000
+            if job.error is not None and engine.pending is not None:
+                # The search failed: finish the turn from the pre-turn state without it.
+                result = degraded_turn(engine.solver.clone(), *engine.pending[1:])
+            act((RESOLVE, result))
+            message = state.message
+        elif worker.current is not None:
+            message = f"CALCULATING... {worker.current.elapsed():.1f}s"
 
         # --- Event Loop ---
-        for event in pygame.event.get():
+        # The spinner animates while a turn is computed; otherwise wait for input.
+        for event in frame_loop.events(active=state.status == "THINKING"):
             if event.type == pygame.QUIT:
+                worker.shutdown()
                 pygame.quit()
                 sys.exit()
 
             if event.type == pygame.MOUSEBUTTONDOWN:
-                if game_state == "PLAYING":
+                if state.status == "PLAYING":
                     # Tile Click Logic
-                    tile_size = 80
-                    gap = 10
-                    total_width = (word_length * tile_size) + ((word_length - 1) * gap)
-                    start_x = input_rect.x + (input_rect.width - total_width) // 2
-                    tile_y = input_rect.y + 170
-
-                    for i in range(word_length):
-                        t_rect = pygame.Rect(start_x + i * (tile_size + gap), tile_y, tile_size, tile_size)
+                    for i, t_rect in enumerate(tile_rects):
                         if t_rect.collidepoint(event.pos):
-                            while len(input_pattern) <= i:
-                                input_pattern.append('x')
-                            curr = input_pattern[i]
-                            # Cycle colors: x -> y -> g -> x
-                            if curr == 'x':
-                                input_pattern[i] = 'y'
-                            elif curr == 'y':
-                                input_pattern[i] = 'g'
-                            else:
-                                input_pattern[i] = 'x'
-
-                    if submit_btn.is_clicked(event.pos) and len(input_pattern) == word_length:
-                        execute_turn()
+                            act((MARK, i))
+
+                    if submit_btn.is_clicked(event.pos):
+                        act((SUBMIT,))
 
                 else:
-                    # Game Over Buttons
+                    # Game Over Buttons (also cancel a turn still being computed)
                     if restart_btn.is_clicked(event.pos):
-                        # Reset
-                        if difficulty == "EXTREME":
-                            extreme_candidates = init_extreme_candidates(
-                                load_valid_words("Files/valid-wordle-words.txt", length=word_length))
-                            possible_words = list(extreme_candidates.keys())
-                        else:
-                            possible_words = load_valid_words("Files/valid-wordle-words.txt", length=word_length)
-
-                        guessed_history = []
-                        current_suggestion = random.choice(possible_words)
-                        input_pattern = []
-                        attempts = 1
-                        message = "Click boxes or type G/Y/X"
-                        game_state = "PLAYING"
+                        act((RESTART,))
 
                     elif home_btn.is_clicked(event.pos):
+                        worker.shutdown()
                         return "HOME"
 
-            if event.type == pygame.KEYDOWN and game_state == "PLAYING":
-                if event.key == pygame.K_g:
-                    if len(input_pattern) < word_length: input_pattern.append('g')
-                elif event.key == pygame.K_y:
-                    if len(input_pattern) < word_length: input_pattern.append('y')
-                elif event.key == pygame.K_x:
-                    if len(input_pattern) < word_length: input_pattern.append('x')
+            if event.type == pygame.KEYDOWN and state.status == "PLAYING":
+                if event.key in pattern_keys:
+                    act((PATTERN, pattern_keys[event.key]))
                 elif event.key == pygame.K_BACKSPACE:
-                    if len(input_pattern) > 0: input_pattern.pop()
+                    act((DELETE,))
                 elif event.key == pygame.K_RETURN:
-                    if len(input_pattern) == word_length:
-                        execute_turn()
-
-        # --- Draw ---
-        screen.fill(COLOR_BG)
-        draw_history_panel(screen, history_rect, guessed_history, fonts)
-        draw_input_panel(screen, input_rect, current_suggestion, "".join(input_pattern), message, word_length, fonts)
-        draw_stats_panel(screen, stats_rect, len(possible_words), attempts, fonts)
-
-        if game_state == "PLAYING":
-            submit_btn.draw(screen)
+                    act((SUBMIT,))
+
+        # --- Draw (each panel is redrawn only when what it shows changes) ---
+        RENDER_CACHE.begin_frame()
+        if state.status != "THINKING":
+            message = state.message
+        history = list(state.history)
+        compositor.layer("history", history_rect, state.history,
+                         lambda s: draw_history_panel(s, history_rect, history, fonts), screen)
+        compositor.layer("input", input_rect, (state.suggestion, state.pattern, message),
+                         lambda s: draw_input_panel(s, input_rect, state.suggestion, state.pattern, message,
+                                                    word_length, fonts), screen)
+        compositor.layer("stats", stats_rect, (state.words_left, state.attempts, state.lie_turn, turn_ms),
+                         lambda s: draw_stats_panel(s, stats_rect, state.words_left, state.attempts, fonts,
+                                                    state.lie_turn, turn_ms), screen)
+
+        if state.status == "PLAYING":
+            compositor.button("submit", submit_btn, screen)
+        elif state.status == "THINKING":
+            # Quantized to the spinner's steps so only real changes redraw it.
+            step = int((worker.current.elapsed() if worker.current else 0.0) * 12)
+            center = (input_rect.right - 60, input_rect.y + 75)
+            compositor.layer("spinner", (center[0] - 30, center[1] - 30, 60, 60), step % 8,
+                             lambda s: draw_spinner(s, center, 20, COLOR_CORRECT, step / 12), screen)
+            compositor.button("restart", restart_btn, screen)
+            compositor.button("home", home_btn, screen)
         else:
-            draw_end_message(screen, input_rect, game_state == "WON", current_suggestion, fonts)
-            restart_btn.draw(screen)
-            home_btn.draw(screen)
-
-        pygame.display.flip()
-        clock.tick(30)
-
-    return "HOME"
\ No newline at end of file
+            compositor.layer("end", input_rect, (state.status, state.suggestion),
+                             lambda s: draw_end_message(s, input_rect, state.status == "WON",
+                                                        state.suggestion, fonts), screen)
+            compositor.button("restart", restart_btn, screen)
+            compositor.button("home", home_btn, screen)
+
+        compositor.stats_overlay(frame_loop, screen)
+        compositor.present(screen)
+        RENDER_CACHE.end_frame()
@@ -1,12 +1,19 @@
 """
 Single Player Mode.
 """
-import random
-from typing import Dict, List, Any, Tuple
+from typing import Container, Dict, List, Any, Optional, Tuple
 import pygame
 
 from settings import JsonStats
-from settings.Logic import colour_set, load_valid_words, get_best_lie, Button
+from settings.Engine import (
+    PlayerEngine, calculate_score, TYPE, DELETE, ENTER, NEXT, INVALID
+)
+from settings.Button import Button
+from settings.Dictionary import get_dictionary
+from settings.RenderCache import RENDER_CACHE
+from settings.FrameLoop import FrameLoop
+from settings.Compositor import Compositor
+from settings.Profiler import PROFILER
 from settings.Constants import (
     WIDTH, HEIGHT, FONT_NAME, FONT_SIZE_GUESS, COLOR_PANEL_BG,
     COLOR_BORDER, COLOR_ABSENT, COLOR_TEXT, COLOR_ABSENT_BORDER,
@@ -17,23 +24,10 @@ from settings.Constants import (
 pygame.init()
 
 
-def calculate_score(word_length: int, max_attempts: int, attempts_taken: int, difficulty: str) -> int:
-    """Calculates the score based on attempts and difficulty."""
-    unused_attempts = max_attempts - attempts_taken
-    base_score = word_length * 50
-    bonus_score = unused_attempts * 100
-
-    total_score = base_score + bonus_score
-
-    if difficulty == "EXTREME":
-        total_score *= 2
-
-    return total_score
-
-
+@PROFILER.traced(category="draw")
 def draw_alphabet(screen: pygame.Surface, alphabet_colors: Dict[str, Tuple[int, int, int]]) -> None:
     """Draws the on-screen keyboard."""
-    font = pygame.font.SysFont(FONT_NAME, 24, bold=True)
+    font = RENDER_CACHE.font(FONT_NAME, 24, bold=True)
     key_size = 40
     margin = 5
     start_y = HEIGHT - 200
@@ -52,24 +46,16 @@ def draw_alphabet(screen: pygame.Surface, alphabet_colors: Dict[str, Tuple[int,
         for j, char in enumerate(row_keys):
             x_pos = start_x + j * (key_size + margin)
             color = alphabet_colors.get(char, COLOR_PANEL_BG)
-            border_c = COLOR_BORDER
-            if color == COLOR_ABSENT:
-                border_c = COLOR_ABSENT
-
-            rect = pygame.Rect(x_pos, y_pos, key_size, key_size)
-            pygame.draw.rect(screen, color, rect, border_radius=4)
-            if color == COLOR_PANEL_BG:
-                pygame.draw.rect(screen, border_c, rect, 1, border_radius=4)
+            # Only untouched keys show a border; the others are one flat colour.
+            border_c = COLOR_BORDER if color == COLOR_PANEL_BG else color
 
-            text_surface = font.render(char, True, COLOR_TEXT)
-            text_rect = text_surface.get_rect(center=rect.center)
-            screen.blit(text_surface, text_rect)
+            key_surf = RENDER_CACHE.tile(char, key_size, color, border_c, COLOR_TEXT,
+                                         radius=4, border_width=1, font=font)
+            screen.blit(key_surf, (x_pos, y_pos))
 
 
-def draw_grid(screen: pygame.Surface, guesses: List[List[Tuple[str, int, str]]],
-              current_guess_string: str, error_timer: int,
-              word_length: int, max_attempts: int) -> None:
-    """Draws the main game grid."""
+def grid_layout(word_length: int, max_attempts: int) -> Tuple[int, int, int, int]:
+    """Returns (start_x, start_y, box_size, margin) of the main game grid."""
     max_grid_w = 800
     max_grid_h = 450
     margin = 5
@@ -79,10 +65,33 @@ def draw_grid(screen: pygame.Surface, guesses: List[List[Tuple[str, int, str]]],
     box_size = min(box_w, box_h, 80)
 
     total_w = word_length * box_size + (word_length - 1) * margin
-    start_x = (WIDTH - total_w) // 2
-    start_y = 100
+    return (WIDTH - total_w) // 2, 100, box_size, margin
+
+
+def grid_row_rect(word_length: int, max_attempts: int, row: Optional[int] = None) -> pygame.Rect:
+    """Screen rect of the whole grid, or of one row including its shake margin."""
+    start_x, start_y, box_size, margin = grid_layout(word_length, max_attempts)
+    total_w = word_length * box_size + (word_length - 1) * margin
+    if row is None:
+        total_h = max_attempts * box_size + (max_attempts - 1) * margin
+        return pygame.Rect(start_x, start_y, total_w, total_h)
+    return pygame.Rect(start_x - 5, start_y + row * (box_size + margin), total_w + 10, box_size)
+
+
+@PROFILER.traced(category="draw")
+def draw_grid(screen: pygame.Surface, guesses: List[List[Tuple[str, int, str]]],
+              current_guess_string: str, error_timer: int,
+              word_length: int, max_attempts: int, dead_prefix: bool = False,
+              rows: Optional[Container[int]] = None) -> None:
+    """
+    Draws the main game grid (only the given rows, if any); dead_prefix marks
+    a typed row no word starts with.
+    """
+    start_x, start_y, box_size, margin = grid_layout(word_length, max_attempts)
 
     for row in range(max_attempts):
+        if rows is not None and row not in rows:
+            continue
         for col in range(word_length):
             x_pos = start_x + col * (box_size + margin)
             y_pos = start_y + row * (box_size + margin)
@@ -113,45 +122,42 @@ def draw_grid(screen: pygame.Surface, guesses: List[List[Tuple[str, int, str]]],
                 if col < len(current_guess_string):
                     letter = current_guess_string[col]
                     border_color = (180, 180, 180)
+                    if dead_prefix:
+                        text_color = COLOR_RED
 
                 if error_timer > 0:
                     border_color = COLOR_RED
                     shake = 5 if (error_timer // 2) % 2 == 0 else -5
                     x_pos += shake
 
-            rect = pygame.Rect(x_pos, y_pos, box_size, box_size)
-            pygame.draw.rect(screen, color, rect)
-            pygame.draw.rect(screen, border_color, rect, 2)
-
-            if letter != "":
-                dynamic_font = pygame.font.SysFont(FONT_NAME, int(box_size * 0.6), bold=True)
-                text_surf = dynamic_font.render(letter, True, text_color)
-                text_rect = text_surf.get_rect(center=rect.center)
-                screen.blit(text_surf, text_rect)
+            tile = RENDER_CACHE.tile(letter, box_size, color, border_color, text_color)
+            screen.blit(tile, (x_pos, y_pos))
 
 
+@PROFILER.traced(category="draw")
 def draw_hud(screen: pygame.Surface, score: int, name: str, current_round: int) -> None:
     """Draws player info and score."""
-    font_score = pygame.font.SysFont(FONT_NAME, 30, bold=True)
-    font_small = pygame.font.SysFont(FONT_NAME, 20)
+    font_score = RENDER_CACHE.font(FONT_NAME, 30, bold=True)
+    font_small = RENDER_CACHE.font(FONT_NAME, 20)
 
-    name_surf = font_score.render(f"Player: {name}", True, COLOR_ACCENT)
+    name_surf = RENDER_CACHE.text(f"Player: {name}", font_score, COLOR_ACCENT)
     screen.blit(name_surf, (20, 20))
 
-    score_surf = font_score.render(f"Score: {score}", True, COLOR_CORRECT)
+    score_surf = RENDER_CACHE.text(f"Score: {score}", font_score, COLOR_CORRECT)
     score_rect = score_surf.get_rect(topright=(WIDTH - 20, 20))
     screen.blit(score_surf, score_rect)
 
-    round_surf = font_small.render(f"Round: {current_round}", True, COLOR_TEXT)
+    round_surf = RENDER_CACHE.text(f"Round: {current_round}", font_small, COLOR_TEXT)
     round_rect = round_surf.get_rect(topright=(WIDTH - 20, 55))
     screen.blit(round_surf, round_rect)
 
 
+@PROFILER.traced(category="draw")
 def draw_end_message(screen: pygame.Surface, won: bool, secret_word: str, round_score: int) -> None:
     """Draws the modal when a round ends."""
-    font_result = pygame.font.SysFont(FONT_NAME, 40, bold=True)
-    font_small = pygame.font.SysFont(FONT_NAME, 20)
-    font_score = pygame.font.SysFont(FONT_NAME, 30, bold=True)
+    font_result = RENDER_CACHE.font(FONT_NAME, 40, bold=True)
+    font_small = RENDER_CACHE.font(FONT_NAME, 20)
+    font_score = RENDER_CACHE.font(FONT_NAME, 30, bold=True)
 
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     overlay.fill((0, 0, 0, 180))
@@ -167,171 +173,138 @@ def draw_end_message(screen: pygame.Surface, won: bool, secret_word: str, round_
     msg = "CORRECT!" if won else "GAME OVER"
     msg_col = COLOR_CORRECT if won else COLOR_RED
 
-    title_surf = font_result.render(msg, True, msg_col)
+    title_surf = RENDER_CACHE.text(msg, font_result, msg_col)
     title_rect = title_surf.get_rect(center=(WIDTH // 2, panel_rect.y + 50))
     screen.blit(title_surf, title_rect)
 
     word_text = f"The word was: {secret_word}"
-    word_surf = font_small.render(word_text, True, COLOR_TEXT)
+    word_surf = RENDER_CACHE.text(word_text, font_small, COLOR_TEXT)
     word_rect = word_surf.get_rect(center=(WIDTH // 2, panel_rect.y + 120))
     screen.blit(word_surf, word_rect)
 
     if won:
-        pts_surf = font_score.render(f"+ {round_score} Points", True, COLOR_ACCENT)
+        pts_surf = RENDER_CACHE.text(f"+ {round_score} Points", font_score, COLOR_ACCENT)
         pts_rect = pts_surf.get_rect(center=(WIDTH // 2, panel_rect.y + 180))
         screen.blit(pts_surf, pts_rect)
 
 
 def run_game(settings: Dict[str, Any]) -> str:
-    """Main Single Player Game Loop."""
+    """Main Single Player Game Loop (the rules live in PlayerEngine)."""
     # settings Parsing
     if isinstance(settings, str):
         difficulty = settings
         word_length = 5
         max_attempts = 6
         player_name = "Player"
+        lie_strategy = "window"
     else:
         difficulty = str(settings.get("difficulty", "NORMAL"))
         word_length = int(settings.get("word_length", 5))
         max_attempts = int(settings.get("max_attempts", 6))
         player_name = str(settings.get("player_name", "Player"))
+        lie_strategy = str(settings.get("lie_strategy", "window"))
 
-    valid_words = load_valid_words("Files/valid-wordle-words.txt", word_length)
+    dictionary = get_dictionary(word_length)
+    valid_words = dictionary.words
 
     if not valid_words or valid_words == ["ERROR"]:
         print("Error loading words! Check file path.")
         return "HOME"
 
-    current_session_score = 0
-    rounds_played = 0
-    playing_session = True
-
-    while playing_session:
-        rounds_played += 1
-        secret_word = random.choice(valid_words).upper()
-        guesses: List[List[Tuple[str, int, str]]] = []
-        current_guess_string = ""
-        alphabet_colors: Dict[str, Tuple[int, int, int]] = {}
-
-        error_timer = 0
-        game_over = False
-        won = False
-        round_points = 0
-
-        # UI Setup
-        center_x = WIDTH // 2
-        panel_h = 480
-        panel_y_top = (HEIGHT - panel_h) // 2
-
-        btn_action_y = panel_y_top + 260
-        btn_home_y = btn_action_y + 80
-
-        btn_action = Button(center_x - 110, btn_action_y, 220, 60, "NEXT WORD", COLOR_CORRECT)
-        btn_home = Button(center_x - 110, btn_home_y, 220, 60, "EXIT TO MENU", COLOR_PANEL_BG)
-
-        # Extreme Mode Lie Setup
-        lie_index = -1
-        if difficulty == "EXTREME":
-            lie_index = random.randint(0, max_attempts - 2)
-
-        running_round = True
-        while running_round:
-            if error_timer > 0:
-                error_timer -= 1
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    if current_session_score > 0:
-                        JsonStats.save_score(player_name, current_session_score)
-                    return "QUIT"
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if game_over:
-                        if btn_action.is_clicked(event.pos):
-                            if won:
-                                running_round = False
-                            else:
-                                if current_session_score > 0:
-                                    JsonStats.save_score(player_name, current_session_score)
-                                return "RESTART"
-
-                        if btn_home.is_clicked(event.pos):
-                            if current_session_score > 0:
-                                JsonStats.save_score(player_name, current_session_score)
-                            return "HOME"
-
-                if event.type == pygame.KEYDOWN and not game_over:
-                    if event.key == pygame.K_BACKSPACE:
-                        current_guess_string = current_guess_string[:-1]
-
-                    elif event.key == pygame.K_RETURN:
-                        if len(current_guess_string) == word_length:
-                            if current_guess_string not in valid_words:
-                                error_timer = 20
-                            else:
-                                current_turn = len(guesses)
-                                result: List[Tuple[str, int, str]] = []
-
-                                if (difficulty == "EXTREME" and
-                                        current_turn == lie_index and
-                                        current_guess_string != secret_word):
-                                    result = get_best_lie(current_guess_string, valid_words, word_length)
-                                else:
-                                    result = colour_set(current_guess_string, secret_word, word_length)
-
-                                guesses.append(result)
-
-                                # Update Keyboard Colors
-                                for triplet in result:
-                                    letter, _, status = triplet
-                                    curr_col = alphabet_colors.get(letter)
-                                    if status == "g":
-                                        alphabet_colors[letter] = COLOR_CORRECT
-                                    elif status == "y":
-                                        if curr_col != COLOR_CORRECT:
-                                            alphabet_colors[letter] = COLOR_PRESENT
-                                    elif status == "x":
-                                        if curr_col not in [COLOR_CORRECT, COLOR_PRESENT]:
-                                            alphabet_colors[letter] = COLOR_ABSENT
-
-                                current_guess_string = ""
-
-                                # Check Win Condition
-                                if all(t[2] == 'g' for t in result):
-                                    won = True
-                                    game_over = True
-                                    round_points = calculate_score(word_length, max_attempts,
-                                                                   len(guesses), difficulty)
-                                    current_session_score += round_points
-                                    btn_action.text = "NEXT WORD"
-                                    btn_action.color = COLOR_CORRECT
-
-                                elif len(guesses) >= max_attempts:
-                                    won = False
-                                    game_over = True
-                                    btn_action.text = "TRY AGAIN"
-                                    btn_action.color = COLOR_RED
-
-                    elif len(current_guess_string) < word_length and event.unicode.isalpha():
-                        current_guess_string += event.unicode.upper()
-
-            # --- Drawing ---
-            screen = pygame.display.get_surface()
-            screen.fill(COLOR_BG)
-
-            draw_hud(screen, current_session_score, player_name, rounds_played)
-            draw_grid(screen, guesses, current_guess_string, error_timer, word_length, max_attempts)
-
-            if not game_over:
-                draw_alphabet(screen, alphabet_colors)
-
-            if game_over:
-                draw_end_message(screen, won, secret_word, round_points)
-                btn_action.draw(screen)
-                btn_home.draw(screen)
-
-            pygame.display.flip()
-
-
-
-    return "HOME"
\ No newline at end of file
+    engine = PlayerEngine(dictionary, difficulty, word_length, max_attempts,
+                          lie_strategy=lie_strategy)
+    state = engine.snapshot()
+    letter_colors = {"g": COLOR_CORRECT, "y": COLOR_PRESENT, "x": COLOR_ABSENT}
+
+    def save_session() -> None:
+        if state.session_score > 0:
+            JsonStats.save_score(player_name, state.session_score)
+
+    frame_loop = FrameLoop()
+    compositor = Compositor()
+    board_rect = grid_row_rect(word_length, max_attempts)
+    keyboard_rect = pygame.Rect((WIDTH - 445) // 2, HEIGHT - 200, 445, 135)
+
+    # UI Setup
+    center_x = WIDTH // 2
+    panel_h = 480
+    panel_y_top = (HEIGHT - panel_h) // 2
+
+    btn_action_y = panel_y_top + 260
+    btn_home_y = btn_action_y + 80
+
+    btn_action = Button(center_x - 110, btn_action_y, 220, 60, "NEXT WORD", COLOR_CORRECT)
+    btn_home = Button(center_x - 110, btn_home_y, 220, 60, "EXIT TO MENU", COLOR_PANEL_BG)
+
+    error_timer = 0
+    while True:
+        if error_timer > 0:
+            error_timer -= 1
+
+        # Only the invalid-word shake animates; otherwise wait for input.
+        for event in frame_loop.events(active=error_timer > 0):
+            if event.type == pygame.QUIT:
+                save_session()
+                return "QUIT"
+
+            if event.type == pygame.MOUSEBUTTONDOWN and state.game_over:
+                if btn_action.is_clicked(event.pos):
+                    if state.won:
+                        state = engine.step((NEXT,))
+                        continue
+                    save_session()
+                    return "RESTART"
+
+                if btn_home.is_clicked(event.pos):
+                    save_session()
+                    return "HOME"
+
+            if event.type == pygame.KEYDOWN and not state.game_over:
+                if event.key == pygame.K_BACKSPACE:
+                    state = engine.step((DELETE,))
+                elif event.key == pygame.K_RETURN:
+                    state = engine.step((ENTER,))
+                    if state.event == INVALID:
+                        error_timer = 20
+                else:
+                    state = engine.step((TYPE, event.unicode))
+
+        btn_action.text = "NEXT WORD" if state.won else "TRY AGAIN"
+        btn_action.color = COLOR_CORRECT if state.won else COLOR_RED
+
+        # --- Drawing (layers are redrawn only when their key changes) ---
+        screen = pygame.display.get_surface()
+        RENDER_CACHE.begin_frame()
+        guesses = [list(row) for row in state.guesses]
+        current_guess_string = state.current
+
+        hud = (state.session_score, player_name, state.rounds_played)
+        compositor.layer("hud", (0, 0, WIDTH, 90), hud, lambda s: draw_hud(s, *hud), screen)
+
+        # Committed guesses change only on ENTER; the typing row is its own layer.
+        typing_row = len(guesses)
+        compositor.layer("board", board_rect, state.guesses, lambda s: draw_grid(
+            s, guesses, "", 0, word_length, max_attempts,
+            rows=set(range(max_attempts)) - {typing_row}), screen)
+
+        dead_prefix = not dictionary.has_prefix(current_guess_string)
+        typing = (typing_row, current_guess_string, error_timer, dead_prefix)
+        compositor.layer("typing", grid_row_rect(word_length, max_attempts, typing_row), typing,
+                         lambda s: draw_grid(s, guesses, current_guess_string, error_timer,
+                                             word_length, max_attempts, dead_prefix, rows={typing_row}),
+                         screen)
+
+        if not state.game_over:
+            alphabet_colors = {letter: letter_colors[status] for letter, status in state.letters.items()}
+            compositor.layer("keyboard", keyboard_rect, tuple(sorted(state.letters.items())),
+                             lambda s: draw_alphabet(s, alphabet_colors), screen)
+
+        if state.game_over:
+            end = (state.won, state.secret_word, state.round_points)
+            compositor.layer("end", (0, 0, WIDTH, HEIGHT), end, lambda s: draw_end_message(s, *end), screen)
+            compositor.button("action", btn_action, screen)
+            compositor.button("home", btn_home, screen)
+
+        compositor.stats_overlay(frame_loop, screen)
+        compositor.present(screen)
+        RENDER_CACHE.end_frame()
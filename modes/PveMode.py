@@ -2,20 +2,33 @@
 PvE Mode (Player vs Entity).
 The player competes against a Bot (Edit Distance or Gemini AI) to find the word first.
 """
+import atexit
 import os
-import random
-from typing import Optional, List, Any, Dict
-from unittest.mock import MagicMock
+import threading
+import time
+from typing import Optional, List, Any, Dict, Container
 
 import pygame
-from google import genai
 
 from settings import JsonStats
-from settings.Logic import colour_set, load_valid_words, filter_words, levenshtein_distance, Button
+from settings.Button import Button
+from settings.Engine import (
+    PveEngine, get_edit_distance_guess, local_bot_guess, TYPE, DELETE, ENTER, NEXT, BOT, INVALID
+)
+from settings.Dictionary import get_dictionary
+from settings.RenderCache import RENDER_CACHE
+from settings.FrameLoop import FrameLoop
+from settings.Compositor import Compositor
+from settings.Profiler import PROFILER
+from settings.OpeningBook import get_opening_book
+from settings.NeighborIndex import get_neighbor_index
+from settings.BotCalls import BotCallPipeline, BotTurn
+from settings.FakeGemini import FakeGeminiClient
+from settings.GeminiCache import GeminiCache, fingerprint
 from settings.Constants import (
     COLOR_ACCENT, COLOR_CORRECT, COLOR_PRESENT, COLOR_ABSENT,
     COLOR_ABSENT_BORDER, COLOR_TEXT, COLOR_PANEL_BG, COLOR_BG,
-    COLOR_RED, WIDTH, HEIGHT
+    COLOR_RED, WIDTH, HEIGHT, GEMINI_TIMEOUT, EDIT_BOT_PAUSE
 )
 
 
@@ -31,46 +44,85 @@ def get_api_key() -> Optional[str]:
     return None
 
 
-GEMINI_KEY = get_api_key()
-CLIENT = None
-
-if GEMINI_KEY:
-    try:
-        CLIENT = genai.Client(api_key=GEMINI_KEY)
-    except Exception as e:
-        print(f"Failed to init Gemini: {e}")
-else:
-    print("Warning: No API Key found in Files/key")
-
-
-def get_edit_distance_guess(possible_words: List[str], previous_guess: str, all_words: List[str]) -> str:
-    """Bot strategy: Pick word with lowest Levenshtein distance to previous guess."""
-    if not possible_words:
-        return random.choice(all_words)
-    if not previous_guess:
-        return random.choice(possible_words)
-
-    distances = []
-    for word in possible_words:
-        dist = levenshtein_distance(word, previous_guess)
-        distances.append((dist, word))
-
-    min_dist = min(d for d, w in distances)
-    best_candidates = [w for d, w in distances if d == min_dist]
-    return random.choice(best_candidates)
-
-
-def get_gemini_guess(guesses_history: List[List[Any]], word_length: int) -> Optional[str]:
-    """Bot strategy: Ask Google Gemini LLM for the next guess."""
-    if CLIENT is None:
+GEMINI_MODEL = "gemini-2.0-flash"
+GEMINI_CACHE = GeminiCache()
+atexit.register(GEMINI_CACHE.flush)
+
+# Built by get_client on first use of the VS GEMINI AI path.
+CLIENT: Any = None
+_CLIENT_LOCK = threading.Lock()
+_CLIENT_TRIED = False
+
+
+def gemini_configured() -> bool:
+    """True if a Gemini key (or the offline fake) is set up; does not import the SDK."""
+    return bool(os.environ.get("WORDLE_FAKE_GEMINI")) or get_api_key() is not None
+
+
+def get_client() -> Any:
+    """
+    Returns the Gemini client, importing google.genai and building the client
+    on the first call, so players who never pick VS GEMINI AI skip the SDK.
+    """
+    global CLIENT, _CLIENT_TRIED
+    with _CLIENT_LOCK:
+        if CLIENT is not None or _CLIENT_TRIED:
+            return CLIENT
+        _CLIENT_TRIED = True
+
+        if os.environ.get("WORDLE_FAKE_GEMINI"):
+            # Offline testing: a fake endpoint answering after the given latency (seconds).
+            CLIENT = FakeGeminiClient(latency=float(os.environ["WORDLE_FAKE_GEMINI"]),
+                                      words_file="Files/valid-wordle-words.txt",
+                                      timeout=GEMINI_TIMEOUT)
+            return CLIENT
+
+        gemini_key = get_api_key()
+        if not gemini_key:
+            print("Warning: No API Key found in Files/key")
+            return None
+        try:
+            from google import genai
+            # A reply after the bot's deadline is never used, so the request ends there too.
+            CLIENT = genai.Client(api_key=gemini_key,
+                                  http_options={"timeout": int(GEMINI_TIMEOUT * 1000)})
+        except Exception as e:
+            print(f"Failed to init Gemini: {e}")
+        return CLIENT
+
+
+def cache_model(client: Any) -> str:
+    """Model name for cache keys; the offline fake's random replies never share Gemini's keys."""
+    return f"fake:{GEMINI_MODEL}" if isinstance(client, FakeGeminiClient) else GEMINI_MODEL
+
+
+@PROFILER.traced(category="bot")
+def get_gemini_guess(guesses_history: List[List[Any]], word_length: int,
+                     cache: Optional[GeminiCache] = None,
+                     valid_words: Optional[Container[str]] = None) -> Optional[str]:
+    """
+    Bot strategy: Ask Google Gemini LLM for the next guess.
+    With a cache, known positions are answered without a request. With
+    valid_words, replies outside the dictionary are flagged and dropped.
+    """
+    # 1. Reconstruct (word, pattern) pairs from triplets
+    moves = [("".join(t[0] for t in row), "".join(t[2] for t in row)) for row in guesses_history]
+    client = get_client()
+    key = fingerprint(cache_model(client), word_length, moves)
+
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            if valid_words is None or cached in valid_words:
+                return cached
+            cache.flag(key, cached)
+
+    if client is None:
         return None
 
     # 2. Format the History string
     history_str = ""
-    for pattern_tuples in guesses_history:
-        # Reconstruct word and pattern from triplets
-        word = "".join([t[0] for t in pattern_tuples])
-        pat_str = "".join([t[2] for t in pattern_tuples])
+    for word, pat_str in moves:
         history_str += f"{word} ({pat_str}), "
 
     prompt = (
@@ -82,8 +134,8 @@ def get_gemini_guess(guesses_history: List[List[Any]], word_length: int) -> Opti
     )
 
     try:
-        response = CLIENT.models.generate_content(
-            model="gemini-2.0-flash",
+        response = client.models.generate_content(
+            model=GEMINI_MODEL,
             contents=prompt
         )
 
@@ -91,34 +143,62 @@ def get_gemini_guess(guesses_history: List[List[Any]], word_length: int) -> Opti
             bot_reply = response.text.strip().upper()
             # Clean up the response (remove spaces/punctuation)
             clean_word = "".join(filter(str.isalpha, bot_reply))[:word_length]
+            if cache is not None and clean_word:
+                if valid_words is not None and clean_word not in valid_words:
+                    cache.flag(key, clean_word)
+                    return None
+                cache.put(key, clean_word)
             return clean_word
         return None
     except Exception as e:
         print(f"Gemini Error: {e}")
         return None
 
+
+def mini_grid_box(width: int, word_length: int) -> int:
+    """Tile size of a split-screen grid of the given width."""
+    return min(60, (width - ((word_length - 1) * 5)) // word_length)
+
+
+def mini_grid_rect(start_x: int, start_y: int, width: int, word_length: int,
+                   max_attempts: int, row: Optional[int] = None) -> pygame.Rect:
+    """Screen rect of a mini grid with its label, or of one row including its shake margin."""
+    box_size = mini_grid_box(width, word_length)
+    if row is None:
+        height = max_attempts * (box_size + 5) + 35
+        return pygame.Rect(start_x - 5, start_y - 35, width + 10, height)
+    return pygame.Rect(start_x - 5, start_y + row * (box_size + 5), width + 10, box_size)
+
+
+@PROFILER.traced(category="draw")
 def draw_mini_grid(screen: pygame.Surface, start_x: int, start_y: int, width: int,
                    guesses: List[List[Any]], current_guess: str, word_length: int,
-                   max_attempts: int, label: str, error_timer: int = 0) -> None:
-    """Draws a smaller version of the game grid for split-screen."""
-    font_label = pygame.font.SysFont("Arial", 25, bold=True)
+                   max_attempts: int, label: str, error_timer: int = 0,
+                   dead_prefix: bool = False, rows: Optional[Container[int]] = None) -> None:
+    """
+    Draws a smaller version of the game grid for split-screen (only the given
+    rows, if any). dead_prefix marks a typed row that no word starts with.
+    """
+    font_label = RENDER_CACHE.font("Arial", 25, bold=True)
 
     # Draw Label
-    lbl_surf = font_label.render(label, True, COLOR_ACCENT)
+    lbl_surf = RENDER_CACHE.text(label, font_label, COLOR_ACCENT)
     lbl_x = start_x + (width // 2) - (lbl_surf.get_width() // 2)
     screen.blit(lbl_surf, (lbl_x, start_y - 35))
 
     margin = 5
-    box_size = (width - ((word_length - 1) * margin)) // word_length
-    box_size = min(60, box_size)
+    box_size = mini_grid_box(width, word_length)
     actual_grid_width = (word_length * box_size) + ((word_length - 1) * margin)
     offset_x = (width - actual_grid_width) // 2
 
     for row in range(max_attempts):
+        if rows is not None and row not in rows:
+            continue
         for col in range(word_length):
             x_pos = start_x + offset_x + col * (box_size + margin)
             y_pos = start_y + row * (box_size + margin)
             color, border_color, letter = COLOR_ABSENT, COLOR_ABSENT_BORDER, ""
+            text_color = COLOR_TEXT
 
             # Past Guesses
             if row < len(guesses):
@@ -134,36 +214,36 @@ def draw_mini_grid(screen: pygame.Surface, start_x: int, start_y: int, width: in
                 border_color = (150, 150, 150)
                 if col < len(current_guess):
                     letter = current_guess[col]
+                    if dead_prefix:
+                        text_color = COLOR_RED
 
                 if error_timer > 0:
                     border_color = COLOR_RED
                     shake = 5 if (error_timer // 2) % 2 == 0 else -5
                     x_pos += shake
 
-            rect = pygame.Rect(x_pos, y_pos, box_size, box_size)
-            pygame.draw.rect(screen, color, rect, border_radius=4)
-            pygame.draw.rect(screen, border_color, rect, 2, border_radius=4)
-
-            if letter:
-                font = pygame.font.SysFont("Arial", int(box_size * 0.65), bold=True)
-                text = font.render(letter, True, COLOR_TEXT)
-                screen.blit(text, text.get_rect(center=rect.center))
+            tile = RENDER_CACHE.tile(letter, box_size, color, border_color, text_color,
+                                     radius=4, font_ratio=0.65)
+            screen.blit(tile, (x_pos, y_pos))
 
 
 def select_bot_type_menu() -> str:
     """Displays a sub-menu to choose the opponent type."""
     screen = pygame.display.get_surface()
-    font_guess = pygame.font.SysFont("Arial", 40, bold=True)
-    font_small = pygame.font.SysFont("Arial", 20)
+    font_guess = RENDER_CACHE.font("Arial", 40, bold=True)
+    font_small = RENDER_CACHE.font("Arial", 20)
 
     center_x, center_y = WIDTH // 2, HEIGHT // 2
     btn_edit = Button(center_x - 300, center_y, 280, 80, "VS EDIT-DISTANCE", COLOR_PANEL_BG, "EDIT")
     btn_llm = Button(center_x + 20, center_y, 280, 80, "VS GEMINI AI", (46, 134, 193), "LLM")
 
+    gemini_ready = gemini_configured()
+    frame_loop = FrameLoop()
+
     running = True
     while running:
         mouse_pos = pygame.mouse.get_pos()
-        for event in pygame.event.get():
+        for event in frame_loop.events():
             if event.type == pygame.QUIT:
                 return "QUIT"
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -173,25 +253,25 @@ def select_bot_type_menu() -> str:
                     return "LLM"
 
         screen.fill(COLOR_BG)
-        title = font_guess.render("CHOOSE OPPONENT", True, COLOR_TEXT)
+        title = RENDER_CACHE.text("CHOOSE OPPONENT", font_guess, COLOR_TEXT)
         screen.blit(title, (center_x - title.get_width() // 2, center_y - 100))
         btn_edit.draw(screen)
         btn_llm.draw(screen)
 
-        if CLIENT is None:
-            warn = font_small.render("(Gemini Key missing in Files/key)", True, COLOR_RED)
+        if not gemini_ready:
+            warn = RENDER_CACHE.text("(Gemini Key missing in Files/key)", font_small, COLOR_RED)
             screen.blit(warn, (center_x + 60, center_y + 90))
         pygame.display.flip()
     return "QUIT"
 
 
 def run_pve(settings: Dict[str, Any]) -> str:
-    """Main loop for PvE Mode."""
+    """Main loop for PvE Mode (the rules live in PveEngine)."""
     pygame.init()
 
     # Fonts
-    font_label = pygame.font.SysFont("Arial", 25, bold=True)
-    font_result = pygame.font.SysFont("Arial", 40, bold=True)
+    font_label = RENDER_CACHE.font("Arial", 25, bold=True)
+    font_result = RENDER_CACHE.font("Arial", 40, bold=True)
 
     bot_type = select_bot_type_menu()
     if bot_type == "QUIT":
@@ -201,169 +281,219 @@ def run_pve(settings: Dict[str, Any]) -> str:
     max_attempts = int(settings["max_attempts"])
     player_name = str(settings["player_name"])
 
-    valid_words = load_valid_words("Files/valid-wordle-words.txt", word_length)
+    dictionary = get_dictionary(word_length)
+    valid_words = dictionary.words
     if not valid_words:
         return "HOME"
 
-    player_score, bot_score, rounds_played = 0, 0, 0
-    session_running = True
-
-    while session_running:
-        rounds_played += 1
-        secret_word = random.choice(valid_words).upper()
-
-        # Player State
-        p_guesses, p_current_str = [], ""
-        p_won, p_lost = False, False
-
-        # Bot State
-        b_guesses, b_last_guess = [], ""
-        b_possible = list(valid_words)
-        b_won, b_lost = False, False
-
-        round_over, status_msg = False, ""
-        error_timer = 0
-
-        # Layout
-        p_grid_x, p_grid_w = 100, 400
-        b_grid_x, b_grid_w = WIDTH - 500, 400
-        grid_start_y = 120
-
-        btn_next = Button(WIDTH // 2 - 100, HEIGHT - 140, 200, 60, "NEXT ROUND", COLOR_CORRECT)
-        btn_exit = Button(WIDTH // 2 - 100, HEIGHT - 70, 200, 60, "EXIT", COLOR_PANEL_BG)
-
-        def play_bot_turn() -> None:
-            nonlocal b_last_guess, b_won, b_lost, bot_score, b_possible
-            if b_won or b_lost:
-                return
-
-            if bot_type == "EDIT":
-                bot_word = get_edit_distance_guess(b_possible, b_last_guess, valid_words)
-            else:
-                gemini_word = get_gemini_guess(b_guesses, word_length)
-                bot_word = gemini_word if gemini_word else random.choice(b_possible)
-
-            if bot_word:
-                b_last_guess = bot_word
-                b_res = colour_set(bot_word, secret_word, word_length)
-                b_guesses.append(b_res)
-
-                # Filter bot's logic
-                pat_str = "".join([t[2] for t in b_res])
-                b_possible = filter_words(pat_str, bot_word, b_possible)
-
-                if bot_word == secret_word:
-                    b_won = True
-                    bot_score += (word_length * 10) + (max_attempts - len(b_guesses)) * 20
-                elif len(b_guesses) >= max_attempts:
-                    b_lost = True
-
-        while True:
-            if error_timer > 0:
-                error_timer -= 1
-
-            # Bot plays if player is done but bot isn't
-            if (p_won or p_lost) and not (b_won or b_lost):
-                pygame.time.delay(700)
-                play_bot_turn()
-
-            # End Round Condition
-            if (p_won or p_lost) and (b_won or b_lost):
-                round_over = True
-                status_msg = "YOU LOST!" if p_lost else "ROUND COMPLETE"
-                if p_lost:
-                    btn_next.text = "FINISH"
-
-            # Events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    if player_score > 0:
-                        JsonStats.save_score(player_name, player_score)
-                    return "QUIT"
-
-                if event.type == pygame.MOUSEBUTTONDOWN and round_over:
-                    if btn_next.is_clicked(event.pos):
-                        if p_lost:
-                            if player_score > 0:
-                                JsonStats.save_score(player_name, player_score)
-                            return "HOME"
-                        break
-                    if btn_exit.is_clicked(event.pos):
-                        if player_score > 0:
-                            JsonStats.save_score(player_name, player_score)
-                        return "HOME"
-
-                if event.type == pygame.KEYDOWN and not round_over:
-                    if not p_won and not p_lost:
-                        if event.key == pygame.K_BACKSPACE:
-                            p_current_str = p_current_str[:-1]
-
-                        elif event.key == pygame.K_RETURN:
-                            if len(p_current_str) == word_length:
-                                if p_current_str not in valid_words:
-                                    error_timer = 20
-                                else:
-                                    res = colour_set(p_current_str, secret_word, word_length)
-                                    p_guesses.append(res)
-                                    if p_current_str == secret_word:
-                                        p_won = True
-                                        player_score += (word_length * 10) + (max_attempts - len(p_guesses)) * 20
-                                    elif len(p_guesses) >= max_attempts:
-                                        p_lost = True
-                                    p_current_str = ""
-
-                                    # Bot plays after player
-                                    play_bot_turn()
-
-                        elif len(p_current_str) < word_length and event.unicode.isalpha():
-                            p_current_str += event.unicode.upper()
-
-            # Draw
-            screen = pygame.display.get_surface()
-            screen.fill(COLOR_BG)
-
-            p_name = "YOU"
-            b_name = "GEMINI AI" if bot_type == "LLM" else "EDIT BOT"
-
-            p_score_surf = font_label.render(f"{p_name}: {player_score}", True, COLOR_CORRECT)
-            p_score_x = p_grid_x + (p_grid_w // 2) - (p_score_surf.get_width() // 2)
-            screen.blit(p_score_surf, (p_score_x, 40))
-
-            b_score_surf = font_label.render(f"{b_name}: {bot_score}", True, (230, 126, 34))
-            b_score_x = b_grid_x + (b_grid_w // 2) - (b_score_surf.get_width() // 2)
-            screen.blit(b_score_surf, (b_score_x, 40))
-
-            draw_mini_grid(screen, p_grid_x, grid_start_y, p_grid_w, p_guesses,
-                           p_current_str, word_length, max_attempts, "PLAYER", error_timer)
-            draw_mini_grid(screen, b_grid_x, grid_start_y, b_grid_w, b_guesses,
-                           "", word_length, max_attempts, "BOT")
-
-            if round_over:
-                msg_surf = font_result.render(status_msg, True, COLOR_CORRECT if not p_lost else COLOR_RED)
-                msg_rect = msg_surf.get_rect(center=(WIDTH // 2, HEIGHT - 240))
-
-                bg_rect = msg_rect.inflate(40, 20)
-                pygame.draw.rect(screen, COLOR_BG, bg_rect, border_radius=10)
-                pygame.draw.rect(screen, COLOR_ABSENT, bg_rect, 2, border_radius=10)
-
-                screen.blit(msg_surf, msg_rect)
-
-                btn_next.draw(screen)
-                btn_exit.draw(screen)
+    # Gemini moves run in the background against a deadline, with a local fallback.
+    pipeline = BotCallPipeline(GEMINI_TIMEOUT) if bot_type == "LLM" else None
+    if pipeline:
+        get_client()
+    font_status = RENDER_CACHE.font("Arial", 18)
+
+    engine = PveEngine(dictionary, bot_type, word_length, max_attempts)
+    if bot_type == "EDIT":
+        # The edit bot answers from the precomputed neighbour lists of its last guess;
+        # a stale index is rebuilt in the background while it scans the candidates.
+        engine.neighbors = get_neighbor_index(valid_words, word_length,
+                                              on_ready=lambda ready: setattr(engine, "neighbors", ready))
+    if pipeline:
+        # A stale book is rebuilt in the background; the fallback solver opens until then.
+        engine.book = get_opening_book(valid_words, word_length,
+                                       on_ready=lambda ready: setattr(engine, "book", ready))
+    state = engine.snapshot()
+    b_source = ""
+
+    def close_pipeline() -> None:
+        if pipeline:
+            pipeline.shutdown()
+
+    def leave(result: str, save: bool = True) -> str:
+        if save and state.player_score > 0:
+            JsonStats.save_score(player_name, state.player_score)
+        close_pipeline()
+        return result
+
+    def start_bot_turn() -> BotTurn:
+        """Starts (or reuses) the Gemini call for the bot's current position."""
+        history = [list(row) for row in engine.bot_guesses]
+        bot_state = engine.bot_state.clone()
+        return pipeline.start(
+            tuple(engine.bot_state.history),
+            lambda: get_gemini_guess(history, word_length, GEMINI_CACHE, dictionary),
+            lambda book=engine.book: local_bot_guess(bot_state, book),
+            lambda word: word in dictionary
+        )
 
-            pygame.display.flip()
+    def next_bot_word() -> Optional[str]:
+        """The bot's next guess, or None while the Gemini call is still pending."""
+        nonlocal b_source
+        if not pipeline:
+            return engine.bot_guess()
+        turn = start_bot_turn()
+        word = turn.poll()
+        if word is not None:
+            b_source = "GEMINI" if turn.source == "remote" else "LOCAL SOLVER (FALLBACK)"
+        return word
+
+    def new_round() -> None:
+        nonlocal b_source
+        b_source = ""
+        if pipeline:
+            pipeline.cancel()
+            start_bot_turn()
+
+    frame_loop = FrameLoop()
+    compositor = Compositor()
+
+    # Layout
+    p_grid_x, p_grid_w = 100, 400
+    b_grid_x, b_grid_w = WIDTH - 500, 400
+    grid_start_y = 120
+
+    btn_next = Button(WIDTH // 2 - 100, HEIGHT - 140, 200, 60, "NEXT ROUND", COLOR_CORRECT)
+    btn_exit = Button(WIDTH // 2 - 100, HEIGHT - 70, 200, 60, "EXIT", COLOR_PANEL_BG)
+
+    error_timer = 0
+    bot_ready_at: Optional[float] = None
+    new_round()
+    while True:
+        if error_timer > 0:
+            error_timer -= 1
+
+        # The edit bot pauses before each move it plays on its own; the loop keeps
+        # drawing and handling input until the pause is over.
+        bot_paused = False
+        if bot_type == "EDIT" and state.bot_owed and (state.player_won or state.player_lost):
+            now = time.perf_counter()
+            if bot_ready_at is None:
+                bot_ready_at = now + EDIT_BOT_PAUSE
+            bot_paused = now < bot_ready_at
+
+        # Bot moves are owed one per player guess; Gemini ones may still be pending.
+        while state.bot_owed and not bot_paused:
+            bot_word = next_bot_word()
+            if bot_word is None:
+                break
+            state = engine.step((BOT, bot_word))
+            if pipeline and state.bot_owed == 0 and not (state.bot_won or state.bot_lost):
+                # The feedback is known: ask for the next move while the player types.
+                start_bot_turn()
+            if bot_type == "EDIT" and (state.player_won or state.player_lost):
+                bot_ready_at = None
+                break
+
+        btn_next.text = "FINISH" if state.player_lost else "NEXT ROUND"
+
+        # Events (paced while the shake runs or a bot move is owed, idle otherwise)
+        next_round = False
+        for event in frame_loop.events(active=error_timer > 0 or state.bot_owed > 0):
+            if event.type == pygame.QUIT:
+                return leave("QUIT")
 
-            if round_over and pygame.mouse.get_pressed()[0]:
-                mouse_pos = pygame.mouse.get_pos()
-                if btn_next.is_clicked(mouse_pos):
-                    if p_lost:
-                        return "HOME"
+            if event.type == pygame.MOUSEBUTTONDOWN and state.round_over:
+                if btn_next.is_clicked(event.pos):
+                    if state.player_lost:
+                        return leave("HOME")
+                    next_round = True
                     break
-                if btn_exit.is_clicked(mouse_pos):
-                    return "HOME"
-
-        if p_lost:
-            session_running = False
-
+                if btn_exit.is_clicked(event.pos):
+                    return leave("HOME")
+
+            if event.type == pygame.KEYDOWN and not state.round_over:
+                if event.key == pygame.K_BACKSPACE:
+                    state = engine.step((DELETE,))
+                elif event.key == pygame.K_RETURN:
+                    state = engine.step((ENTER,))
+                    if state.event == INVALID:
+                        error_timer = 20
+                else:
+                    state = engine.step((TYPE, event.unicode))
+
+        if next_round:
+            state = engine.step((NEXT,))
+            new_round()
+            continue
+
+        # Draw (layers are redrawn only when their key changes)
+        screen = pygame.display.get_surface()
+        RENDER_CACHE.begin_frame()
+
+        p_name = "YOU"
+        b_name = "GEMINI AI" if bot_type == "LLM" else "EDIT BOT"
+        status = ("THINKING..." if state.bot_owed else b_source) if pipeline else ""
+        p_guesses = [list(row) for row in state.player_guesses]
+        b_guesses = [list(row) for row in state.bot_guesses]
+        p_current_str = state.current
+
+        def draw_header(surface: pygame.Surface) -> None:
+            p_score_surf = RENDER_CACHE.text(f"{p_name}: {state.player_score}", font_label, COLOR_CORRECT)
+            p_score_x = p_grid_x + (p_grid_w // 2) - (p_score_surf.get_width() // 2)
+            surface.blit(p_score_surf, (p_score_x, 40))
 
-    return "HOME"
\ No newline at end of file
+            b_score_surf = RENDER_CACHE.text(f"{b_name}: {state.bot_score}", font_label, (230, 126, 34))
+            b_score_x = b_grid_x + (b_grid_w // 2) - (b_score_surf.get_width() // 2)
+            surface.blit(b_score_surf, (b_score_x, 40))
+
+            if status:
+                status_surf = RENDER_CACHE.text(status, font_status, COLOR_ACCENT)
+                surface.blit(status_surf, (b_grid_x + (b_grid_w // 2) - (status_surf.get_width() // 2), 62))
+
+        def draw_result(surface: pygame.Surface) -> None:
+            msg_surf = RENDER_CACHE.text(state.status_msg, font_result,
+                                         COLOR_CORRECT if not state.player_lost else COLOR_RED)
+            msg_rect = msg_surf.get_rect(center=(WIDTH // 2, HEIGHT - 240))
+
+            bg_rect = msg_rect.inflate(40, 20)
+            pygame.draw.rect(surface, COLOR_BG, bg_rect, border_radius=10)
+            pygame.draw.rect(surface, COLOR_ABSENT, bg_rect, 2, border_radius=10)
+
+            surface.blit(msg_surf, msg_rect)
+
+        compositor.layer("header", (0, 0, WIDTH, 84), (state.player_score, state.bot_score, status),
+                         draw_header, screen)
+
+        # Committed rows change only on a guess; the player's typing row is its own layer.
+        p_row = len(p_guesses)
+        p_rows = set(range(max_attempts)) - {p_row}
+        compositor.layer("player", mini_grid_rect(p_grid_x, grid_start_y, p_grid_w, word_length, max_attempts),
+                         state.player_guesses,
+                         lambda s: draw_mini_grid(s, p_grid_x, grid_start_y, p_grid_w, p_guesses, "",
+                                                  word_length, max_attempts, "PLAYER", rows=p_rows),
+                         screen)
+
+        dead_prefix = not dictionary.has_prefix(p_current_str)
+        compositor.layer("typing", mini_grid_rect(p_grid_x, grid_start_y, p_grid_w, word_length,
+                                                  max_attempts, p_row),
+                         (p_row, p_current_str, error_timer, dead_prefix),
+                         lambda s: draw_mini_grid(s, p_grid_x, grid_start_y, p_grid_w, p_guesses,
+                                                  p_current_str, word_length, max_attempts, "PLAYER",
+                                                  error_timer, dead_prefix, rows={p_row}),
+                         screen)
+
+        compositor.layer("bot", mini_grid_rect(b_grid_x, grid_start_y, b_grid_w, word_length, max_attempts),
+                         state.bot_guesses,
+                         lambda s: draw_mini_grid(s, b_grid_x, grid_start_y, b_grid_w, b_guesses,
+                                                  "", word_length, max_attempts, "BOT"),
+                         screen)
+
+        if state.round_over:
+            compositor.layer("result", (0, HEIGHT - 290, WIDTH, 100), (state.status_msg, state.player_lost),
+                             draw_result, screen)
+            compositor.button("next", btn_next, screen)
+            compositor.button("exit", btn_exit, screen)
+
+        compositor.stats_overlay(frame_loop, screen)
+        compositor.present(screen)
+        RENDER_CACHE.end_frame()
+
+        if state.round_over and pygame.mouse.get_pressed()[0]:
+            mouse_pos = pygame.mouse.get_pos()
+            if btn_next.is_clicked(mouse_pos):
+                if state.player_lost:
+                    return leave("HOME", save=False)
+                state = engine.step((NEXT,))
+                new_round()
+            elif btn_exit.is_clicked(mouse_pos):
+                return leave("HOME", save=False)
@@ -0,0 +1,88 @@
+"""
+Non-blocking bot moves for PvE.
+A remote guess (Gemini) races a per-call deadline while a local solver guess
+is computed alongside it on its own thread, so hung remote calls can never
+hold it up; the game loop polls the turn each frame and takes the remote
+answer if it is valid and on time, otherwise the local one.
+"""
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+
+
+class BotTurn:
+    """One bot move: a remote guess with a deadline and a local fallback."""
+
+    def __init__(self, key: Hashable, remote: Future, local: Future,
+                 deadline: float, is_valid: Callable[[str], bool]) -> None:
+        self.key = key
+        self.remote = remote
+        self.local = local
+        self.deadline = deadline
+        self.is_valid = is_valid
+        self.started = time.perf_counter()
+        self.source: Optional[str] = None
+
+    def _remote_word(self) -> Optional[str]:
+        if self.remote.cancelled() or self.remote.exception() is not None:
+            return None
+        word = self.remote.result()
+        return word if word and self.is_valid(word) else None
+
+    def poll(self, now: Optional[float] = None) -> Optional[str]:
+        """Returns the chosen word once it is decided, else None (keep waiting)."""
+        now = time.perf_counter() if now is None else now
+        if self.remote.done():
+            word = self._remote_word()
+            if word is not None:
+                self.source = "remote"
+                return word
+        elif now < self.deadline:
+            return None
+
+        # Remote failed, answered nonsense or missed the deadline.
+        if not self.local.done():
+            return None
+        self.source = "local"
+        return self.local.result()
+
+    def cancel(self) -> None:
+        """Drops the turn; calls already running finish in the background."""
+        self.remote.cancel()
+        self.local.cancel()
+
+
+class BotCallPipeline:
+    """Starts bot turns on background threads and keeps the one for the current position."""
+
+    def __init__(self, timeout: float, workers: int = 4) -> None:
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bot")
+        self._local_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bot-local")
+        self.turn: Optional[BotTurn] = None
+
+    def start(self, key: Hashable, remote: Callable[[], Optional[str]],
+              local: Callable[[], str], is_valid: Callable[[str], bool]) -> BotTurn:
+        """
+        Starts (or reuses) the turn for a position key, e.g. the bot's history.
+        Called speculatively as soon as the previous feedback is known.
+        """
+        if self.turn is not None and self.turn.key == key:
+            return self.turn
+        self.cancel()
+        deadline = time.perf_counter() + self.timeout
+        self.turn = BotTurn(key, self._executor.submit(remote), self._local_executor.submit(local),
+                            deadline, is_valid)
+        return self.turn
+
+    def cancel(self) -> None:
+        """Cancels the pending turn, if any."""
+        if self.turn is not None:
+            self.turn.cancel()
+            self.turn = None
+
+    def shutdown(self) -> None:
+        """Cancels pending work and releases the threads without waiting."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._local_executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,62 @@
+"""
+The shared UI button.
+Kept apart from settings.Logic so the game rules import without pygame.
+"""
+from typing import Any, Optional, Tuple
+
+import pygame
+
+from settings.Constants import COLOR_CORRECT
+from settings.RenderCache import RENDER_CACHE
+
+
+class Button:
+    """A simple UI Button class for Pygame."""
+
+    def __init__(self, x: int, y: int, width: int, height: int, text: str,
+                 color: Tuple[int, int, int], action_id: Optional[Any] = None,
+                 text_color: Tuple[int, int, int] = (255, 255, 255),
+                 border_color: Optional[Tuple[int, int, int]] = None,
+                 font: Optional[pygame.font.Font] = None,
+                 hover_color: Optional[Tuple[int, int, int]] = None) -> None:
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.text_color = text_color
+        self.action_id = action_id
+        self.border_color = border_color
+        self.hover_color = hover_color
+        self.is_selected = False
+        self.font = font if font else RENDER_CACHE.font("Arial", 30, bold=True)
+
+    def current_color(self) -> Tuple[int, int, int]:
+        """Fill colour for the current selection / hover state."""
+        if self.is_selected:
+            return COLOR_CORRECT
+        if self.rect.collidepoint(pygame.mouse.get_pos()):
+            if self.hover_color:
+                return self.hover_color
+            return tuple(min(c + 30, 255) for c in self.color) # type: ignore
+        return self.color
+
+    def appearance(self) -> Tuple[Any, ...]:
+        """Everything the drawn button depends on (a compositor layer key)."""
+        return (tuple(self.rect), self.text, self.current_color(), self.border_color,
+                self.text_color, self.font)
+
+    def draw(self, screen: pygame.Surface) -> None:
+        """Draws the button on the screen."""
+        draw_color = self.current_color()
+
+        pygame.draw.rect(screen, draw_color, self.rect, border_radius=8)
+
+        if self.border_color:
+            pygame.draw.rect(screen, self.border_color, self.rect, 3, border_radius=8)
+
+        text_surface = RENDER_CACHE.text(self.text, self.font, self.text_color)
+        text_rect = text_surface.get_rect(center=self.rect.center)
+        screen.blit(text_surface, text_rect)
+
+    def is_clicked(self, pos: Tuple[int, int]) -> bool:
+        """Checks if the button was clicked."""
+        return self.rect.collidepoint(pos)
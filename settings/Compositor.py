@@ -0,0 +1,195 @@
+"""
+Dirty-rectangle layered compositor.
+A screen is described every frame as an ordered stack of layers over a flat
+background. Each layer has a screen rect and a key; it is redrawn into its own
+surface only when the key (or rect) changes, and only the rects of changed
+layers are recomposed and pushed with pygame.display.update, so a frame in
+which nothing changed costs no drawing at all.
+"""
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+from settings.Constants import COLOR_BG
+from settings.RenderCache import RENDER_CACHE
+from settings.FrameLoop import FrameLoop
+from settings.Button import Button
+from settings.Profiler import PROFILER
+
+DrawFn = Callable[[pygame.Surface], None]
+RectLike = Tuple[int, int, int, int]
+
+PROFILE_SIZE = (250, 130)
+PROFILE_SCALE_MS = 40.0
+
+
+class Layer:
+    """One cached layer: its screen rect, key and pre-drawn surface."""
+
+    def __init__(self, rect: pygame.Rect, key: Hashable, surface: pygame.Surface) -> None:
+        self.rect = rect
+        self.key = key
+        self.surface = surface
+
+
+class Compositor:
+    """Composes cached layers and pushes only the changed rectangles."""
+
+    def __init__(self, background: Tuple[int, int, int] = COLOR_BG) -> None:
+        self.background = background
+        self.layers: Dict[str, Layer] = {}
+        self.last_rects: List[pygame.Rect] = []
+        self._screen: Optional[pygame.Surface] = None
+        self._scratch: Optional[pygame.Surface] = None
+        self._order: List[str] = []
+        self._last_order: List[str] = []
+        self._dirty: List[pygame.Rect] = []
+
+    def _scratch_for(self, size: Tuple[int, int]) -> pygame.Surface:
+        if self._scratch is None or self._scratch.get_size() != size:
+            self._scratch = pygame.Surface(size, pygame.SRCALPHA)
+        return self._scratch
+
+    def layer(self, name: str, rect: RectLike, key: Hashable, draw: DrawFn,
+              screen: Optional[pygame.Surface] = None) -> None:
+        """
+        Adds a layer to this frame's stack (in call order). draw(surface) uses
+        screen coordinates and is only called when key or rect changed.
+        """
+        PROFILER.begin_render()
+        screen = screen if screen is not None else pygame.display.get_surface()
+        bounds = screen.get_rect()
+        rect = pygame.Rect(rect).clip(bounds)
+        self._order.append(name)
+
+        cached = self.layers.get(name)
+        if cached is not None and cached.key == key and cached.rect == rect:
+            return
+
+        # Draw at screen coordinates on a shared scratch surface, keep only the rect.
+        scratch = self._scratch_for(bounds.size)
+        scratch.fill((0, 0, 0, 0), rect)
+        scratch.set_clip(rect)
+        with PROFILER.span(f"layer {name}", "draw"):
+            draw(scratch)
+        scratch.set_clip(None)
+        surface = scratch.subsurface(rect).copy() if rect.width and rect.height else \
+            pygame.Surface((0, 0), pygame.SRCALPHA)
+
+        if cached is not None:
+            self._dirty.append(cached.rect)
+        self._dirty.append(rect)
+        self.layers[name] = Layer(rect, key, surface)
+
+    def overlay(self, name: str, rect: RectLike, draw: DrawFn,
+                screen: Optional[pygame.Surface] = None) -> None:
+        """A layer redrawn every frame (e.g. live statistics)."""
+        self.layer(name, rect, object(), draw, screen)
+
+    def button(self, name: str, button: Button, screen: Optional[pygame.Surface] = None) -> None:
+        """A layer holding one button, redrawn when its text or hover state changes."""
+        self.layer(name, tuple(button.rect), button.appearance(), button.draw, screen)
+
+    def invalidate(self) -> None:
+        """Forces the next present to redraw and push the whole screen."""
+        self._screen = None
+
+    def present(self, screen: Optional[pygame.Surface] = None) -> List[pygame.Rect]:
+        """Recomposes the changed rects onto the screen and pushes them; returns them."""
+        screen = screen if screen is not None else pygame.display.get_surface()
+        full = screen.get_rect()
+
+        # Layers not added this frame disappear; a new stack order redraws everything.
+        for name in [name for name in self.layers if name not in self._order]:
+            self._dirty.append(self.layers.pop(name).rect)
+        if screen is not self._screen or self._order != self._last_order:
+            self._dirty = [full]
+            self._screen = screen
+
+        with PROFILER.span("present", "draw"):
+            rects = merge_rects([r.clip(full) for r in self._dirty if r.width and r.height])
+            for rect in rects:
+                screen.fill(self.background, rect)
+                for name in self._order:
+                    cached = self.layers[name]
+                    area = rect.clip(cached.rect)
+                    if area.width and area.height:
+                        screen.blit(cached.surface, area, area.move(-cached.rect.x, -cached.rect.y))
+            if rects:
+                pygame.display.update(rects)
+
+        self.last_rects = rects
+        self._last_order, self._order, self._dirty = self._order, [], []
+        PROFILER.end_frame()
+        return rects
+
+    def stats_overlay(self, frame_loop: FrameLoop, screen: Optional[pygame.Surface] = None) -> None:
+        """Adds the render / frame statistics lines and the profiler graph when enabled."""
+        if RENDER_CACHE.show_stats or frame_loop.show_stats:
+            def draw(surface: pygame.Surface) -> None:
+                RENDER_CACHE.draw_stats(surface)
+                frame_loop.draw_stats(surface)
+            self.overlay("stats", (0, 0, 560, 40), draw, screen)
+        if PROFILER.enabled:
+            screen = screen if screen is not None else pygame.display.get_surface()
+            rect = pygame.Rect(screen.get_width() - PROFILE_SIZE[0], 0, *PROFILE_SIZE)
+            self.overlay("profile", tuple(rect), lambda surface: draw_profile(surface, rect, frame_loop.fps),
+                         screen)
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Unions overlapping rects so no area is composed or pushed twice."""
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.copy()
+        changed = True
+        while changed:
+            changed = False
+            for other in merged:
+                if rect.colliderect(other):
+                    rect.union_ip(other)
+                    merged.remove(other)
+                    changed = True
+                    break
+        merged.append(rect)
+    return merged
+
+
+def draw_profile(surface: pygame.Surface, rect: pygame.Rect, fps: int) -> None:
+    """
+    Draws the profiler panel: the last frames' event (blue) and render (orange)
+    times against the frame budget line, and the last turn latencies.
+    """
+    panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+    panel.fill((0, 0, 0, 190))
+    font = RENDER_CACHE.font("Arial", 13)
+    grey = (200, 200, 200)
+
+    graph = pygame.Rect(6, 6, rect.width - 12, 56)
+    frames = list(PROFILER.frames)[-graph.width // 2:]
+    scale = graph.height / PROFILE_SCALE_MS
+    for i, (events_ms, render_ms) in enumerate(frames):
+        x = graph.x + i * 2
+        events_h = min(graph.height, int(events_ms * scale) + 1)
+        render_h = min(graph.height - events_h, int(render_ms * scale))
+        pygame.draw.line(panel, (52, 152, 219), (x, graph.bottom), (x, graph.bottom - events_h))
+        if render_h > 0:
+            pygame.draw.line(panel, (230, 126, 34), (x, graph.bottom - events_h),
+                             (x, graph.bottom - events_h - render_h))
+    budget_y = graph.bottom - int(1000 / fps * scale)
+    pygame.draw.line(panel, (231, 76, 60), (graph.x, budget_y), (graph.right, budget_y))
+
+    last = frames[-1] if frames else (0.0, 0.0)
+    worst = max((e + r for e, r in frames), default=0.0)
+    solver = PROFILER.latest.get("solver turn")
+    bot = PROFILER.latest.get("bot turn")
+    lines = [
+        f"frame {last[0] + last[1]:.1f} ms (events {last[0]:.1f} / render {last[1]:.1f})  max {worst:.1f}",
+        f"solver turn {solver:.0f} ms" if solver is not None else "solver turn -",
+        f"bot turn {bot:.0f} ms" if bot is not None else "bot turn -",
+        "F3 hide  F4 export trace",
+    ]
+    for i, line in enumerate(lines):
+        # Rendered directly, like the other statistics lines.
+        panel.blit(font.render(line, True, grey), (6, graph.bottom + 4 + i * 15))
+    surface.blit(panel, rect)
@@ -7,6 +7,11 @@ Contains dimensions, colors, and font configurations.
 WIDTH = 1200
 HEIGHT = 800
 FPS = 30
+IDLE_WAIT_MS = 250               # Longest a static screen waits for input before redrawing
+
+# --- BOTS ---
+GEMINI_TIMEOUT = 4.0             # Seconds before the PvE bot falls back to the local solver
+EDIT_BOT_PAUSE = 0.7             # Seconds the PvE edit bot waits before each move it plays alone
 
 # --- COLORS ---
 # Main Palette
@@ -0,0 +1,311 @@
+"""
+Offline decision-tree solver for the AI Solver.
+Builds a complete solving tree for a dictionary under a chosen metric and
+stores it in a compact binary file that AiMode can walk with no computation
+per turn.
+
+Build with: python -m settings.DecisionTree --length 5 --metric expected
+"""
+import argparse
+import hashlib
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from settings.Logic import (
+    FeedbackMatrix, load_valid_words, get_feedback_matrix, score_candidate_ids,
+    best_guess_for_ids, pattern_to_code, partition_codes
+)
+from settings.OpeningBook import WORDS_FILE, BOOK_DIR, words_hash
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None  # type: ignore
+
+TREE_METRICS = ("expected", "worst")
+TREE_MAGIC = b"WDTREE"
+TREE_VERSION = 1
+
+# magic, version, word length, metric index, source hash, word count, node count, edge count
+HEADER = struct.Struct("<6sBBB16sIII")
+NODE_DTYPE = np.dtype([("guess", "<u4"), ("first_edge", "<u4"), ("edge_count", "<u2")])
+EDGE_DTYPE = np.dtype([("code", "<u2"), ("child", "<u4")])
+
+
+def tree_path(word_length: int) -> str:
+    """Returns where the tree for a word length is stored."""
+    return os.path.join(BOOK_DIR, f"decision-tree-{word_length}.bin")
+
+
+class TreeNode:
+    """One guess of the tree, with a child per non-winning feedback code."""
+
+    def __init__(self, guess: int) -> None:
+        self.guess = guess
+        self.children: Dict[int, "TreeNode"] = {}
+        self.total = 1  # Guesses summed over every word solved below this node.
+        self.worst = 1  # Most guesses any word below this node needs.
+
+
+class TreeBuilder:
+    """Searches for a solving tree with a guess beam and memoized subtrees."""
+
+    def __init__(self, matrix: FeedbackMatrix, metric: str = "expected",
+                 beam: int = 3, beam_depth: int = 1) -> None:
+        if metric not in TREE_METRICS:
+            raise ValueError(f"Unknown tree metric: {metric}")
+        self.matrix = matrix
+        self.metric = metric
+        self.beam = beam
+        self.beam_depth = beam_depth
+        self.solved_code = 3 ** matrix.word_length - 1
+        self.memo: Dict[bytes, TreeNode] = {}
+
+    def cost(self, node: TreeNode) -> Tuple[int, int]:
+        """Sort key of a subtree under the builder's metric (lower is better)."""
+        if self.metric == "expected":
+            return node.total, node.worst
+        return node.worst, node.total
+
+    def options(self, ids: np.ndarray, depth: int) -> List[int]:
+        """Returns the guesses worth expanding for a candidate set."""
+        heuristic = "entropy" if self.metric == "expected" else "worst"
+        if depth >= self.beam_depth or len(ids) <= 2:
+            best = best_guess_for_ids(self.matrix, ids, heuristic)
+            return [self.matrix.index[best]]
+
+        scores = score_candidate_ids(self.matrix, ids, heuristic)
+        top = np.argsort(-scores, kind="stable")[:self.beam]
+        best_candidate = ids[int(np.argmax(scores[ids]))]
+        return list(dict.fromkeys([int(g) for g in top] + [int(best_candidate)]))
+
+    def solve(self, ids: np.ndarray, depth: int = 0) -> TreeNode:
+        """Returns the best subtree found for a candidate set."""
+        if len(ids) == 1:
+            return TreeNode(int(ids[0]))
+
+        fingerprint = hashlib.blake2b(ids.tobytes(), digest_size=16).digest()
+        cached = self.memo.get(fingerprint)
+        if cached is not None:
+            return cached
+
+        best: Optional[TreeNode] = None
+        for guess in self.options(ids, depth):
+            node = self.expand(guess, ids, depth)
+            if node is not None and (best is None or self.cost(node) < self.cost(best)):
+                best = node
+        if best is None:
+            raise RuntimeError("No guess splits the candidate set.")
+        self.memo[fingerprint] = best
+        return best
+
+    def expand(self, guess: int, ids: np.ndarray, depth: int) -> Optional[TreeNode]:
+        """Builds the subtree below one guess, or None if the guess learns nothing."""
+        codes = self.matrix.submatrix(np.array([guess]), ids)[0]
+        buckets = split_buckets(codes, ids, self.solved_code)
+        if buckets and max(len(b) for b in buckets.values()) == len(ids):
+            return None
+        node = TreeNode(guess)
+        node.total = int((codes == self.solved_code).sum())
+        for code, bucket in buckets.items():
+            attach(node, code, self.solve(bucket, depth + 1), len(bucket))
+        return node
+
+
+def split_buckets(codes: np.ndarray, ids: np.ndarray, solved_code: int) -> Dict[int, np.ndarray]:
+    """Groups candidate ids by feedback code, leaving out the winning code."""
+    split = partition_codes(codes, solved_code + 1)
+    return {int(code): group for code, group in zip(split.codes, split.split(ids))
+            if code != solved_code and len(group)}
+
+
+def attach(node: TreeNode, code: int, child: TreeNode, size: int) -> None:
+    """Adds a child subtree and folds its cost into the parent."""
+    node.children[code] = child
+    node.total += child.total + size
+    node.worst = max(node.worst, child.worst + 1)
+
+
+_WORKER: Optional[TreeBuilder] = None
+
+
+def _init_worker(words: List[str], metric: str, beam: int, beam_depth: int) -> None:
+    """Creates the per-process builder used for top-level branches."""
+    global _WORKER  # pylint: disable=global-statement
+    matrix, _ = get_feedback_matrix(words)
+    _WORKER = TreeBuilder(matrix, metric, beam, beam_depth)
+
+
+def _solve_branch(ids: np.ndarray) -> TreeNode:
+    """Solves one top-level branch in a worker process."""
+    assert _WORKER is not None
+    return _WORKER.solve(ids, 1)
+
+
+def build_tree(words: List[str], metric: str = "expected", beam: int = 3, beam_depth: int = 1,
+               workers: int = 1, opener: Optional[str] = None) -> TreeNode:
+    """Builds the full tree, solving the opener's branches in a process pool."""
+    matrix, ids = get_feedback_matrix(words)
+    builder = TreeBuilder(matrix, metric, beam, beam_depth)
+    openers = [matrix.index[opener]] if opener else builder.options(ids, 0)
+
+    best: Optional[TreeNode] = None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(words, metric, beam, beam_depth)) as pool:
+        for guess in openers:
+            codes = matrix.submatrix(np.array([guess]), ids)[0]
+            buckets = split_buckets(codes, ids, builder.solved_code)
+            root = TreeNode(guess)
+            root.total = int((codes == builder.solved_code).sum())
+            # Largest branches first so the pool is not left waiting on one.
+            ordered = sorted(buckets.items(), key=lambda item: -len(item[1]))
+            children = pool.map(_solve_branch, [bucket for _, bucket in ordered])
+            for (code, bucket), child in zip(ordered, children):
+                attach(root, code, child, len(bucket))
+            if best is None or builder.cost(root) < builder.cost(best):
+                best = root
+    assert best is not None
+    return best
+
+
+def serialize_tree(root: TreeNode, word_length: int, metric: str,
+                   source_hash: str, word_count: int) -> bytes:
+    """Flattens a tree breadth-first into the binary file format."""
+    nodes: List[TreeNode] = [root]
+    node_rows: List[Tuple[int, int, int]] = []
+    edge_rows: List[Tuple[int, int]] = []
+    position = 0
+    while position < len(nodes):
+        node = nodes[position]
+        node_rows.append((node.guess, len(edge_rows), len(node.children)))
+        for code in sorted(node.children):
+            edge_rows.append((code, len(nodes)))
+            nodes.append(node.children[code])
+        position += 1
+
+    header = HEADER.pack(TREE_MAGIC, TREE_VERSION, word_length, TREE_METRICS.index(metric),
+                         source_hash.encode("ascii")[:16], word_count, len(node_rows), len(edge_rows))
+    node_table = np.array(node_rows, dtype=NODE_DTYPE)
+    edge_table = np.array(edge_rows, dtype=EDGE_DTYPE)
+    return header + node_table.tobytes() + edge_table.tobytes()
+
+
+class DecisionTree:
+    """A loaded tree file: node and edge tables over dictionary word ids."""
+
+    def __init__(self, data: bytes) -> None:
+        (magic, version, self.word_length, metric_index, source_hash,
+         self.word_count, node_count, edge_count) = HEADER.unpack_from(data)
+        if magic != TREE_MAGIC or version != TREE_VERSION:
+            raise ValueError("Not a decision tree file.")
+        self.metric = TREE_METRICS[metric_index]
+        self.source_hash = source_hash.decode("ascii")
+        offset = HEADER.size
+        self.nodes = np.frombuffer(data, dtype=NODE_DTYPE, count=node_count, offset=offset)
+        offset += node_count * NODE_DTYPE.itemsize
+        self.edges = np.frombuffer(data, dtype=EDGE_DTYPE, count=edge_count, offset=offset)
+
+    def child(self, node: int, code: int) -> Optional[int]:
+        """Returns the child node for a feedback code, if the tree has one."""
+        first = int(self.nodes[node]["first_edge"])
+        codes = self.edges["code"][first:first + int(self.nodes[node]["edge_count"])]
+        index = int(np.searchsorted(codes, code))
+        if index < len(codes) and codes[index] == code:
+            return int(self.edges[first + index]["child"])
+        return None
+
+    def cursor(self) -> "TreeCursor":
+        """Starts a walk at the root."""
+        return TreeCursor(self)
+
+
+class TreeCursor:
+    """Position of one game in a decision tree."""
+
+    def __init__(self, tree: DecisionTree) -> None:
+        self.tree = tree
+        self.node = 0
+
+    @property
+    def guess_id(self) -> int:
+        """Dictionary id of the guess stored at the current node."""
+        return int(self.tree.nodes[self.node]["guess"])
+
+    def advance(self, colour_pattern: str) -> bool:
+        """Follows the feedback to the next node. Returns False if it leaves the tree."""
+        child = self.tree.child(self.node, pattern_to_code(colour_pattern))
+        if child is None:
+            return False
+        self.node = child
+        return True
+
+
+def save_tree(data: bytes, path: str) -> None:
+    """Writes a serialized tree to disk."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with open(path, "wb") as f:
+            f.write(data)
+    except OSError as e:
+        print(f"Error saving decision tree: {e}")
+
+
+def load_decision_tree(words: List[str], word_length: int) -> Optional[DecisionTree]:
+    """Loads the stored tree if it was built from the current word list of its length."""
+    path = tree_path(word_length)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            tree = DecisionTree(f.read())
+    except (OSError, ValueError, struct.error):
+        return None
+    if tree.source_hash != words_hash(words) or tree.word_count != len(words):
+        return None
+    return tree
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of this process and its finished children, in MB."""
+    if resource is None:
+        return None
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) / 1024
+
+
+def main() -> None:
+    """Builds and stores the decision tree for one word length."""
+    parser = argparse.ArgumentParser(description="Build the AI Solver decision tree.")
+    parser.add_argument("--length", type=int, default=5)
+    parser.add_argument("--metric", choices=TREE_METRICS, default="expected")
+    parser.add_argument("--beam", type=int, default=3, help="guesses tried per searched node")
+    parser.add_argument("--beam-depth", type=int, default=1, help="depth below which search is greedy")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--opener", default=None, help="fix the first guess instead of searching")
+    parser.add_argument("--words", default=WORDS_FILE)
+    args = parser.parse_args()
+
+    words = load_valid_words(args.words, args.length)
+    start = time.perf_counter()
+    root = build_tree(words, args.metric, args.beam, args.beam_depth, args.workers,
+                      args.opener.upper() if args.opener else None)
+    elapsed = time.perf_counter() - start
+
+    data = serialize_tree(root, args.length, args.metric, words_hash(words), len(words))
+    save_tree(data, tree_path(args.length))
+
+    peak = peak_memory_mb()
+    print(f"Built {tree_path(args.length)} ({len(data) / 1024:.0f} KB) in {elapsed:.1f}s")
+    print(f"Opener: {words[root.guess]}  average guesses: {root.total / len(words):.4f}  "
+          f"worst case: {root.worst}")
+    print(f"Peak memory: {peak:.0f} MB" if peak is not None else "Peak memory: n/a")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Process-wide dictionary service.
+One Dictionary per (word file, word length) is shared by every mode: a hash
+set answers "is this a word" in O(1), each word has a stable integer id (its
+position in the word file), and a prefix trie tells the typing row when no
+word starts with the letters entered so far.
+"""
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+from settings.Logic import load_valid_words
+from settings.WordStore import WordStore, get_word_store
+
+WORDS_FILE = "Files/valid-wordle-words.txt"
+
+
+class Dictionary:
+    """Words of one length with O(1) membership, stable ids and a prefix trie."""
+
+    def __init__(self, words: List[str], source: Optional[WordStore] = None) -> None:
+        self.words = words
+        self.source = source
+        self.word_length = len(words[0]) if words else 0
+        self._ids: Dict[str, int] = {}
+        for word_id, word in enumerate(words):
+            self._ids.setdefault(word, word_id)
+
+        # Trie nodes: child per letter, and how many words pass through each node.
+        self._children: List[Dict[str, int]] = [{}]
+        self._counts: List[int] = [0]
+        for word in self._ids:
+            self._insert(word)
+
+    def _insert(self, word: str) -> None:
+        node = 0
+        self._counts[0] += 1
+        for letter in word:
+            child = self._children[node].get(letter)
+            if child is None:
+                child = len(self._children)
+                self._children[node][letter] = child
+                self._children.append({})
+                self._counts.append(0)
+            node = child
+            self._counts[node] += 1
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def word_id(self, word: str) -> Optional[int]:
+        """Stable id of a word (its index in the word list), or None."""
+        return self._ids.get(word)
+
+    def word(self, word_id: int) -> str:
+        """The word with the given id."""
+        return self.words[word_id]
+
+    def prefix_count(self, prefix: str) -> int:
+        """Number of words starting with prefix, found by walking the trie."""
+        node = 0
+        for letter in prefix:
+            child = self._children[node].get(letter)
+            if child is None:
+                return 0
+            node = child
+        return self._counts[node]
+
+    def has_prefix(self, prefix: str) -> bool:
+        """True if at least one word starts with prefix."""
+        return self.prefix_count(prefix) > 0
+
+    def random_word(self) -> str:
+        """A uniformly random word."""
+        return random.choice(self.words)
+
+
+_DICTIONARIES: Dict[Tuple[str, int], Dictionary] = {}
+
+
+def get_dictionary(word_length: int, words_file: str = WORDS_FILE) -> Dictionary:
+    """
+    Returns the shared Dictionary for a word length, rebuilding it only when the
+    compiled word store was recompiled because the word file changed.
+    """
+    key = (os.path.abspath(words_file), word_length)
+    store: Optional[WordStore] = None
+    if os.path.isfile(words_file):
+        try:
+            store = get_word_store(words_file)
+        except (OSError, ValueError):
+            store = None
+
+    cached = _DICTIONARIES.get(key)
+    if cached is not None and store is not None and cached.source is store:
+        return cached
+
+    dictionary = Dictionary(load_valid_words(words_file, word_length), store)
+    if store is not None:
+        _DICTIONARIES[key] = dictionary
+    return dictionary
@@ -6,7 +6,7 @@ import sys
 from typing import Optional, List, Tuple
 import pygame
 
-from settings.Logic import Button
+from settings.Button import Button
 from settings.Constants import (
     WIDTH, HEIGHT, COLOR_BG, COLOR_TEXT, COLOR_PANEL_BG,
     COLOR_CORRECT, COLOR_RED, COLOR_ABSENT, COLOR_ABSENT_BORDER
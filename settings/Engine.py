@@ -0,0 +1,563 @@
+"""
+Headless game engines.
+The rules of each mode live in a pygame-free engine driven by step(action),
+which applies one action and returns an immutable snapshot of the new state.
+The pygame loops only translate input into actions and render snapshots, so
+games can also be simulated (or tested) without a display. Actions are tuples
+whose first item is one of the action names below.
+"""
+import random
+import threading
+import time
+from typing import Any, Container, Dict, List, NamedTuple, Optional, Tuple
+
+from settings.Logic import (
+    colour_set, get_best_lie, get_feedback_matrix, get_pattern_string, nearest_words, LIE_STRATEGIES
+)
+from settings.Solver import SolverState, ExtremeState
+from settings.OpeningBook import OpeningBook, opening_reply
+from settings.NeighborIndex import NeighborIndex
+from settings.Profiler import PROFILER
+
+Triplet = Tuple[str, int, str]
+Action = Tuple[Any, ...]
+
+# Player actions (PlayerEngine and the player side of PveEngine)
+TYPE = "type"          # ("type", letter)
+DELETE = "delete"      # ("delete",)
+ENTER = "enter"        # ("enter",) submits the typed row
+GUESS = "guess"        # ("guess", word) types and submits a whole word
+NEXT = "next"          # ("next",) starts the next round after a win
+# AI Solver actions
+PATTERN = "pattern"    # ("pattern", "g" | "y" | "x") appends one feedback colour
+MARK = "mark"          # ("mark", index) cycles the colour of one tile
+FEEDBACK = "feedback"  # ("feedback", "gyxxg") enters and submits a whole pattern
+SUBMIT = "submit"      # ("submit",) submits the entered pattern
+RESOLVE = "resolve"    # ("resolve", (state, next_guess) | None) finishes the pending turn
+RESTART = "restart"    # ("restart",)
+# PvE actions
+BOT = "bot"            # ("bot", word | None) plays the bot's move (None: engine picks)
+
+# Events reported in snapshots for the UI (shake, sounds, ...)
+INVALID = "invalid"
+WON = "won"
+LOST = "lost"
+
+
+def calculate_score(word_length: int, max_attempts: int, attempts_taken: int, difficulty: str) -> int:
+    """Calculates the score based on attempts and difficulty."""
+    unused_attempts = max_attempts - attempts_taken
+    base_score = word_length * 50
+    bonus_score = unused_attempts * 100
+
+    total_score = base_score + bonus_score
+
+    if difficulty == "EXTREME":
+        total_score *= 2
+
+    return total_score
+
+
+def update_letters(letters: Dict[str, str], result: List[Triplet]) -> None:
+    """Keyboard status per letter: green beats yellow beats grey."""
+    for letter, _, status in result:
+        current = letters.get(letter)
+        if status == "g":
+            letters[letter] = "g"
+        elif status == "y":
+            if current != "g":
+                letters[letter] = "y"
+        elif current not in ("g", "y"):
+            letters[letter] = "x"
+
+
+@PROFILER.traced(category="bot")
+def get_edit_distance_guess(possible_words: List[str], previous_guess: str, all_words: List[str],
+                            rng: Any = random) -> str:
+    """Bot strategy: Pick word with lowest Levenshtein distance to previous guess."""
+    if not possible_words:
+        return rng.choice(all_words)
+    if not previous_guess:
+        return rng.choice(possible_words)
+
+    return rng.choice(nearest_words(previous_guess, possible_words))
+
+
+@PROFILER.traced(category="bot")
+def edit_bot_guess(state: SolverState, previous_guess: str, all_words: List[str],
+                   rng: Any = random, index: Optional[NeighborIndex] = None) -> str:
+    """
+    get_edit_distance_guess over a solver state. The previous guess's
+    neighbour list answers it when a remaining candidate is close enough.
+    """
+    guess_id = state.matrix.index.get(previous_guess)
+    if index is not None and guess_id is not None and index.word_count == len(state.matrix.words):
+        nearest = index.nearest(guess_id, state.candidate_ids)
+        if nearest is not None:
+            return rng.choice([state.matrix.words[i] for i in nearest])
+    return get_edit_distance_guess(state.words, previous_guess, all_words, rng)
+
+
+@PROFILER.traced(category="bot")
+def local_bot_guess(state: SolverState, book: Optional[OpeningBook]) -> str:
+    """Local solver move, used when Gemini is late or answers with a non-word."""
+    if not state.history and book:
+        return book.opener
+    return opening_reply(book, state.history) or state.best_guess()
+
+
+@PROFILER.traced(category="solver")
+def solve_turn(state: SolverState, guess: str, pattern: str, next_guess: Optional[str],
+               cancel: Optional[threading.Event] = None) -> Tuple[SolverState, Optional[str]]:
+    """
+    Applies one feedback to a private copy of the state and picks the next guess
+    (next_guess when the tree or book already knows it). Runs on the solver
+    worker, which sets cancel when the turn goes stale.
+    """
+    state.apply(guess, pattern)
+    if len(state) <= 1:
+        return state, None
+    return state, next_guess or state.best_guess(cancel=cancel)
+
+
+def degraded_turn(state: SolverState, guess: str, pattern: str,
+                  next_guess: Optional[str]) -> Tuple[SolverState, Optional[str]]:
+    """solve_turn without the search (a random remaining candidate), for when it failed."""
+    state.apply(guess, pattern)
+    if len(state) <= 1:
+        return state, None
+    return state, next_guess or state.random_candidate()
+
+
+def word_source(words: Any) -> Tuple[List[str], Container[str]]:
+    """Word list and membership test from a Dictionary or a plain word list."""
+    if hasattr(words, "words"):
+        return words.words, words
+    return list(words), set(words)
+
+
+# --- Single Player ---
+class PlayerSnapshot(NamedTuple):
+    """State of a single player game after one action."""
+    secret_word: str
+    guesses: Tuple[Tuple[Triplet, ...], ...]
+    current: str
+    letters: Dict[str, str]
+    game_over: bool
+    won: bool
+    round_points: int
+    session_score: int
+    rounds_played: int
+    session_over: bool
+    event: str
+
+
+class PlayerEngine:
+    """Single player rules: validation, EXTREME lies, scoring and rounds."""
+
+    def __init__(self, words: Any, difficulty: str = "NORMAL", word_length: int = 5,
+                 max_attempts: int = 6, rng: Optional[random.Random] = None,
+                 lie_strategy: str = "window") -> None:
+        self.words, self.valid = word_source(words)
+        self.difficulty = difficulty
+        self.word_length = word_length
+        self.max_attempts = max_attempts
+        self.rng = rng or random.Random()
+        if lie_strategy not in LIE_STRATEGIES:
+            raise ValueError(f"Unknown lie strategy: {lie_strategy}")
+        self.lie_strategy = lie_strategy
+        if difficulty == "EXTREME" and self.words:
+            # Encode the dictionary now so the lie turn does not stall on Enter.
+            get_feedback_matrix(self.words)
+        self.session_score = 0
+        self.rounds_played = 0
+        self.session_over = False
+        self.new_round()
+
+    def new_round(self, secret_word: Optional[str] = None) -> None:
+        """Starts a round with a random (or the given) secret word."""
+        self.rounds_played += 1
+        self.secret_word = (secret_word or self.rng.choice(self.words)).upper()
+        self.guesses: List[List[Triplet]] = []
+        self.current = ""
+        self.letters: Dict[str, str] = {}
+        self.game_over = False
+        self.won = False
+        self.round_points = 0
+        self.event = ""
+
+        # Extreme Mode: one turn (never the winning guess) gets a misleading pattern.
+        self.lie_index = -1
+        if self.difficulty == "EXTREME":
+            self.lie_index = self.rng.randint(0, self.max_attempts - 2)
+
+    def step(self, action: Action) -> PlayerSnapshot:
+        """Applies one action and returns the new state."""
+        kind = action[0]
+        self.event = ""
+        if kind == NEXT:
+            if self.game_over and self.won:
+                self.new_round()
+        elif self.game_over:
+            pass
+        elif kind == TYPE:
+            if len(self.current) < self.word_length and action[1].isalpha():
+                self.current += action[1].upper()
+        elif kind == DELETE:
+            self.current = self.current[:-1]
+        elif kind == ENTER:
+            self.submit()
+        elif kind == GUESS:
+            self.current = action[1].upper()
+            self.submit()
+        else:
+            raise ValueError(f"Unknown action: {kind}")
+        return self.snapshot()
+
+    def submit(self) -> None:
+        """Scores the typed row (a full row that is not a word is rejected)."""
+        if len(self.current) != self.word_length:
+            return
+        if self.current not in self.valid:
+            self.event = INVALID
+            return
+
+        if (self.difficulty == "EXTREME" and len(self.guesses) == self.lie_index and
+                self.current != self.secret_word):
+            history = [("".join(t[0] for t in row), get_pattern_string(row)) for row in self.guesses]
+            result = get_best_lie(self.current, self.words, self.word_length, self.lie_strategy,
+                                  self.secret_word, history, self.rng)
+        else:
+            result = colour_set(self.current, self.secret_word, self.word_length)
+        self.guesses.append(result)
+        update_letters(self.letters, result)
+        self.current = ""
+
+        if all(t[2] == "g" for t in result):
+            self.won = self.game_over = True
+            self.round_points = calculate_score(self.word_length, self.max_attempts,
+                                                len(self.guesses), self.difficulty)
+            self.session_score += self.round_points
+            self.event = WON
+        elif len(self.guesses) >= self.max_attempts:
+            self.game_over = self.session_over = True
+            self.event = LOST
+
+    def snapshot(self) -> PlayerSnapshot:
+        """Immutable view of the current state."""
+        return PlayerSnapshot(
+            self.secret_word, tuple(tuple(row) for row in self.guesses), self.current,
+            dict(self.letters), self.game_over, self.won, self.round_points,
+            self.session_score, self.rounds_played, self.session_over, self.event)
+
+
+# --- AI Solver ---
+class SolverSnapshot(NamedTuple):
+    """State of an AI Solver game after one action."""
+    suggestion: str
+    pattern: str
+    history: Tuple[Tuple[str, str], ...]
+    attempts: int
+    status: str          # PLAYING, THINKING, WON or LOST
+    message: str
+    words_left: int
+    lie_turn: Optional[int]
+
+
+class SolverEngine:
+    """
+    AI Solver rules: the user enters feedback for each suggestion and the
+    solver narrows its candidates. A submitted turn stays THINKING until it is
+    resolved, either with a result computed elsewhere (the UI's worker) or
+    synchronously by the engine.
+    """
+
+    def __init__(self, words: List[str], difficulty: str = "NORMAL",
+                 book: Optional[OpeningBook] = None, tree: Any = None) -> None:
+        self.words = words
+        self.word_length = len(words[0]) if words else 0
+        self.difficulty = difficulty
+        self.book = book
+        self.tree = tree
+        # Extreme Mode: candidates may contradict up to one feedback (a lie)
+        self.initial_state: SolverState
+        if difficulty == "EXTREME":
+            self.initial_state = ExtremeState.from_words(words, lie_budget=1)
+        else:
+            self.initial_state = SolverState.from_words(words)
+        self.restart()
+
+    def restart(self) -> None:
+        """Starts over from the full candidate set."""
+        self.solver = self.initial_state.clone()
+        self.cursor = self.tree.cursor() if self.tree else None
+        if self.cursor:
+            self.suggestion = self.words[self.cursor.guess_id]
+        else:
+            self.suggestion = self.book.opener if self.book else self.solver.random_candidate()
+        self.history: List[Tuple[str, str]] = []
+        self.pattern: List[str] = []
+        self.attempts = 1
+        self.status = "PLAYING"
+        self.message = "Click boxes or type G/Y/X"
+        self.words_left = len(self.solver)
+        self.lie_turn: Optional[int] = None
+        self.pending: Optional[Tuple[SolverState, str, str, Optional[str]]] = None
+        self.turn_started = 0.0
+
+    def step(self, action: Action) -> SolverSnapshot:
+        """Applies one action and returns the new state."""
+        kind = action[0]
+        if kind == RESTART:
+            self.restart()
+        elif kind == RESOLVE:
+            if self.pending is not None:
+                self.resolve(action[1] if len(action) > 1 and action[1] else solve_turn(*self.pending))
+        elif self.status != "PLAYING":
+            pass
+        elif kind == PATTERN:
+            if len(self.pattern) < self.word_length and action[1] in ("g", "y", "x"):
+                self.pattern.append(action[1])
+        elif kind == MARK:
+            index = action[1]
+            if 0 <= index < self.word_length:
+                while len(self.pattern) <= index:
+                    self.pattern.append("x")
+                # Cycle colors: x -> y -> g -> x
+                self.pattern[index] = {"x": "y", "y": "g"}.get(self.pattern[index], "x")
+        elif kind == DELETE:
+            if self.pattern:
+                self.pattern.pop()
+        elif kind == SUBMIT:
+            self.submit()
+        elif kind == FEEDBACK:
+            self.pattern = list(action[1])
+            self.submit()
+        else:
+            raise ValueError(f"Unknown action: {kind}")
+        return self.snapshot()
+
+    def submit(self) -> None:
+        """Records the entered feedback and starts the next turn (THINKING)."""
+        if len(self.pattern) != self.word_length:
+            return
+        pat_str = "".join(self.pattern)
+        self.history.append((self.suggestion, pat_str))
+        self.pattern = []
+
+        if pat_str == ("g" * self.word_length):
+            self.status = "WON"
+            return
+
+        self.attempts += 1
+        self.message = "CALCULATING..."
+        self.status = "THINKING"
+
+        # The tree and the book answer instantly; otherwise the solver searches.
+        next_guess = None
+        if self.cursor is not None and self.cursor.advance(pat_str):
+            next_guess = self.words[self.cursor.guess_id]
+        elif self.difficulty != "EXTREME":
+            self.cursor = None
+            next_guess = opening_reply(self.book, self.history)
+        self.pending = (self.solver.clone(), self.suggestion, pat_str, next_guess)
+        self.turn_started = time.perf_counter()
+
+    def resolve(self, result: Tuple[SolverState, Optional[str]]) -> None:
+        """Finishes the pending turn with solve_turn's result."""
+        state, next_guess = result
+        self.pending = None
+        PROFILER.record("solver turn", "turn", self.turn_started)
+        self.solver = state
+        self.words_left = len(state)
+        if isinstance(state, ExtremeState):
+            self.lie_turn = state.likely_lie_turn()
+
+        # Determine Next Step
+        if self.words_left == 0:
+            self.status = "LOST"
+        elif self.words_left == 1:
+            self.suggestion = state.words[0]
+            self.message = "SOLVED! Word found."
+            self.status = "WON"
+        else:
+            self.suggestion = next_guess or state.best_guess()
+            self.message = "Type pattern for new word"
+            self.status = "PLAYING"
+
+    def snapshot(self) -> SolverSnapshot:
+        """Immutable view of the current state."""
+        return SolverSnapshot(self.suggestion, "".join(self.pattern), tuple(self.history),
+                              self.attempts, self.status, self.message, self.words_left,
+                              self.lie_turn)
+
+
+# --- Player vs Bot ---
+class PveSnapshot(NamedTuple):
+    """State of a PvE game after one action."""
+    secret_word: str
+    player_guesses: Tuple[Tuple[Triplet, ...], ...]
+    current: str
+    player_won: bool
+    player_lost: bool
+    bot_guesses: Tuple[Tuple[Triplet, ...], ...]
+    bot_won: bool
+    bot_lost: bool
+    bot_owed: int
+    player_score: int
+    bot_score: int
+    rounds_played: int
+    round_over: bool
+    status_msg: str
+    event: str
+
+
+class PveEngine:
+    """
+    Player vs bot rules. The bot owes one move per player guess and plays out
+    the rest of its round once the player is done. Bot moves are supplied by
+    the caller (e.g. a Gemini reply) or, with ("bot", None), picked by the
+    engine: edit distance for the EDIT bot, the local solver otherwise.
+    """
+
+    def __init__(self, words: Any, bot_type: str = "EDIT", word_length: int = 5,
+                 max_attempts: int = 6, book: Optional[OpeningBook] = None,
+                 rng: Optional[random.Random] = None, neighbors: Optional[NeighborIndex] = None) -> None:
+        self.words, self.valid = word_source(words)
+        self.bot_type = bot_type
+        self.neighbors = neighbors
+        self.word_length = word_length
+        self.max_attempts = max_attempts
+        self.book = book
+        self.rng = rng or random.Random()
+        self.base_state = SolverState.from_words(self.words)
+        self.player_score = 0
+        self.bot_score = 0
+        self.rounds_played = 0
+        self.new_round()
+
+    def new_round(self, secret_word: Optional[str] = None) -> None:
+        """Starts a round with a random (or the given) secret word."""
+        self.rounds_played += 1
+        self.secret_word = (secret_word or self.rng.choice(self.words)).upper()
+        self.player_guesses: List[List[Triplet]] = []
+        self.current = ""
+        self.player_won = self.player_lost = False
+        self.bot_guesses: List[List[Triplet]] = []
+        self.bot_state = self.base_state.clone()
+        self.bot_last_guess = ""
+        self.bot_won = self.bot_lost = False
+        self.bot_owed = 0
+        self.owed_since = 0.0
+        self.round_over = False
+        self.status_msg = ""
+        self.event = ""
+
+    @property
+    def player_done(self) -> bool:
+        return self.player_won or self.player_lost
+
+    @property
+    def bot_done(self) -> bool:
+        return self.bot_won or self.bot_lost
+
+    @property
+    def session_over(self) -> bool:
+        """A lost round ends the session."""
+        return self.round_over and self.player_lost
+
+    def round_score(self, guesses: int) -> int:
+        return (self.word_length * 10) + (self.max_attempts - guesses) * 20
+
+    def step(self, action: Action) -> PveSnapshot:
+        """Applies one action and returns the new state."""
+        kind = action[0]
+        self.event = ""
+        if kind == NEXT:
+            if self.round_over and not self.player_lost:
+                self.new_round()
+        elif kind == BOT:
+            if self.bot_owed and not self.bot_done:
+                self.play_bot(action[1] if len(action) > 1 and action[1] else self.bot_guess())
+        elif self.player_done:
+            pass
+        elif kind == TYPE:
+            if len(self.current) < self.word_length and action[1].isalpha():
+                self.current += action[1].upper()
+        elif kind == DELETE:
+            self.current = self.current[:-1]
+        elif kind == ENTER:
+            self.submit()
+        elif kind == GUESS:
+            self.current = action[1].upper()
+            self.submit()
+        else:
+            raise ValueError(f"Unknown action: {kind}")
+        self.settle()
+        return self.snapshot()
+
+    def submit(self) -> None:
+        """Scores the player's typed row; each valid guess owes the bot a move."""
+        if len(self.current) != self.word_length:
+            return
+        if self.current not in self.valid:
+            self.event = INVALID
+            return
+        self.player_guesses.append(colour_set(self.current, self.secret_word, self.word_length))
+        if self.current == self.secret_word:
+            self.player_won = True
+            self.player_score += self.round_score(len(self.player_guesses))
+        elif len(self.player_guesses) >= self.max_attempts:
+            self.player_lost = True
+        self.current = ""
+        self.owe_bot_move()
+
+    def owe_bot_move(self) -> None:
+        """Adds one owed bot move; the bot turn latency runs from the oldest one."""
+        if self.bot_owed == 0:
+            self.owed_since = time.perf_counter()
+        self.bot_owed += 1
+
+    def bot_guess(self) -> str:
+        """The engine's own choice of bot move."""
+        if self.bot_type == "EDIT":
+            return edit_bot_guess(self.bot_state, self.bot_last_guess, self.words, self.rng, self.neighbors)
+        return local_bot_guess(self.bot_state, self.book)
+
+    @PROFILER.traced(category="bot")
+    def play_bot(self, bot_word: str) -> None:
+        """Plays one owed bot move."""
+        bot_word = bot_word.upper()
+        self.bot_last_guess = bot_word
+        result = colour_set(bot_word, self.secret_word, self.word_length)
+        self.bot_guesses.append(result)
+        self.bot_state.apply(bot_word, "".join(t[2] for t in result))
+        self.bot_owed -= 1
+        PROFILER.record("bot turn", "turn", self.owed_since)
+        self.owed_since = time.perf_counter()
+
+        if bot_word == self.secret_word:
+            self.bot_won = True
+            self.bot_score += self.round_score(len(self.bot_guesses))
+        elif len(self.bot_guesses) >= self.max_attempts:
+            self.bot_lost = True
+
+    def settle(self) -> None:
+        """Bot debt and end-of-round bookkeeping after every action."""
+        if self.bot_done:
+            self.bot_owed = 0
+        elif self.player_done and self.bot_owed == 0:
+            # The player is done: the bot keeps playing one move at a time.
+            self.owe_bot_move()
+
+        if self.player_done and self.bot_done and not self.round_over:
+            self.round_over = True
+            self.status_msg = "YOU LOST!" if self.player_lost else "ROUND COMPLETE"
+
+    def snapshot(self) -> PveSnapshot:
+        """Immutable view of the current state."""
+        return PveSnapshot(
+            self.secret_word, tuple(tuple(row) for row in self.player_guesses), self.current,
+            self.player_won, self.player_lost, tuple(tuple(row) for row in self.bot_guesses),
+            self.bot_won, self.bot_lost, self.bot_owed, self.player_score, self.bot_score,
+            self.rounds_played, self.round_over, self.status_msg, self.event)
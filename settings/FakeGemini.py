@@ -0,0 +1,70 @@
+"""
+Offline stand-in for the Gemini client.
+Mimics client.models.generate_content with a configurable latency, so the
+PvE bot's deadline and fallback paths can be exercised without a network.
+Enable it in the game with WORDLE_FAKE_GEMINI=<latency in seconds>.
+"""
+import random
+import re
+import time
+from typing import Callable, List, Optional, Union
+
+
+class FakeResponse:
+    """The part of a Gemini response the game reads."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+
+class FakeModels:
+    """Answers generate_content after sleeping for the client's latency."""
+
+    def __init__(self, client: "FakeGeminiClient") -> None:
+        self._client = client
+
+    def generate_content(self, model: str, contents: str) -> FakeResponse:
+        client = self._client
+        client.calls.append(contents)
+        if client.timeout is not None and client.latency > client.timeout:
+            time.sleep(client.timeout)
+            raise TimeoutError("Fake Gemini request timed out")
+        time.sleep(client.latency)
+        if client.error is not None:
+            raise client.error
+        if callable(client.reply):
+            return FakeResponse(client.reply(contents))
+        if client.reply is not None:
+            return FakeResponse(client.reply)
+        return FakeResponse(client.guess_from_prompt(contents))
+
+
+class FakeGeminiClient:
+    """
+    Fake client. reply may be a fixed string or a function of the prompt;
+    by default it answers with a random word of the requested length.
+    error, if set, is raised instead of answering. timeout (seconds) acts like
+    the real client's request timeout: slower replies raise TimeoutError.
+    """
+
+    def __init__(self, latency: float = 0.0, reply: Union[str, Callable[[str], str], None] = None,
+                 words: Optional[List[str]] = None, error: Optional[Exception] = None,
+                 words_file: Optional[str] = None, timeout: Optional[float] = None) -> None:
+        self.latency = latency
+        self.timeout = timeout
+        self.reply = reply
+        self.words = words or []
+        self.words_file = words_file
+        self.error = error
+        self.calls: List[str] = []
+        self.models = FakeModels(self)
+
+    def guess_from_prompt(self, prompt: str) -> str:
+        """Picks a word of the length the prompt asks for."""
+        match = re.search(r"has (\d+) letters", prompt)
+        length = int(match.group(1)) if match else 5
+        if not self.words and self.words_file:
+            with open(self.words_file, "r", encoding="utf-8") as f:
+                self.words = [line.strip().upper() for line in f if line.strip().isalpha()]
+        options = [w for w in self.words if len(w) == length]
+        return random.choice(options) if options else "A" * length
@@ -0,0 +1,95 @@
+"""
+Shared frame pacing for the game loops.
+A loop asks the driver for its events once per frame. While something
+animates (a shake, a bot turn, a solver job) the frame rate is capped at FPS;
+otherwise the loop blocks on pygame.event.wait until input arrives or the idle
+timeout passes, so a static screen costs almost no CPU. Frames per second and
+CPU time per frame are measured over one-second windows. F3 toggles the
+span profiler (settings.Profiler) and F4 exports its trace from any screen.
+"""
+import os
+import time
+from typing import Dict, List, Optional
+
+import pygame
+
+from settings.Constants import FPS, IDLE_WAIT_MS
+from settings.RenderCache import RENDER_CACHE
+from settings.Profiler import PROFILER
+
+
+class FrameLoop:
+    """Capped-FPS / event-driven idle loop driver with FPS and CPU reporting."""
+
+    def __init__(self, fps: int = FPS, idle_wait_ms: int = IDLE_WAIT_MS) -> None:
+        self.fps = fps
+        self.idle_wait_ms = idle_wait_ms
+        self.clock = pygame.time.Clock()
+        self.show_stats = bool(os.environ.get("WORDLE_FRAME_STATS"))
+        self.idle = False
+        self.frames_per_second = 0.0
+        self.cpu_ms_per_frame = 0.0
+        self._redraw = True
+        self._window_start = time.perf_counter()
+        self._window_cpu = time.process_time()
+        self._window_frames = 0
+
+    def events(self, active: bool = False) -> List[pygame.event.Event]:
+        """
+        Waits for the next frame and returns its events.
+        Active frames (or the frame after any input) are paced by clock.tick;
+        otherwise this blocks until an event arrives or idle_wait_ms passes.
+        """
+        events: List[pygame.event.Event] = []
+        self.idle = not (active or self._redraw)
+        with PROFILER.span("wait", "frame"):
+            if self.idle:
+                first = pygame.event.wait(self.idle_wait_ms)
+                if first.type != pygame.NOEVENT:
+                    events.append(first)
+            self.clock.tick(self.fps)
+            events.extend(pygame.event.get())
+
+        # Input changes what is on screen: draw at least one more paced frame.
+        self._redraw = bool(events)
+        events = [event for event in events if not self._profiler_key(event)]
+        PROFILER.begin_frame()
+        self._count_frame()
+        return events
+
+    def _profiler_key(self, event: pygame.event.Event) -> bool:
+        """Handles the profiler hotkeys; returns True if the event was one."""
+        if event.type != pygame.KEYDOWN or event.key not in (pygame.K_F3, pygame.K_F4):
+            return False
+        if event.key == pygame.K_F3:
+            PROFILER.toggle()
+        elif PROFILER.spans:
+            PROFILER.export()
+        return True
+
+    def _count_frame(self) -> None:
+        self._window_frames += 1
+        now = time.perf_counter()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            cpu = time.process_time()
+            self.frames_per_second = self._window_frames / elapsed
+            self.cpu_ms_per_frame = (cpu - self._window_cpu) * 1000 / self._window_frames
+            self._window_start, self._window_cpu, self._window_frames = now, cpu, 0
+
+    def draw_stats(self, screen: Optional[pygame.Surface]) -> None:
+        """Draws the FPS / CPU line when WORDLE_FRAME_STATS is set."""
+        if not self.show_stats or screen is None:
+            return
+        line = (f"{self.frames_per_second:.0f} fps  cpu {self.cpu_ms_per_frame:.1f} ms/frame"
+                f"  {'idle' if self.idle else 'active'}")
+        font = RENDER_CACHE.font("Arial", 14)
+        screen.blit(font.render(line, True, (200, 200, 200)), (6, 20))
+
+    def stats(self) -> Dict[str, float]:
+        """Latest frames per second and CPU milliseconds per frame."""
+        return {
+            "fps": self.frames_per_second,
+            "cpu_ms_per_frame": self.cpu_ms_per_frame,
+            "idle": float(self.idle),
+        }
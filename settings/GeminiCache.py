@@ -0,0 +1,187 @@
+"""
+Two-tier cache for Gemini bot guesses.
+Replies are keyed by a normalized (model, word length, feedback history)
+fingerprint and kept in an in-memory LRU backed by a JSON file on disk whose
+size is bounded by evicting the least recently used entries. Hits reorder the
+disk store too and are written back in batches (or by flush), so the order
+survives a restart. Replies found to be invalid are flagged so the cache never
+serves or stores them again; the flags share the size bound, oldest dropped first.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CACHE_FILE = "Files/gemini-cache.json"
+
+
+def fingerprint(model: str, word_length: int, history: Sequence[Tuple[str, str]]) -> str:
+    """Normalized cache key for a position: model, word length and (word, pattern) pairs."""
+    moves = ",".join(f"{word.upper()}:{pattern.lower()}" for word, pattern in history)
+    return f"{model}|{word_length}|{moves}"
+
+
+class GeminiCache:
+    """In-memory LRU in front of a size-bounded JSON store, with hit/miss counters."""
+
+    def __init__(self, path: Optional[str] = CACHE_FILE, memory_size: int = 256,
+                 max_disk_bytes: int = 256 * 1024, flush_every: int = 16) -> None:
+        self.path = path
+        self.memory_size = memory_size
+        self.max_disk_bytes = max_disk_bytes
+        self.flush_every = flush_every
+        self.memory: "OrderedDict[str, str]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._disk: Optional["OrderedDict[str, str]"] = None
+        # Flag ids in the order they were flagged (a dict used as an ordered set).
+        self._flagged: Dict[str, None] = {}
+        self._unsaved_hits = 0
+
+    # --- Disk tier ---
+    def _load_disk(self) -> "OrderedDict[str, str]":
+        """Loads the disk store on first use; entries are ordered oldest use first."""
+        if self._disk is not None:
+            return self._disk
+        self._disk = OrderedDict()
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                for key, word in data.get("entries", []):
+                    self._disk[str(key)] = str(word)
+                self._flagged.update(dict.fromkeys(str(item) for item in data.get("flagged", [])))
+            except (json.JSONDecodeError, OSError, ValueError, AttributeError):
+                self._disk = OrderedDict()
+        return self._disk
+
+    def _save_disk(self) -> None:
+        """Evicts the least recently used entries until the file fits, then writes it."""
+        self._unsaved_hits = 0
+        if not self.path:
+            return
+        disk = self._load_disk()
+        self._trim_flags()
+        data: Dict[str, List] = {"entries": [], "flagged": list(self._flagged)}
+        while True:
+            data["entries"] = [[key, word] for key, word in disk.items()]
+            payload = json.dumps(data)
+            if len(payload.encode("utf-8")) <= self.max_disk_bytes or not disk:
+                break
+            # Drop a batch of the oldest entries proportional to the excess.
+            excess = len(payload) - self.max_disk_bytes
+            average = max(1, len(json.dumps(data["entries"])) // max(1, len(disk)))
+            for _ in range(min(len(disk), excess // average + 1)):
+                disk.popitem(last=False)
+
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving Gemini cache: {e}")
+
+    # --- Public API ---
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached reply for a position, or None (counted as a miss)."""
+        with self._lock:
+            word = self.memory.get(key)
+            if word is not None:
+                self.memory.move_to_end(key)
+                self._touch(key)
+                self.memory_hits += 1
+                return word
+
+            disk = self._load_disk()
+            word = disk.get(key)
+            if word is not None:
+                self._touch(key)
+                self._remember(key, word)
+                self.disk_hits += 1
+                return word
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, word: str) -> None:
+        """Stores a reply in both tiers unless it was flagged as invalid."""
+        word = word.upper()
+        with self._lock:
+            self._load_disk()
+            if self._flag_id(key, word) in self._flagged:
+                return
+            self._remember(key, word)
+            self._disk[key] = word
+            self._disk.move_to_end(key)
+            self._save_disk()
+
+    def flag(self, key: str, word: str) -> None:
+        """Marks a reply as invalid: it is dropped and never served or stored again."""
+        word = word.upper()
+        with self._lock:
+            disk = self._load_disk()
+            flag_id = self._flag_id(key, word)
+            self._flagged.pop(flag_id, None)
+            self._flagged[flag_id] = None
+            if self.memory.get(key) == word:
+                del self.memory[key]
+            if disk.get(key) == word:
+                del disk[key]
+            self._save_disk()
+
+    def flush(self) -> None:
+        """Writes back the recency of hits not saved yet (called at exit)."""
+        with self._lock:
+            if self._unsaved_hits:
+                self._save_disk()
+
+    def is_flagged(self, key: str, word: str) -> bool:
+        """True if this reply was flagged as invalid for this position."""
+        with self._lock:
+            self._load_disk()
+            return self._flag_id(key, word.upper()) in self._flagged
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and tier sizes."""
+        with self._lock:
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self.memory),
+                "disk_entries": len(self._disk or {}),
+                "flagged": len(self._flagged),
+            }
+
+    # --- Helpers ---
+    def _touch(self, key: str) -> None:
+        """Marks a hit as the most recent use on disk, saving every flush_every hits."""
+        if self._disk is None or key not in self._disk:
+            return
+        self._disk.move_to_end(key)
+        self._unsaved_hits += 1
+        if self._unsaved_hits >= self.flush_every:
+            self._save_disk()
+
+    def _trim_flags(self) -> None:
+        """Drops the oldest flags while they take more than half of the disk budget."""
+        size = sum(len(json.dumps(flag_id)) + 2 for flag_id in self._flagged)
+        while self._flagged and size > self.max_disk_bytes // 2:
+            oldest = next(iter(self._flagged))
+            del self._flagged[oldest]
+            size -= len(json.dumps(oldest)) + 2
+
+    def _remember(self, key: str, word: str) -> None:
+        self.memory[key] = word
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    @staticmethod
+    def _flag_id(key: str, word: str) -> str:
+        return f"{key}=>{word}"
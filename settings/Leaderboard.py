@@ -4,10 +4,13 @@ Displays the High Scores/Leaderboard.
 import sys
 import pygame
 from settings.Constants import (
-    WIDTH, HEIGHT, COLOR_BG, COLOR_TEXT, COLOR_ACCENT,
+    WIDTH, HEIGHT, COLOR_TEXT, COLOR_ACCENT,
     COLOR_PANEL_BG, COLOR_BORDER
 )
-from settings.Logic import Button
+from settings.Button import Button
+from settings.FrameLoop import FrameLoop
+from settings.Compositor import Compositor
+from settings.RenderCache import RENDER_CACHE
 from settings import JsonStats
 
 
@@ -15,11 +18,12 @@ def show_leaderboard() -> None:
     """Displays the leaderboard screen."""
     pygame.init()
     screen = pygame.display.get_surface()
-    clock = pygame.time.Clock()
+    frame_loop = FrameLoop()
+    compositor = Compositor()
 
-    font_title = pygame.font.SysFont("Arial", 50, bold=True)
-    font_header = pygame.font.SysFont("Arial", 25, bold=True)
-    font_row = pygame.font.SysFont("Arial", 30)
+    font_title = RENDER_CACHE.font("Arial", 50, bold=True)
+    font_header = RENDER_CACHE.font("Arial", 25, bold=True)
+    font_row = RENDER_CACHE.font("Arial", 30)
 
     center_x = WIDTH // 2
     btn_back = Button(center_x - 100, HEIGHT - 100, 200, 60, "BACK",
@@ -27,37 +31,24 @@ def show_leaderboard() -> None:
 
     scores = JsonStats.load_leaderboard()
 
-    running = True
-    while running:
-        mouse_pos = pygame.mouse.get_pos()
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if btn_back.is_clicked(mouse_pos):
-                    running = False
-
-        screen.fill(COLOR_BG)
-
+    def draw_table(surface: pygame.Surface) -> None:
+        """Title, header and score rows (everything but the button)."""
         # Title
         title = font_title.render("HALL OF FAME", True, (255, 215, 0))
-        screen.blit(title, title.get_rect(center=(center_x, 60)))
+        surface.blit(title, title.get_rect(center=(center_x, 60)))
 
         start_y = 140
         if not scores:
             no_data = font_row.render("No games played yet.", True, COLOR_ACCENT)
-            screen.blit(no_data, no_data.get_rect(center=(center_x, 300)))
+            surface.blit(no_data, no_data.get_rect(center=(center_x, 300)))
         else:
             # Header
-            screen.blit(font_header.render("RANK", True, COLOR_ACCENT), (center_x - 250, start_y))
-            screen.blit(font_header.render("NAME", True, COLOR_ACCENT), (center_x - 100, start_y))
-            screen.blit(font_header.render("SCORE", True, COLOR_ACCENT), (center_x + 180, start_y))
+            surface.blit(font_header.render("RANK", True, COLOR_ACCENT), (center_x - 250, start_y))
+            surface.blit(font_header.render("NAME", True, COLOR_ACCENT), (center_x - 100, start_y))
+            surface.blit(font_header.render("SCORE", True, COLOR_ACCENT), (center_x + 180, start_y))
 
             # Divider Line
-            pygame.draw.line(screen, COLOR_BORDER,
+            pygame.draw.line(surface, COLOR_BORDER,
                              (center_x - 260, start_y + 35),
                              (center_x + 260, start_y + 35), 2)
 
@@ -78,10 +69,24 @@ def show_leaderboard() -> None:
                 name_surf = font_row.render(str(entry['name'])[:12], True, row_color)
                 score_surf = font_row.render(str(entry['score']), True, row_color)
 
-                screen.blit(rank_surf, (center_x - 230, y_pos))
-                screen.blit(name_surf, (center_x - 100, y_pos))
-                screen.blit(score_surf, (center_x + 180, y_pos))
+                surface.blit(rank_surf, (center_x - 230, y_pos))
+                surface.blit(name_surf, (center_x - 100, y_pos))
+                surface.blit(score_surf, (center_x + 180, y_pos))
+
+    running = True
+    while running:
+        mouse_pos = pygame.mouse.get_pos()
+
+        for event in frame_loop.events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if btn_back.is_clicked(mouse_pos):
+                    running = False
 
-        btn_back.draw(screen)
-        pygame.display.flip()
-        clock.tick(30)
\ No newline at end of file
+        # The table never changes while the screen is open; only the button redraws.
+        compositor.layer("table", (0, 0, WIDTH, HEIGHT - 110), len(scores), draw_table, screen)
+        compositor.button("back", btn_back, screen)
+        compositor.present(screen)
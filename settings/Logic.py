@@ -2,58 +2,15 @@
 Contains the core logic for the Wordle game, including word validation,
 coloring algorithms, and bot heuristics.
 """
+import os
 import random
+import threading
 from functools import lru_cache
-from typing import List, Tuple, Dict, Optional, Any, Set
-import pygame
-
-from settings.Constants import COLOR_CORRECT
-
-
-class Button:
-    """A simple UI Button class for Pygame."""
-
-    def __init__(self, x: int, y: int, width: int, height: int, text: str,
-                 color: Tuple[int, int, int], action_id: Optional[Any] = None,
-                 text_color: Tuple[int, int, int] = (255, 255, 255),
-                 border_color: Optional[Tuple[int, int, int]] = None,
-                 font: Optional[pygame.font.Font] = None,
-                 hover_color: Optional[Tuple[int, int, int]] = None) -> None:
-        self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
-        self.color = color
-        self.text_color = text_color
-        self.action_id = action_id
-        self.border_color = border_color
-        self.hover_color = hover_color
-        self.is_selected = False
-        self.font = font if font else pygame.font.SysFont("Arial", 30, bold=True)
-
-    def draw(self, screen: pygame.Surface) -> None:
-        """Draws the button on the screen."""
-        mouse_pos = pygame.mouse.get_pos()
-        draw_color = self.color
-
-        if self.is_selected:
-            draw_color = COLOR_CORRECT
-        elif self.rect.collidepoint(mouse_pos):
-            if self.hover_color:
-                draw_color = self.hover_color
-            else:
-                draw_color = tuple(min(c + 30, 255) for c in self.color) # type: ignore
-
-        pygame.draw.rect(screen, draw_color, self.rect, border_radius=8)
-
-        if self.border_color:
-            pygame.draw.rect(screen, self.border_color, self.rect, 3, border_radius=8)
+from typing import List, Tuple, Dict, Optional, Any, Iterator, NamedTuple
+import numpy as np
 
-        text_surface = self.font.render(self.text, True, self.text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
-
-    def is_clicked(self, pos: Tuple[int, int]) -> bool:
-        """Checks if the button was clicked."""
-        return self.rect.collidepoint(pos)
+from settings.WordStore import get_word_store
+from settings.Profiler import PROFILER
 
 
 def colour_set(guess_word: str, secret_word: str, word_length: int) -> List[Tuple[str, int, str]]:
@@ -83,8 +40,320 @@ def colour_set(guess_word: str, secret_word: str, word_length: int) -> List[Tupl
     return triplets
 
 
+# Feedback codes pack a colour pattern into one base-3 integer: position i
+# contributes its digit (x=0, y=1, g=2) times 3**i, so 'ggggg' is 242.
+COLOUR_DIGITS: Dict[str, int] = {"x": 0, "y": 1, "g": 2}
+DIGIT_COLOURS = "xyg"
+ROW_CHUNK = 256
+CHUNK_CELLS = 1 << 20
+# Largest guess x answer matrix kept in memory; bigger word lists (and private
+# matrices) compute their rows from the kernel each time instead.
+MAX_CACHED_MATRIX_BYTES = 1 << 29
+
+
+def code_dtype(word_length: int) -> Any:
+    """Returns the smallest unsigned dtype able to hold every code of a length."""
+    return np.uint8 if 3 ** word_length <= 256 else np.uint16
+
+
+def pattern_to_code(colour_pattern: str) -> int:
+    """Encodes a pattern string (e.g. 'gyxgg') as a feedback code."""
+    code = 0
+    for position, colour in enumerate(colour_pattern.lower()):
+        code += COLOUR_DIGITS.get(colour, 0) * 3 ** position
+    return code
+
+
+def code_to_pattern(code: int, word_length: int) -> str:
+    """Decodes a feedback code back into its pattern string."""
+    colours = []
+    for _ in range(word_length):
+        colours.append(DIGIT_COLOURS[code % 3])
+        code //= 3
+    return "".join(colours)
+
+
+def words_to_array(words: List[str], word_length: int) -> np.ndarray:
+    """Packs equal-length words into an (N, length) array of code points."""
+    if not words:
+        return np.zeros((0, word_length), dtype=np.uint32)
+    packed = "".join(words).encode("utf-32-le")
+    return np.frombuffer(packed, dtype=np.uint32).reshape(len(words), word_length)
+
+
+# Constraints index letters A-Z as 0-25; anything else shares slot 26.
+ALPHABET_SIZE = 27
+
+
+def letter_slots(letters: np.ndarray) -> np.ndarray:
+    """Maps an array of code points to constraint letter slots."""
+    slots = letters.astype(np.int64) - ord("A")
+    slots[(slots < 0) | (slots >= 26)] = 26
+    return slots.astype(np.uint8)
+
+
+class Constraint:
+    """
+    Feedback compiled into a positional allow-mask per slot and
+    minimum/maximum counts per letter.
+    """
+
+    def __init__(self, word_length: int) -> None:
+        self.word_length = word_length
+        self.allowed = np.ones((word_length, ALPHABET_SIZE), dtype=bool)
+        self.min_counts = np.zeros(ALPHABET_SIZE, dtype=np.uint8)
+        self.max_counts = np.full(ALPHABET_SIZE, word_length, dtype=np.uint8)
+
+    @classmethod
+    def from_history(cls, history: List[Tuple[str, str]], word_length: int) -> "Constraint":
+        """Compiles a list of (guess, pattern) pairs into one constraint."""
+        constraint = cls(word_length)
+        for guess_word, colour_pattern in history:
+            constraint.add_feedback(guess_word, colour_pattern)
+        return constraint
+
+    def add_feedback(self, guess_word: str, colour_pattern: str) -> None:
+        """Tightens the constraint with the feedback for one guess."""
+        slots = letter_slots(words_to_array([guess_word.upper()], self.word_length))[0]
+        colour_pattern = colour_pattern.lower()
+        found = np.zeros(ALPHABET_SIZE, dtype=np.uint8)
+        greyed = np.zeros(ALPHABET_SIZE, dtype=bool)
+
+        for position, (slot, colour) in enumerate(zip(slots, colour_pattern)):
+            if colour == "g":
+                keep = self.allowed[position, slot]
+                self.allowed[position] = False
+                self.allowed[position, slot] = keep
+                found[slot] += 1
+            else:
+                # Yellow and grey both rule the letter out of this slot.
+                self.allowed[position, slot] = False
+                if colour == "y":
+                    found[slot] += 1
+                else:
+                    greyed[slot] = True
+
+        # g/y give a lower bound on the count; a grey copy makes it exact.
+        np.maximum(self.min_counts, found, out=self.min_counts)
+        self.max_counts[greyed] = np.minimum(self.max_counts[greyed], found[greyed])
+
+    def mask(self, positions: np.ndarray, letter_counts: np.ndarray) -> np.ndarray:
+        """Returns which of the given words (as slot and count arrays) satisfy the constraint."""
+        keep = np.ones(len(positions), dtype=bool)
+        for position in range(self.word_length):
+            keep &= self.allowed[position][positions[:, position]]
+        keep &= (letter_counts >= self.min_counts).all(axis=1)
+        keep &= (letter_counts <= self.max_counts).all(axis=1)
+        return keep
+
+    def allows(self, word: str) -> bool:
+        """Checks whether a single word satisfies every hint so far."""
+        if len(word) != self.word_length:
+            return False
+        slots = letter_slots(words_to_array([word.upper()], self.word_length))
+        counts = np.bincount(slots[0], minlength=ALPHABET_SIZE)[None, :]
+        return bool(self.mask(slots, counts)[0])
+
+
+def satisfies_hints(guess_word: str, history: List[Tuple[str, str]]) -> bool:
+    """Checks whether a guess is consistent with all prior (guess, pattern) hints."""
+    return Constraint.from_history(history, len(guess_word)).allows(guess_word)
+
+
+class FeedbackKernel:
+    """Per-answer lookup tables that score many guesses against a word array at once."""
+
+    def __init__(self, answers: np.ndarray) -> None:
+        self.word_length = answers.shape[1]
+        self.dtype = code_dtype(self.word_length)
+        self.alphabet = np.unique(answers)
+        self.weights = (3 ** np.arange(self.word_length)).astype(self.dtype)
+
+        # One extra letter row (all zeros) stands for letters no answer contains.
+        size = len(self.alphabet) + 1
+        count = answers.shape[0]
+        letters = np.searchsorted(self.alphabet, answers)
+        self.counts = np.zeros((size, count), dtype=np.int16)
+        for position in range(self.word_length):
+            self.counts[letters[:, position], np.arange(count)] += 1
+        self.present = self.counts > 0
+        self.matches = letters.T[:, None, :] == np.arange(size)[None, :, None]
+
+        # Ignoring duplicates, each digit is 2 on a match, 1 if present, else 0.
+        self.base = ((self.matches.astype(self.dtype) + self.present[None, :, :])
+                     * self.weights[:, None, None])
+
+    def letter_index(self, words: np.ndarray) -> np.ndarray:
+        """Maps code points to rows of the tables (unknown letters to the empty row)."""
+        index = np.searchsorted(self.alphabet, words)
+        known = index < len(self.alphabet)
+        known[known] = self.alphabet[index[known]] == words[known]
+        index[~known] = len(self.alphabet)
+        return index
+
+    def codes(self, guesses: np.ndarray) -> np.ndarray:
+        """Returns the (G, N) feedback codes of guesses against every answer."""
+        guess_letters = self.letter_index(guesses)
+        result = self.base[0][guess_letters[:, 0]]
+        for position in range(1, self.word_length):
+            result += self.base[position][guess_letters[:, position]]
+
+        # A repeated guess letter only turns yellow while unmatched copies remain
+        # in the answer, so downgrade the extra copies to grey.
+        for position in range(self.word_length):
+            same = guess_letters == guess_letters[:, position, None]
+            rows = np.flatnonzero(same.sum(axis=1) > 1)
+            if rows.size == 0:
+                continue
+            letter = guess_letters[rows, position]
+            same = same[rows]
+            available = self.counts[letter].copy()
+            for other in range(self.word_length):
+                if other == position or not same[:, other].any():
+                    continue
+                if other < position:
+                    available -= same[:, other, None]
+                else:
+                    available -= same[:, other, None] & self.matches[other][letter]
+            greyed = (available <= 0) & ~self.matches[position][letter] & self.present[letter]
+            result[rows] -= greyed.astype(self.dtype) * self.weights[position]
+        return result
+
+
+class FeedbackMatrix:
+    """
+    Guess x answer matrix of feedback codes for one word list, filled row by
+    row on demand. With cache_rows off (the default past MAX_CACHED_MATRIX_BYTES)
+    nothing is stored and rows are computed from the kernel in blocks.
+    """
+
+    def __init__(self, words: List[str], cache_rows: Optional[bool] = None) -> None:
+        self.words = list(words)
+        self.word_length = len(self.words[0])
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.letters = words_to_array(self.words, self.word_length)
+        self.positions = letter_slots(self.letters)
+        self.letter_counts = np.zeros((len(self.words), ALPHABET_SIZE), dtype=np.uint8)
+        for position in range(self.word_length):
+            self.letter_counts[np.arange(len(self.words)), self.positions[:, position]] += 1
+        self.kernel = FeedbackKernel(self.letters)
+        if cache_rows is None:
+            size = len(self.words) ** 2 * np.dtype(self.kernel.dtype).itemsize
+            cache_rows = size <= MAX_CACHED_MATRIX_BYTES
+        self.codes: Optional[np.ndarray] = None
+        if cache_rows:
+            self.codes = np.empty((len(self.words), len(self.words)), dtype=self.kernel.dtype)
+        self.filled = np.zeros(len(self.words), dtype=bool)
+
+    def ids(self, words: List[str]) -> Optional[np.ndarray]:
+        """Returns the word ids of a word list, or None if any word is unknown."""
+        try:
+            return np.fromiter((self.index[word] for word in words), dtype=np.intp, count=len(words))
+        except KeyError:
+            return None
+
+    def fill_rows(self, guess_ids: np.ndarray) -> None:
+        """Computes any rows of the matrix that have not been encoded yet."""
+        assert self.codes is not None
+        missing = np.unique(guess_ids[~self.filled[guess_ids]])
+        for start in range(0, len(missing), ROW_CHUNK):
+            chunk = missing[start:start + ROW_CHUNK]
+            self.codes[chunk] = self.kernel.codes(self.letters[chunk])
+            self.filled[chunk] = True
+
+    def submatrix(self, guess_ids: np.ndarray, answer_ids: np.ndarray) -> np.ndarray:
+        """Returns the codes of the given guesses against the given answers."""
+        if self.codes is not None:
+            self.fill_rows(guess_ids)
+            return self.codes[np.ix_(guess_ids, answer_ids)]
+
+        # Uncached: a kernel for just the answers asked for, unless that is all of them.
+        whole = len(answer_ids) == len(self.words)
+        kernel = self.kernel if whole else FeedbackKernel(self.letters[answer_ids])
+        result = np.empty((len(guess_ids), len(answer_ids)), dtype=self.kernel.dtype)
+        rows = max(1, CHUNK_CELLS // max(len(self.words) if whole else len(answer_ids), 1))
+        for start in range(0, len(guess_ids), rows):
+            codes = kernel.codes(self.letters[guess_ids[start:start + rows]])
+            result[start:start + rows] = codes[:, answer_ids] if whole else codes
+        return result
+
+    def row(self, guess_word: str, answer_ids: np.ndarray) -> np.ndarray:
+        """Returns the codes of one guess (in the list or not) against the given answers."""
+        guess_id = self.index.get(guess_word)
+        if guess_id is None:
+            guess = words_to_array([guess_word], self.word_length)
+            return self.kernel.codes(guess)[0][answer_ids]
+        return self.submatrix(np.array([guess_id]), answer_ids)[0]
+
+
+_FEEDBACK_MATRICES: Dict[int, FeedbackMatrix] = {}
+# Dictionaries set with use_dictionary, in place of the word file's.
+_DICTIONARY_WORDS: Dict[int, List[str]] = {}
+
+
+def use_dictionary(words: List[str]) -> None:
+    """
+    Makes words the dictionary the shared matrix of their length covers,
+    instead of the word file's (for tests and synthetic benchmarks).
+    """
+    _DICTIONARY_WORDS[len(words[0])] = list(words)
+
+
+def dictionary_matrix(word_length: int) -> Optional[FeedbackMatrix]:
+    """
+    Returns the shared matrix over the dictionary of a word length, rebuilt
+    when the dictionary changes, or None if there is no dictionary.
+    """
+    words = _DICTIONARY_WORDS.get(word_length)
+    if words is None:
+        # Imported here: the dictionary service loads its words through this module.
+        from settings.Dictionary import get_dictionary
+        words = get_dictionary(word_length).words
+    if not words or words == ["ERROR"]:
+        return None
+    matrix = _FEEDBACK_MATRICES.get(word_length)
+    if matrix is None or matrix.words != words:
+        matrix = FeedbackMatrix(words)
+        _FEEDBACK_MATRICES[word_length] = matrix
+    return matrix
+
+
+def get_feedback_matrix(word_list: List[str]) -> Tuple[FeedbackMatrix, np.ndarray]:
+    """
+    Returns the shared dictionary matrix for the list's word length and the ids
+    of the list in it. A list with words outside the dictionary gets a private,
+    uncached matrix, so it never evicts the dictionary's encoded rows.
+    """
+    matrix = dictionary_matrix(len(word_list[0]))
+    if matrix is not None:
+        if word_list == matrix.words:
+            # The whole dictionary, as the EXTREME lie and the first turns pass it.
+            return matrix, np.arange(len(word_list))
+        ids = matrix.ids(word_list)
+        if ids is not None:
+            return matrix, ids
+    return FeedbackMatrix(word_list, cache_rows=False), np.arange(len(word_list))
+
+
+def feedback_row(guess_word: str, word_list: List[str]) -> np.ndarray:
+    """Returns the feedback codes of guess_word against every word in word_list."""
+    if not word_list:
+        return np.zeros(0, dtype=code_dtype(len(guess_word)))
+    matrix, ids = get_feedback_matrix(word_list)
+    return matrix.row(guess_word.upper(), ids)
+
+
 def load_valid_words(file_path: str, length: int = 5) -> List[str]:
-    """Loads valid words of a specific length from a file."""
+    """
+    Loads valid words of a specific length from a file, through its compiled
+    memory-mapped store when possible (parsing the text only as a fallback).
+    """
+    if os.path.isfile(file_path):
+        try:
+            return list(get_word_store(file_path).words(length))
+        except (OSError, ValueError) as e:
+            print(f"Warning: compiled dictionary unavailable ({e}), reading {file_path}.")
+
     valid_words: List[str] = []
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
@@ -113,47 +382,26 @@ def triplets_maker(colour_pattern: str, word: str) -> List[Tuple[str, int, str]]
     return triplets
 
 
+@PROFILER.traced(category="solver")
 def filter_words(colour_pattern: str, guess_word: str, word_list: List[str]) -> List[str]:
     """Filters the possible words based on the feedback pattern."""
-    new_word_list: List[str] = []
-    triplets = triplets_maker(colour_pattern, guess_word)
-
-    confirmed_present: Set[str] = set()
-    for letter, _, colour in triplets:
-        if colour in ('g', 'y'):
-            confirmed_present.add(letter)
-
-    for word in word_list:
-        is_valid = True
-        word_as_list = list(word)
-
-        for letter, index, colour in triplets:
-            if colour == 'g':
-                if word_as_list[index] != letter:
-                    is_valid = False
-                    break
-            elif colour == 'y':
-                if word_as_list[index] == letter or letter not in word_as_list:
-                    is_valid = False
-                    break
-            elif colour == 'x':
-                if word_as_list[index] == letter:
-                    is_valid = False
-                    break
-                if letter not in confirmed_present and letter in word:
-                    is_valid = False
-                    break
-
-        if is_valid:
-            new_word_list.append(word)
-
-    return new_word_list
+    if not word_list:
+        return []
+    matrix, ids = get_feedback_matrix(word_list)
+    constraint = Constraint(matrix.word_length)
+    constraint.add_feedback(guess_word, colour_pattern)
+    keep = np.flatnonzero(constraint.mask(matrix.positions[ids], matrix.letter_counts[ids]))
+    return [word_list[i] for i in keep]
 
 
 def remove_useless_words(guess_word: str, secret_word: str, word_list: List[str]) -> List[str]:
     """Filters words assuming the secret word is known (helper)."""
-    pattern = get_pattern_string(colour_set(guess_word, secret_word, len(guess_word)))
-    return filter_words(pattern, guess_word, word_list)
+    if not word_list:
+        return []
+    split = partition(guess_word, word_list)
+    bucket = split.bucket_of(pattern_to_code(get_pattern_string(
+        colour_set(guess_word, secret_word, len(guess_word)))))
+    return [word_list[i] for i in np.flatnonzero(split.buckets == bucket)]
 
 
 def get_pattern_string(triplets: List[Tuple[str, int, str]]) -> str:
@@ -161,32 +409,224 @@ def get_pattern_string(triplets: List[Tuple[str, int, str]]) -> str:
     return "".join([t[2] for t in triplets])
 
 
-def get_best_word(possible_words: List[str]) -> str:
+SCORING_METRICS = ("entropy", "expected", "worst")
+
+
+def pattern_histograms(codes: np.ndarray, code_count: int,
+                       weights: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Counts how often each feedback code appears in every row of a code block.
+    With weights (one per column), sums the weights instead of counting.
+    """
+    offsets = codes.astype(np.intp)
+    offsets += np.arange(len(codes))[:, None] * code_count
+    if weights is not None:
+        weights = np.broadcast_to(weights, codes.shape).ravel()
+    counts = np.bincount(offsets.ravel(), weights=weights, minlength=len(codes) * code_count)
+    return counts.reshape(len(codes), code_count)
+
+
+def rate_histograms(pattern_counts: np.ndarray, metric: str = "entropy") -> np.ndarray:
+    """
+    Rates guesses from their feedback histograms; higher is always better.
+    entropy: Shannon entropy of the feedback in bits.
+    expected: minus the expected number of words left (sum of count^2 / N).
+    worst: minus the size of the largest feedback bucket.
+    """
+    total_words = pattern_counts.sum(axis=1)
+    if metric == "entropy":
+        # Counts are small integers, so look up c*log2(c) instead of computing it.
+        sizes = np.arange(int(total_words.max()) + 1, dtype=np.float64)
+        plogp = np.zeros_like(sizes)
+        np.log2(sizes, out=plogp, where=sizes > 0)
+        plogp *= sizes
+        return np.log2(total_words) - plogp[pattern_counts].sum(axis=1) / total_words
+    if metric == "expected":
+        return -np.einsum("ij,ij->i", pattern_counts, pattern_counts) / total_words
+    if metric == "worst":
+        return -pattern_counts.max(axis=1).astype(np.float64)
+    raise ValueError(f"Unknown scoring metric: {metric}")
+
+
+def rate_lie_histograms(pattern_counts: np.ndarray, liar_counts: np.ndarray,
+                        pattern_mass: np.ndarray, metric: str = "entropy") -> np.ndarray:
+    """
+    Rates guesses over (word, lies used) states; higher is always better.
+    After feedback o, the states giving o survive unchanged, and every state
+    that can still afford a lie survives with one more lie used.
+    pattern_counts / liar_counts: per-code counts of all states / of states
+    with lies left. pattern_mass: per-code prior weight of the states, which
+    sets how likely each feedback is.
+    """
+    survivors = pattern_counts + (liar_counts.sum(axis=1, keepdims=True) - liar_counts)
+    chance = pattern_mass / pattern_mass.sum(axis=1, keepdims=True)
+    possible = pattern_counts > 0
+    if metric == "entropy":
+        # Minus the expected log2 of the states left (entropy when no lies remain).
+        logs = np.zeros(survivors.shape)
+        np.log2(survivors, out=logs, where=possible)
+        return -(chance * logs).sum(axis=1)
+    if metric == "expected":
+        return -(chance * survivors).sum(axis=1)
+    if metric == "worst":
+        return -np.where(possible, survivors, 0).max(axis=1).astype(np.float64)
+    raise ValueError(f"Unknown scoring metric: {metric}")
+
+
+class Partition(NamedTuple):
+    """
+    Candidates split by the feedback a guess gives them. Buckets are numbered
+    0..B-1 in code order; batched partitions share the numbering across their
+    guesses and hold one row of buckets and sizes per guess.
+    """
+    codes: np.ndarray    # (B,) feedback code of each bucket
+    buckets: np.ndarray  # (N,) or (G, N) bucket of each candidate
+    sizes: np.ndarray    # (B,) or (G, B) candidates in each bucket
+
+    def bucket_of(self, code: int) -> int:
+        """
+        The bucket holding a feedback code, or -1 if no candidate gives it (for
+        any of the guesses, when batched). Larger sets keep a bucket for every
+        code, so an empty one counts as missing too.
+        """
+        bucket = int(np.searchsorted(self.codes, code))
+        if bucket < len(self.codes) and self.codes[bucket] == code and self.sizes[..., bucket].any():
+            return bucket
+        return -1
+
+    def split(self, ids: np.ndarray) -> List[np.ndarray]:
+        """Groups the candidates' ids (or any per-candidate array) by bucket; single guess only."""
+        order = np.argsort(self.buckets, kind="stable")
+        return np.split(np.asarray(ids)[order], np.cumsum(self.sizes)[:-1])
+
+
+def partition_codes(codes: np.ndarray, code_count: int) -> Partition:
+    """
+    Partitions candidates from their feedback codes against one guess (N,) or
+    many (G, N). Codes are renumbered to the buckets actually used, which keeps
+    histograms narrow for small candidate sets; larger sets keep every code.
+    """
+    if codes.shape[-1] < code_count:
+        used = np.flatnonzero(np.bincount(codes.ravel(), minlength=code_count))
+        renumber = np.zeros(code_count, dtype=np.intp)
+        renumber[used] = np.arange(len(used))
+        codes, bucket_codes = renumber[codes], used
+    else:
+        bucket_codes = np.arange(code_count)
+    if codes.ndim == 1:
+        return Partition(bucket_codes, codes, np.bincount(codes, minlength=len(bucket_codes)))
+    return Partition(bucket_codes, codes, pattern_histograms(codes, len(bucket_codes)))
+
+
+def partition(guess_word: str, candidates: List[str]) -> Partition:
+    """Splits a non-empty candidate list by the feedback guess_word gives each of them."""
+    return partition_codes(feedback_row(guess_word, candidates), 3 ** len(guess_word))
+
+
+def partitions(guess_words: List[str], candidates: List[str]) -> Partition:
+    """partition for many guesses at once, with buckets numbered across all of them."""
+    matrix, ids = get_feedback_matrix(candidates)
+    guess_ids = matrix.ids([word.upper() for word in guess_words])
+    if guess_ids is None:
+        codes = matrix.kernel.codes(words_to_array(guess_words, matrix.word_length))[:, ids]
+    else:
+        codes = matrix.submatrix(guess_ids, ids)
+    return partition_codes(codes, 3 ** matrix.word_length)
+
+
+class Cancelled(Exception):
+    """Raised by a scoring loop whose cancel event was set (a stale solver job)."""
+
+
+def partition_blocks(matrix: FeedbackMatrix, ids: np.ndarray,
+                     cancel: Optional[threading.Event] = None) -> Iterator[Tuple[np.ndarray, Partition]]:
+    """
+    Yields (guess ids, partition) blocks covering every word of the matrix as a
+    guess against the candidates with the given ids. Setting cancel stops the
+    scan with Cancelled before the next block.
+    """
+    word_count = len(matrix.words)
+    code_count = 3 ** matrix.word_length
+
+    # Until the matrix is fully encoded, scoring against a few candidates is
+    # cheaper with a kernel built for just those answers than filling rows.
+    kernel = None
+    if len(ids) < word_count and not matrix.filled.all():
+        kernel = FeedbackKernel(matrix.letters[ids])
+
+    # Small candidate sets take more guess rows per block to amortize overhead.
+    rows = max(ROW_CHUNK, CHUNK_CELLS // max(len(ids), 1))
+    for start in range(0, word_count, rows):
+        if cancel is not None and cancel.is_set():
+            raise Cancelled()
+        chunk = np.arange(start, min(start + rows, word_count))
+        if kernel is not None:
+            codes = kernel.codes(matrix.letters[chunk])
+        else:
+            codes = matrix.submatrix(chunk, ids)
+        yield chunk, partition_codes(codes, code_count)
+
+
+def score_guesses(possible_words: List[str], metric: str = "entropy") -> Tuple[FeedbackMatrix, np.ndarray]:
+    """
+    Rates every word of the shared dictionary as a guess against possible_words.
+    Returns the matrix (whose word list the scores follow) and the scores.
+    """
+    matrix, ids = get_feedback_matrix(possible_words)
+    return matrix, score_candidate_ids(matrix, ids, metric)
+
+
+def score_candidate_ids(matrix: FeedbackMatrix, ids: np.ndarray, metric: str = "entropy",
+                        cancel: Optional[threading.Event] = None) -> np.ndarray:
+    """Rates every word of the matrix as a guess against the candidates with the given ids."""
+    scores = np.empty(len(matrix.words))
+    for chunk, split in partition_blocks(matrix, ids, cancel):
+        scores[chunk] = rate_histograms(split.sizes, metric)
+    return scores
+
+
+def score_lie_aware_ids(matrix: FeedbackMatrix, ids: np.ndarray, can_lie: np.ndarray,
+                        weights: np.ndarray, metric: str = "entropy",
+                        cancel: Optional[threading.Event] = None) -> np.ndarray:
+    """
+    Rates every word of the matrix as a guess against (word, lies used) states.
+    can_lie marks the states that can still afford a lie; weights holds the
+    prior weight of each state.
+    """
+    scores = np.empty(len(matrix.words))
+    for chunk, split in partition_blocks(matrix, ids, cancel):
+        bucket_count = len(split.codes)
+        liars = pattern_histograms(split.buckets[:, can_lie], bucket_count)
+        mass = pattern_histograms(split.buckets, bucket_count, weights)
+        scores[chunk] = rate_lie_histograms(split.sizes, liars, mass, metric)
+    return scores
+
+
+def pick_best_guess(matrix: FeedbackMatrix, ids: np.ndarray, scores: np.ndarray) -> str:
+    """Returns the top-scoring guess, preferring one that could be the answer itself."""
+    best = np.flatnonzero(scores >= scores.max() - 1e-9)
+    is_candidate = np.zeros(len(matrix.words), dtype=bool)
+    is_candidate[ids] = True
+    preferred = best[is_candidate[best]]
+    return matrix.words[int(preferred[0] if preferred.size else best[0])]
+
+
+@PROFILER.traced(category="solver")
+def best_guess_for_ids(matrix: FeedbackMatrix, ids: np.ndarray, metric: str = "entropy",
+                       cancel: Optional[threading.Event] = None) -> str:
+    """Picks the best guess of the matrix against the candidates with the given ids."""
+    if len(ids) <= 2:
+        return matrix.words[int(ids[0])]
+    return pick_best_guess(matrix, ids, score_candidate_ids(matrix, ids, metric, cancel))
+
+
+@PROFILER.traced(category="solver")
+def get_best_word(possible_words: List[str], metric: str = "entropy") -> str:
     """Calculates the best next guess using information theory heuristics."""
-    if len(possible_words) > 2000:
-        return random.choice(possible_words)
-
-    best_word = possible_words[0]
-    max_score = -1.0
-    candidates = possible_words if len(possible_words) < 500 else possible_words[:500]
-
-    for guess_candidate in candidates:
-        pattern_counts: Dict[Tuple[str, ...], int] = {}
-        for secret_candidate in possible_words:
-            # Assumes standard 5-letter logic for heuristics
-            triplets = colour_set(guess_candidate, secret_candidate, 5)
-            pattern = get_pattern_from_triplets(triplets)
-            pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
-
-        score = 0.0
-        total_words = len(possible_words)
-        for count in pattern_counts.values():
-            score += count * (total_words - count)
-
-        if score > max_score:
-            max_score = score
-            best_word = guess_candidate
-    return best_word
+    if len(possible_words) <= 2:
+        return possible_words[0]
+    matrix, ids = get_feedback_matrix(possible_words)
+    return best_guess_for_ids(matrix, ids, metric)
 
 
 def colour_value_helper(triplets: List[Tuple[str, int, str]]) -> int:
@@ -201,33 +641,93 @@ def colour_value_helper(triplets: List[Tuple[str, int, str]]) -> int:
     return score
 
 
-def get_best_lie(guess_word: str, word_pool: List[str], length: int) -> List[Tuple[str, int, str]]:
-    """Generates a misleading pattern for Extreme mode."""
-    candidates = []
-    for potential_word in word_pool:
-        temp_triplets = colour_set(guess_word, potential_word, length)
-        score = colour_value_helper(temp_triplets)
-        if 3 <= score <= 7:
-            candidates.append(potential_word)
-
-    lie_word = random.choice(candidates) if candidates else random.choice(word_pool)
-    return colour_set(guess_word, lie_word, length)
-
-
-def lie_detector(colour_pattern: str, guess_word: str, word_list: Dict[str, int]) -> Dict[str, int]:
-    """Filters words in Extreme mode allowing for lies."""
-    new_word_dict = {}
-    for word, error_count in word_list.items():
-        maybe_triplets = colour_set(guess_word, word, 5)
-        maybe_pattern_str = get_pattern_string(maybe_triplets)
-
-        current_errors = error_count
-        if maybe_pattern_str != colour_pattern:
-            current_errors += 1
-
-        if current_errors <= 1:
-            new_word_dict[word] = current_errors
-    return new_word_dict
+@lru_cache(maxsize=None)
+def colour_scores(word_length: int) -> np.ndarray:
+    """Returns colour_value_helper's score for every feedback code of a length."""
+    scores = np.zeros(3 ** word_length, dtype=np.int16)
+    for code in range(3 ** word_length):
+        pattern = code_to_pattern(code, word_length)
+        scores[code] = pattern.count("g") * 3 + pattern.count("y")
+    return scores
+
+
+# How get_best_lie picks the misleading pattern:
+#   window      a random pool word whose pattern scores 3-7 (colour_value_helper)
+#   misleading  the pattern that leaves the player the most wrong candidates
+#   plausible   a pattern some word consistent with the earlier feedback would give
+LIE_STRATEGIES = ("window", "misleading", "plausible")
+LIE_WINDOW = (3, 7)
+
+
+def lie_buckets(guess_word: str, word_pool: List[str], secret_word: Optional[str] = None,
+                history: Optional[List[Tuple[str, str]]] = None) -> Tuple[Partition, np.ndarray]:
+    """
+    Partitions the pool by the feedback guess_word gives and masks the words
+    whose pattern could serve as a lie: not the truthful pattern, not all green
+    and, with a history, consistent with the earlier feedback.
+    """
+    split = partition(guess_word, word_pool)
+    unusable = np.zeros(len(split.codes) + 1, dtype=bool)
+    unusable[split.bucket_of(3 ** len(guess_word) - 1)] = True
+    if secret_word:
+        unusable[split.bucket_of(pattern_to_code(get_pattern_string(
+            colour_set(guess_word, secret_word, len(guess_word)))))] = True
+    # The extra last entry absorbs bucket_of's -1 for codes no word gives.
+    usable = ~unusable[:-1][split.buckets]
+    if history:
+        matrix, ids = get_feedback_matrix(word_pool)
+        constraint = Constraint.from_history(history, matrix.word_length)
+        usable &= constraint.mask(matrix.positions[ids], matrix.letter_counts[ids])
+    return split, usable
+
+
+@PROFILER.traced(category="solver")
+def get_best_lie(guess_word: str, word_pool: List[str], length: int, strategy: str = "window",
+                 secret_word: Optional[str] = None, history: Optional[List[Tuple[str, str]]] = None,
+                 rng: Any = random) -> List[Tuple[str, int, str]]:
+    """Generates a misleading pattern for Extreme mode (see LIE_STRATEGIES)."""
+    if strategy not in LIE_STRATEGIES:
+        raise ValueError(f"Unknown lie strategy: {strategy}")
+    split, usable = lie_buckets(guess_word, word_pool, secret_word,
+                                history if strategy != "window" else None)
+
+    if strategy == "misleading" and usable.any():
+        # The player keeps every word that gives the lie's pattern.
+        sizes = np.bincount(split.buckets[usable], minlength=len(split.codes))
+        bucket = rng.choice(np.flatnonzero(sizes == sizes.max()))
+        return triplets_maker(code_to_pattern(int(split.codes[bucket]), length), guess_word)
+
+    scores = colour_scores(length)[split.codes][split.buckets]
+    in_window = usable & (scores >= LIE_WINDOW[0]) & (scores <= LIE_WINDOW[1])
+    # Settle for a usable lie outside the window (plausible: still consistent)
+    # before dropping the history.
+    for mask in (in_window, usable):
+        candidates = np.flatnonzero(mask)
+        if len(candidates):
+            code = split.codes[split.buckets[rng.choice(candidates)]]
+            return triplets_maker(code_to_pattern(int(code), length), guess_word)
+    if strategy != "window":
+        return get_best_lie(guess_word, word_pool, length, "window", secret_word, rng=rng)
+
+    # No pool word gives another pattern: any pattern but the truth and all green will do.
+    excluded = {3 ** length - 1}
+    if secret_word:
+        excluded.add(pattern_to_code(get_pattern_string(colour_set(guess_word, secret_word, length))))
+    code = rng.choice([c for c in range(3 ** length) if c not in excluded])
+    return triplets_maker(code_to_pattern(code, length), guess_word)
+
+
+def lie_detector(colour_pattern: str, guess_word: str, word_list: Dict[str, int],
+                 lie_budget: int = 1) -> Dict[str, int]:
+    """
+    Filters words in Extreme mode allowing for lies.
+    Dictionary form of settings.Solver.ExtremeState, kept for callers that use it.
+    """
+    words = list(word_list)
+    codes = feedback_row(guess_word, words)
+    errors = np.fromiter(word_list.values(), dtype=np.int64, count=len(words))
+    errors += codes != pattern_to_code(colour_pattern)
+    return {words[i]: int(errors[i]) for i in np.flatnonzero(errors <= lie_budget)}
 
 
 def init_extreme_candidates(word_list: List[str]) -> Dict[str, int]:
@@ -235,7 +735,6 @@ def init_extreme_candidates(word_list: List[str]) -> Dict[str, int]:
     return {word: 0 for word in word_list}
 
 
-@lru_cache(maxsize=None)
 def levenshtein_distance(s1: str, s2: str) -> int:
     """Calculates Levenshtein distance between two strings."""
     if len(s1) < len(s2):
@@ -254,3 +753,61 @@ def levenshtein_distance(s1: str, s2: str) -> int:
         previous_row = current_row
     return previous_row[-1]
 
+
+def levenshtein_distances(query: str, words: Any, max_distance: Optional[int] = None) -> np.ndarray:
+    """
+    Edit distances from query to many equal-length words (a list or an (N, length)
+    code point array), one dynamic programming row at a time for all words at once.
+    With max_distance, only the diagonal band that can stay within it is computed,
+    words drop out as soon as a whole row exceeds it, and their distance is
+    reported as max_distance + 1.
+    """
+    letters = words if isinstance(words, np.ndarray) else \
+        words_to_array(list(words), len(words[0]) if len(words) else len(query))
+    query_letters = words_to_array([query], len(query))[0]
+    rows, cols = len(query_letters), letters.shape[1]
+    cap = max(rows, cols) if max_distance is None else min(max_distance + 1, max(rows, cols))
+    band = cap if max_distance is None else max_distance
+    distances = np.full(len(letters), cap, dtype=np.int16)
+
+    alive = np.arange(len(letters))
+    previous = np.tile(np.minimum(np.arange(cols + 1), cap).astype(np.int16), (len(letters), 1))
+    for i in range(1, rows + 1):
+        lo, hi = max(1, i - band), min(cols, i + band)
+        current = np.full_like(previous, cap)
+        current[:, 0] = min(i, cap)
+        if lo <= hi:
+            cost = letters[:, lo - 1:hi] != query_letters[i - 1]
+            # Substitution and deletion for the whole band, then insertion left to right.
+            best = np.minimum(previous[:, lo - 1:hi] + cost, previous[:, lo:hi + 1] + 1)
+            for j in range(lo, hi + 1):
+                np.minimum(best[:, j - lo], current[:, j - 1] + 1, out=current[:, j])
+            np.minimum(current, cap, out=current)
+        previous = current
+
+        if max_distance is not None:
+            row_band = previous[:, max(0, i - band):min(cols, i + band) + 1]
+            within = row_band.min(axis=1, initial=cap) <= max_distance
+            if not within.all():
+                alive, letters, previous = alive[within], letters[within], previous[within]
+                if len(alive) == 0:
+                    return distances
+    distances[alive] = previous[:, cols]
+    return distances
+
+
+def nearest_words(query: str, words: List[str]) -> List[str]:
+    """
+    Words at the smallest edit distance from query, in list order. For equal
+    lengths the distance never exceeds the Hamming distance, so the closest
+    Hamming distance bounds the search.
+    """
+    if not words:
+        return []
+    letters = words_to_array(words, len(words[0]))
+    bound = None
+    if letters.shape[1] == len(query):
+        hamming = (letters != words_to_array([query], len(query))[0]).sum(axis=1)
+        bound = int(hamming.min())
+    distances = levenshtein_distances(query, letters, bound)
+    return [words[i] for i in np.flatnonzero(distances == distances.min())]
@@ -0,0 +1,273 @@
+"""
+Edit-distance neighbour index for the PvE edit bot.
+For every dictionary word of one length, the words at Levenshtein distance 1
+and 2 are found once and stored in a compact binary file next to the
+dictionary, rebuilt when that length's word list changes (in the game, on a
+background thread while the edit bot scans with nearest_words). The edit bot's "closest
+remaining candidates to the previous guess" query then only visits that
+guess's neighbour list, filtered by the candidate set during the scan, and
+falls back to the batched kernel only when no candidate is that close.
+
+Build with: python -m settings.NeighborIndex --length 5
+"""
+import argparse
+import os
+import struct
+import threading
+import time
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from settings.Logic import load_valid_words, words_to_array, letter_slots
+from settings.OpeningBook import WORDS_FILE, BOOK_DIR, words_hash
+
+INDEX_MAGIC = b"WDNBRS"
+INDEX_VERSION = 1
+MAX_DISTANCE = 2
+
+# magic, version, word length, source hash, word count, neighbour count
+HEADER = struct.Struct("<6sBB16sII")
+
+
+def index_path(word_length: int) -> str:
+    """Returns where the index for a word length is stored."""
+    return os.path.join(BOOK_DIR, f"neighbors-{word_length}.bin")
+
+
+def group_pairs(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns every (a, b) pair of distinct rows that share a key, a < b."""
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    sizes = np.diff(np.r_[starts, len(keys)])
+
+    firsts: List[np.ndarray] = []
+    seconds: List[np.ndarray] = []
+    # Groups of the same size are paired in one step.
+    for size in np.unique(sizes[sizes > 1]):
+        members = order[starts[sizes == size][:, None] + np.arange(size)]
+        left, right = np.triu_indices(size, 1)
+        firsts.append(members[:, left].ravel())
+        seconds.append(members[:, right].ravel())
+    if not firsts:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    a, b = np.concatenate(firsts), np.concatenate(seconds)
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def pack_keys(slots: np.ndarray) -> np.ndarray:
+    """Packs rows of letter slots (0-26) into one integer key per row."""
+    keys = np.zeros(len(slots), dtype=np.int64)
+    for column in range(slots.shape[1]):
+        keys = keys * 32 + slots[:, column]
+    return keys
+
+
+def find_neighbors(words: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds every pair of equal-length words at edit distance 1 or 2.
+    Equal lengths make that either at most two substitutions (the words agree
+    outside two positions) or one deletion plus one insertion (deleting one
+    letter from each leaves the same word). Returns (a, b, distance) with both
+    directions of each pair.
+    """
+    word_length = len(words[0])
+    slots = letter_slots(words_to_array(words, word_length)).astype(np.int64)
+    firsts: List[np.ndarray] = []
+    seconds: List[np.ndarray] = []
+
+    positions = range(word_length)
+    for hidden in combinations(positions, min(2, word_length)):
+        kept = [p for p in positions if p not in hidden]
+        a, b = group_pairs(pack_keys(slots[:, kept]))
+        firsts.append(a)
+        seconds.append(b)
+    # The deleted letters may sit at different positions in the two words.
+    deletions = [pack_keys(np.delete(slots, deleted, axis=1)) for deleted in positions]
+    a, b = group_pairs(np.concatenate(deletions))
+    a, b = a % len(words), b % len(words)
+    firsts.append(np.minimum(a, b)[a != b])
+    seconds.append(np.maximum(a, b)[a != b])
+
+    a, b = np.concatenate(firsts), np.concatenate(seconds)
+    pair = np.unique(a * len(words) + b)
+    a, b = pair // len(words), pair % len(words)
+    distance = np.where((slots[a] != slots[b]).sum(axis=1) == 1, 1, 2).astype(np.uint8)
+    return np.r_[a, b], np.r_[b, a], np.r_[distance, distance]
+
+
+def serialize_index(words: List[str], source_hash: str) -> bytes:
+    """Builds the index for a non-empty word list and flattens it into the binary file format."""
+    a, b, distance = find_neighbors(words)
+    # Each word's list is ordered by distance, then by word id.
+    order = np.lexsort((b, distance, a))
+    offsets = np.zeros(len(words) + 1, dtype="<u4")
+    offsets[1:] = np.cumsum(np.bincount(a, minlength=len(words)))
+
+    header = HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(words[0]), source_hash.encode("ascii")[:16],
+                         len(words), len(order))
+    return (header + offsets.tobytes() + b[order].astype("<u4").tobytes()
+            + distance[order].astype(np.uint8).tobytes())
+
+
+class NeighborIndex:
+    """A loaded index: per word id, its neighbours' ids and distances (1 or 2)."""
+
+    def __init__(self, data: bytes) -> None:
+        (magic, version, self.word_length, source_hash,
+         self.word_count, neighbor_count) = HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("Not a neighbour index file.")
+        self.source_hash = source_hash.decode("ascii")
+        offset = HEADER.size
+        self.offsets = np.frombuffer(data, dtype="<u4", count=self.word_count + 1, offset=offset)
+        offset += self.offsets.nbytes
+        self.neighbors = np.frombuffer(data, dtype="<u4", count=neighbor_count, offset=offset)
+        offset += self.neighbors.nbytes
+        self.distances = np.frombuffer(data, dtype=np.uint8, count=neighbor_count, offset=offset)
+
+    def neighbors_of(self, word_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The ids and distances of a word's neighbours, closest first."""
+        start, end = int(self.offsets[word_id]), int(self.offsets[word_id + 1])
+        return self.neighbors[start:end], self.distances[start:end]
+
+    def nearest(self, word_id: int, candidate_ids: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Ids of the candidates closest to a word, in id order, or None when no
+        candidate is within MAX_DISTANCE. candidate_ids must be sorted.
+        """
+        candidate_ids = np.asarray(candidate_ids, dtype=np.intp)
+        if len(candidate_ids) == 0:
+            return None
+        position = int(np.searchsorted(candidate_ids, word_id))
+        if position < len(candidate_ids) and candidate_ids[position] == word_id:
+            return candidate_ids[position:position + 1]
+
+        ids, distances = self.neighbors_of(word_id)
+        positions = np.minimum(np.searchsorted(candidate_ids, ids), len(candidate_ids) - 1)
+        remaining = candidate_ids[positions] == ids
+        if not remaining.any():
+            return None
+        closest = distances[remaining].min()
+        return ids[remaining & (distances == closest)].astype(np.intp)
+
+
+def save_index(data: bytes, path: str) -> None:
+    """Writes a serialized index to disk."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with open(path, "wb") as f:
+            f.write(data)
+    except OSError as e:
+        print(f"Error saving neighbour index: {e}")
+
+
+def load_neighbor_index(word_length: int, source_hash: str, word_count: int) -> Optional[NeighborIndex]:
+    """Loads the stored index if it was built from the current word list."""
+    path = index_path(word_length)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            index = NeighborIndex(f.read())
+    except (OSError, ValueError, struct.error):
+        return None
+    if index.source_hash != source_hash or index.word_count != word_count:
+        return None
+    return index
+
+
+_INDEXES: Dict[int, NeighborIndex] = {}
+# Indexes being rebuilt in the background, with the callbacks waiting for each.
+_BUILDS: Dict[Tuple[int, str], List[Callable[[NeighborIndex], None]]] = {}
+_BUILD_LOCK = threading.Lock()
+
+
+def get_neighbor_index(words: List[str], word_length: int,
+                       on_ready: Optional[Callable[[NeighborIndex], None]] = None) -> Optional[NeighborIndex]:
+    """
+    Returns the index for a word length, loading it lazily and rebuilding it
+    when the hash of the word list no longer matches the stored one.
+    With on_ready, a stale index is rebuilt on a background thread instead:
+    None is returned now and on_ready(index) is called from that thread.
+    """
+    if not words:
+        return None
+    source_hash = words_hash(words)
+
+    with _BUILD_LOCK:
+        index = _INDEXES.get(word_length)
+    if index is not None and index.source_hash == source_hash and index.word_count == len(words):
+        return index
+    index = load_neighbor_index(word_length, source_hash, len(words))
+    if index is not None:
+        with _BUILD_LOCK:
+            _INDEXES[word_length] = index
+        return index
+
+    if on_ready is not None:
+        build_in_background(list(words), word_length, source_hash, on_ready)
+        return None
+    return store_index(serialize_index(words, source_hash), word_length)
+
+
+def store_index(data: bytes, word_length: int) -> NeighborIndex:
+    """Saves a freshly built index and makes it the current one for its length."""
+    save_index(data, index_path(word_length))
+    index = NeighborIndex(data)
+    with _BUILD_LOCK:
+        _INDEXES[word_length] = index
+    return index
+
+
+def build_in_background(words: List[str], word_length: int, source_hash: str,
+                        on_ready: Callable[[NeighborIndex], None]) -> None:
+    """Builds an index on a daemon thread (once per word list) and hands it to on_ready."""
+    key = (word_length, source_hash)
+    with _BUILD_LOCK:
+        if key in _BUILDS:
+            _BUILDS[key].append(on_ready)
+            return
+        _BUILDS[key] = [on_ready]
+
+    def run() -> None:
+        try:
+            index: Optional[NeighborIndex] = store_index(serialize_index(words, source_hash), word_length)
+        except (MemoryError, ValueError) as e:
+            print(f"Error building neighbour index: {e}")
+            index = None
+        with _BUILD_LOCK:
+            callbacks = _BUILDS.pop(key)
+        if index is not None:
+            for callback in callbacks:
+                callback(index)
+
+    threading.Thread(target=run, name=f"neighbor-index-{word_length}", daemon=True).start()
+
+
+def main() -> None:
+    """Builds and stores the neighbour index for one word length."""
+    parser = argparse.ArgumentParser(description="Build the edit bot's neighbour index.")
+    parser.add_argument("--length", type=int, default=5)
+    parser.add_argument("--words", default=WORDS_FILE)
+    args = parser.parse_args()
+
+    words = load_valid_words(args.words, args.length)
+    if not words:
+        print(f"No {args.length}-letter words in {args.words}.")
+        return
+    start = time.perf_counter()
+    data = serialize_index(words, words_hash(words))
+    save_index(data, index_path(args.length))
+    index = NeighborIndex(data)
+    counts = np.diff(index.offsets)
+    print(f"Built {index_path(args.length)} ({len(data) / 1024:.0f} KB) in "
+          f"{time.perf_counter() - start:.1f}s: {len(words)} words, "
+          f"{counts.mean():.1f} neighbours per word (max {counts.max()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Opening book for the AI Solver.
+Stores the best first guess and the best reply to every first-turn feedback,
+so the solver's first two turns are instant and deterministic. One book is
+kept per word length and rebuilt whenever that length's word list changes
+(in the game, on a background thread while the live solver opens instead).
+
+Build offline with: python -m settings.OpeningBook --length 5
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from settings.Logic import (
+    load_valid_words, get_feedback_matrix, best_guess_for_ids,
+    code_to_pattern, partition_codes, SCORING_METRICS
+)
+
+WORDS_FILE = "Files/valid-wordle-words.txt"
+BOOK_DIR = "Files"
+
+
+def words_hash(words: List[str]) -> str:
+    """Returns a short content hash of one length's word list."""
+    return hashlib.sha256("\n".join(words).encode("utf-8")).hexdigest()[:16]
+
+
+def book_path(word_length: int) -> str:
+    """Returns where the book for a word length is stored."""
+    return os.path.join(BOOK_DIR, f"opening-book-{word_length}.json")
+
+
+class OpeningBook:
+    """Best opener plus the best reply for each first-turn feedback pattern."""
+
+    def __init__(self, word_length: int, source_hash: str, metric: str,
+                 opener: str, replies: Dict[str, str]) -> None:
+        self.word_length = word_length
+        self.source_hash = source_hash
+        self.metric = metric
+        self.opener = opener
+        self.replies = replies
+
+    def reply(self, colour_pattern: str) -> Optional[str]:
+        """Returns the stored second guess for the opener's feedback, if any."""
+        return self.replies.get(colour_pattern.lower())
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serializes the book for JSON storage."""
+        return {
+            "word_length": self.word_length,
+            "source_hash": self.source_hash,
+            "metric": self.metric,
+            "opener": self.opener,
+            "replies": self.replies,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "OpeningBook":
+        """Restores a book from its JSON form."""
+        return cls(int(data["word_length"]), str(data["source_hash"]), str(data["metric"]),
+                   str(data["opener"]), dict(data["replies"]))  # type: ignore
+
+
+def opening_reply(book: Optional[OpeningBook], history: List[Tuple[str, str]]) -> Optional[str]:
+    """Returns the book's second guess while the game is still on the book opener."""
+    if book and len(history) == 1 and history[0][0] == book.opener:
+        return book.reply(history[0][1])
+    return None
+
+
+def build_opening_book(words: List[str], source_hash: str, metric: str = "entropy") -> OpeningBook:
+    """Computes the opener and one reply per feedback bucket of the opener."""
+    matrix, ids = get_feedback_matrix(words)
+    opener = best_guess_for_ids(matrix, ids, metric)
+    solved = 3 ** matrix.word_length - 1
+    split = partition_codes(matrix.row(opener, ids), solved + 1)
+
+    replies: Dict[str, str] = {}
+    for code, bucket in zip(split.codes, split.split(ids)):
+        if code == solved or len(bucket) == 0:
+            continue
+        replies[code_to_pattern(int(code), matrix.word_length)] = best_guess_for_ids(matrix, bucket, metric)
+    return OpeningBook(matrix.word_length, source_hash, metric, opener, replies)
+
+
+def save_opening_book(book: OpeningBook, path: str) -> None:
+    """Writes a book to disk."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(book.to_dict(), f, separators=(",", ":"), sort_keys=True)
+    except OSError as e:
+        print(f"Error saving opening book: {e}")
+
+
+def load_opening_book(path: str) -> Optional[OpeningBook]:
+    """Reads a book from disk, or returns None if it is missing or corrupted."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return OpeningBook.from_dict(json.load(f))
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError, OSError):
+        return None
+
+
+_BOOKS: Dict[int, OpeningBook] = {}
+# Books being rebuilt in the background, with the callbacks waiting for each.
+_BUILDS: Dict[Tuple[int, str], List[Callable[[OpeningBook], None]]] = {}
+_BUILD_LOCK = threading.Lock()
+
+
+def get_opening_book(words: List[str], word_length: int,
+                     on_ready: Optional[Callable[[OpeningBook], None]] = None) -> Optional[OpeningBook]:
+    """
+    Returns the book for a word length, loading it lazily and rebuilding it
+    when the hash of the word list no longer matches the stored one.
+    With on_ready, a stale book is rebuilt on a background thread instead:
+    None is returned now and on_ready(book) is called from that thread.
+    """
+    if not words:
+        return None
+    source_hash = words_hash(words)
+
+    with _BUILD_LOCK:
+        book = _BOOKS.get(word_length)
+    if book is not None and book.source_hash == source_hash:
+        return book
+    book = load_opening_book(book_path(word_length))
+    if book is not None and book.source_hash == source_hash and book.word_length == word_length:
+        with _BUILD_LOCK:
+            _BOOKS[word_length] = book
+        return book
+
+    if on_ready is not None:
+        build_in_background(list(words), word_length, source_hash, on_ready)
+        return None
+    return store_book(build_opening_book(words, source_hash), word_length)
+
+
+def store_book(book: OpeningBook, word_length: int) -> OpeningBook:
+    """Saves a freshly built book and makes it the current one for its length."""
+    save_opening_book(book, book_path(word_length))
+    with _BUILD_LOCK:
+        _BOOKS[word_length] = book
+    return book
+
+
+def build_in_background(words: List[str], word_length: int, source_hash: str,
+                        on_ready: Callable[[OpeningBook], None]) -> None:
+    """Builds a book on a daemon thread (once per word list) and hands it to on_ready."""
+    key = (word_length, source_hash)
+    with _BUILD_LOCK:
+        if key in _BUILDS:
+            _BUILDS[key].append(on_ready)
+            return
+        _BUILDS[key] = [on_ready]
+
+    def run() -> None:
+        try:
+            book: Optional[OpeningBook] = store_book(build_opening_book(words, source_hash), word_length)
+        except (MemoryError, ValueError) as e:
+            print(f"Error building opening book: {e}")
+            book = None
+        with _BUILD_LOCK:
+            callbacks = _BUILDS.pop(key)
+        if book is not None:
+            for callback in callbacks:
+                callback(book)
+
+    threading.Thread(target=run, name=f"opening-book-{word_length}", daemon=True).start()
+
+
+def main() -> None:
+    """Builds the opening book for one word length from the command line."""
+    parser = argparse.ArgumentParser(description="Build the AI Solver opening book.")
+    parser.add_argument("--length", type=int, default=5)
+    parser.add_argument("--metric", choices=SCORING_METRICS, default="entropy")
+    parser.add_argument("--words", default=WORDS_FILE)
+    args = parser.parse_args()
+
+    words = load_valid_words(args.words, args.length)
+    start = time.perf_counter()
+    book = build_opening_book(words, words_hash(words), args.metric)
+    save_opening_book(book, book_path(args.length))
+    print(f"Built {book_path(args.length)} in {time.perf_counter() - start:.1f}s: "
+          f"opener {book.opener}, {len(book.replies)} replies")
+
+
+if __name__ == "__main__":
+    main()
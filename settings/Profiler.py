@@ -0,0 +1,163 @@
+"""
+Span profiler for frame time and turn latency.
+Traced functions (solver and bot calls, the modes' draw functions) and the
+frame phases (wait, events, render) are recorded as timed spans while the
+profiler is enabled, either with WORDLE_PROFILE=1 or by pressing F3 in game.
+The overlay shows a rolling frame-time graph and the last solver and bot turn
+latencies; F4 (or exiting, when enabled from the environment) writes the spans
+as Chrome trace-event JSON (chrome://tracing, Perfetto) to WORDLE_PROFILE_TRACE.
+Kept free of pygame so the rules modules can be traced too.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+TRACE_FILE = "profile-trace.json"
+SPAN_CAPACITY = 100_000
+FRAME_HISTORY = 120
+# Turn latencies span several frames, so the trace shows them on their own track.
+TURN_TRACK = 0
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span(NamedTuple):
+    """One timed call: perf_counter start and duration in seconds, and its thread."""
+    name: str
+    category: str
+    start: float
+    duration: float
+    thread: int
+
+
+class Profiler:
+    """Records spans and per-frame phase times while enabled; free when disabled."""
+
+    def __init__(self, capacity: int = SPAN_CAPACITY, frame_history: int = FRAME_HISTORY) -> None:
+        self.enabled = False
+        self.spans: Deque[Span] = deque(maxlen=capacity)
+        self.frames: Deque[Tuple[float, float]] = deque(maxlen=frame_history)
+        self.latest: Dict[str, float] = {}
+        self.trace_path = os.environ.get("WORDLE_PROFILE_TRACE", TRACE_FILE)
+        self._origin = time.perf_counter()
+        self._threads: Dict[int, str] = {}
+        self._frame_start: Optional[float] = None
+        self._render_start: Optional[float] = None
+
+    def toggle(self) -> bool:
+        """Switches recording on or off; returns the new state."""
+        self.enabled = not self.enabled
+        self._frame_start = self._render_start = None
+        return self.enabled
+
+    def record(self, name: str, category: str, start: float, end: Optional[float] = None) -> None:
+        """Records a span that started at start (perf_counter) and ends now or at end."""
+        if not self.enabled:
+            return
+        end = time.perf_counter() if end is None else end
+        thread = threading.current_thread()
+        self._threads.setdefault(thread.ident or 0, thread.name)
+        self.spans.append(Span(name, category, start, end - start, thread.ident or 0))
+        self.latest[name] = (end - start) * 1000
+
+    @contextmanager
+    def span(self, name: str, category: str = "app") -> Iterator[None]:
+        """Times the enclosed block."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, category, start)
+
+    def traced(self, name: Optional[str] = None, category: str = "app") -> Callable[[F], F]:
+        """Decorator that records every call of a function while enabled."""
+        def decorate(fn: F) -> F:
+            span_name = name or fn.__qualname__.split("<locals>.")[-1]
+
+            @functools.wraps(fn)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(span_name, category, start)
+            return wrapper  # type: ignore
+        return decorate
+
+    # --- Frame phases (called by FrameLoop and Compositor) ---
+    def begin_frame(self) -> None:
+        """The frame's events have arrived: event handling and updates start."""
+        if self.enabled:
+            self._frame_start = time.perf_counter()
+            self._render_start = None
+
+    def begin_render(self) -> None:
+        """The first layer of the frame is drawn: event handling is over."""
+        if self._frame_start is not None and self._render_start is None:
+            self._render_start = time.perf_counter()
+            self.record("events", "frame", self._frame_start, self._render_start)
+
+    def end_frame(self) -> None:
+        """The frame was presented: records its events and render times."""
+        if self._frame_start is None:
+            return
+        self.begin_render()
+        now = time.perf_counter()
+        render_start = self._render_start or now
+        self.record("render", "frame", render_start, now)
+        self.frames.append(((render_start - self._frame_start) * 1000, (now - render_start) * 1000))
+        self._frame_start = self._render_start = None
+
+    # --- Export ---
+    def chrome_trace(self) -> Dict[str, Any]:
+        """The recorded spans as a Chrome trace-event document (times in microseconds)."""
+        pid = os.getpid()
+        threads = dict(self._threads)
+        threads[TURN_TRACK] = "turns"
+        events: List[Dict[str, Any]] = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        for span in list(self.spans):
+            tid = TURN_TRACK if span.category == "turn" else span.thread
+            events.append({
+                "name": span.name, "cat": span.category, "ph": "X", "pid": pid, "tid": tid,
+                "ts": round((span.start - self._origin) * 1e6, 3),
+                "dur": round(span.duration * 1e6, 3),
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path: Optional[str] = None) -> str:
+        """Writes the Chrome trace to path (default WORDLE_PROFILE_TRACE); returns the path."""
+        path = path or self.trace_path
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.chrome_trace(), f)
+            print(f"Wrote {len(self.spans)} profile spans to {path}")
+        except OSError as e:
+            print(f"Error saving profile trace: {e}")
+        return path
+
+    def clear(self) -> None:
+        """Drops every recorded span and frame."""
+        self.spans.clear()
+        self.frames.clear()
+        self.latest.clear()
+
+
+PROFILER = Profiler()
+
+if os.environ.get("WORDLE_PROFILE"):
+    PROFILER.enabled = True
+    atexit.register(lambda: PROFILER.spans and PROFILER.export())
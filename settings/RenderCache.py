@@ -0,0 +1,140 @@
+"""
+Glyph and tile surface cache shared by every renderer.
+Fonts are looked up once per (name, size, bold); text surfaces are cached per
+(text, font, colour) and letter tiles per (letter, colours, size, shape), both
+with LRU eviction, so a steady frame is mostly blits. Hit rates and the
+per-frame render time are kept for display (WORDLE_RENDER_STATS=1) or tests.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import pygame
+
+Color = Tuple[int, int, int]
+
+
+class LRUSurfaces:
+    """Bounded surface map that evicts the least recently used entry."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.items: "OrderedDict[Hashable, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[pygame.Surface]:
+        surface = self.items.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.items.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key: Hashable, surface: pygame.Surface) -> None:
+        self.items[key] = surface
+        self.items.move_to_end(key)
+        while len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class RenderCache:
+    """Fonts, text surfaces and letter tiles, plus per-frame render timing."""
+
+    def __init__(self, text_capacity: int = 512, tile_capacity: int = 512) -> None:
+        self.fonts: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+        self.texts = LRUSurfaces(text_capacity)
+        self.tiles = LRUSurfaces(tile_capacity)
+        self.show_stats = bool(os.environ.get("WORDLE_RENDER_STATS"))
+        self.frame_ms = 0.0
+        self.average_frame_ms = 0.0
+        self._frame_start: Optional[float] = None
+
+    def font(self, name: str, size: int, bold: bool = False) -> pygame.font.Font:
+        """Returns the font, creating it with SysFont only the first time."""
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+    def text(self, text: str, font: Any, color: Color) -> pygame.Surface:
+        """Returns the rendered text surface for (text, font, colour)."""
+        key = (text, font, color)
+        surface = self.texts.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self.texts.put(key, surface)
+        return surface
+
+    def tile(self, letter: str, size: int, fill: Color, border: Color,
+             text_color: Color = (255, 255, 255), radius: int = 0, border_width: int = 2,
+             font_ratio: float = 0.6, font: Optional[Any] = None) -> pygame.Surface:
+        """
+        Returns a pre-rendered letter tile (background, border and glyph).
+        The glyph uses font if given, else bold Arial at size * font_ratio.
+        """
+        key = (letter, size, fill, border, text_color, radius, border_width, font_ratio, font)
+        surface = self.tiles.get(key)
+        if surface is None:
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            rect = surface.get_rect()
+            pygame.draw.rect(surface, fill, rect, border_radius=radius)
+            pygame.draw.rect(surface, border, rect, border_width, border_radius=radius)
+            if letter:
+                glyph_font = font or self.font("Arial", int(size * font_ratio), True)
+                glyph = self.text(letter, glyph_font, text_color)
+                surface.blit(glyph, glyph.get_rect(center=rect.center))
+            self.tiles.put(key, surface)
+        return surface
+
+    # --- Frame timing ---
+    def begin_frame(self) -> None:
+        """Marks the start of a frame's drawing."""
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self, screen: Optional[pygame.Surface] = None) -> None:
+        """Records the frame's render time and draws the stats line if enabled."""
+        if self._frame_start is None:
+            return
+        self.frame_ms = (time.perf_counter() - self._frame_start) * 1000
+        self.average_frame_ms += (self.frame_ms - self.average_frame_ms) * 0.1
+        self._frame_start = None
+        if screen is not None:
+            self.draw_stats(screen)
+
+    def draw_stats(self, screen: pygame.Surface) -> None:
+        """Draws the render time and hit rates when WORDLE_RENDER_STATS is set."""
+        if self.show_stats:
+            line = (f"render {self.frame_ms:.1f} ms (avg {self.average_frame_ms:.1f})  "
+                    f"text hits {self.texts.hit_rate():.0%}  tile hits {self.tiles.hit_rate():.0%}")
+            # Rendered directly: the numbers change every frame and would flush the LRU.
+            screen.blit(self.font("Arial", 14).render(line, True, (200, 200, 200)), (6, 4))
+
+    def stats(self) -> Dict[str, float]:
+        """Hit rates, cache sizes and frame timing."""
+        return {
+            "text_hit_rate": self.texts.hit_rate(),
+            "tile_hit_rate": self.tiles.hit_rate(),
+            "text_entries": len(self.texts.items),
+            "tile_entries": len(self.tiles.items),
+            "fonts": len(self.fonts),
+            "frame_ms": self.frame_ms,
+            "average_frame_ms": self.average_frame_ms,
+        }
+
+    def clear(self) -> None:
+        """Drops every cached font and surface (e.g. after a display reset)."""
+        self.fonts.clear()
+        self.texts = LRUSurfaces(self.texts.capacity)
+        self.tiles = LRUSurfaces(self.tiles.capacity)
+
+
+RENDER_CACHE = RenderCache()
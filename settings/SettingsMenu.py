@@ -1,13 +1,15 @@
 """
 settings Menu Module.
-Handles player configuration such as Name, Difficulty, and Word Length.
+Handles player configuration such as Name, Word Length, Attempts and the
+EXTREME mode lie strategy.
 """
 import sys
 from typing import Dict, Any, List
 import pygame
 
-from settings.Logic import Button
+from settings.Button import Button
 from settings import WordEditor
+from settings.Logic import LIE_STRATEGIES
 from settings.Constants import (
     WIDTH, COLOR_BG, COLOR_TEXT, COLOR_ACCENT,
     COLOR_PANEL_BG, COLOR_CORRECT, COLOR_BORDER
@@ -18,7 +20,9 @@ game_settings: Dict[str, Any] = {
     "player_name": "Player",
     "word_length": 5,
     "difficulty": "NORMAL",
-    "max_attempts": 6
+    "max_attempts": 6,
+    # EXTREME lie strategy: "window", "misleading" or "plausible" (see Logic.LIE_STRATEGIES)
+    "lie_strategy": "window"
 }
 
 
@@ -41,8 +45,10 @@ def settings_menu() -> None:
     btns_len_y: int = 290
     lbl_att_y: int = 400
     btns_att_y: int = 440
-    btn_edit_y: int = 560
-    btn_back_y: int = 660
+    lbl_lie_y: int = 530
+    btns_lie_y: int = 565
+    btn_edit_y: int = 650
+    btn_back_y: int = 720
 
     # --- CREATE BUTTONS ---
     btn_len_5 = Button(center_x - 120, btns_len_y, 60, 60, "5", COLOR_PANEL_BG, action_id=5)
@@ -53,6 +59,12 @@ def settings_menu() -> None:
     btn_att_minus = Button(center_x - 100, btns_att_y, 50, 50, "-", COLOR_PANEL_BG, action_id="DEC")
     btn_att_plus = Button(center_x + 50, btns_att_y, 50, 50, "+", COLOR_PANEL_BG, action_id="INC")
 
+    lie_btns: List[Button] = [
+        Button(center_x - 320 + i * 220, btns_lie_y, 200, 50, strategy.upper(), COLOR_PANEL_BG,
+               action_id=strategy)
+        for i, strategy in enumerate(LIE_STRATEGIES)
+    ]
+
     btn_edit_file = Button(center_x - 150, btn_edit_y, 300, 50, "EDIT WORDS FILE",
                            (70, 70, 180), action_id="EDIT_FILE")
 
@@ -73,6 +85,8 @@ def settings_menu() -> None:
                 btn.color = COLOR_CORRECT
             else:
                 btn.color = COLOR_PANEL_BG
+        for btn in lie_btns:
+            btn.is_selected = (btn.action_id == game_settings.get("lie_strategy", "window"))
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -99,6 +113,10 @@ def settings_menu() -> None:
                     if game_settings["max_attempts"] > 2:
                         game_settings["max_attempts"] -= 1
 
+                for btn in lie_btns:
+                    if btn.is_clicked(mouse_pos):
+                        game_settings["lie_strategy"] = btn.action_id
+
                 active_input = input_rect.collidepoint(mouse_pos)
 
             if event.type == pygame.KEYDOWN and active_input:
@@ -144,6 +162,13 @@ def settings_menu() -> None:
         btn_att_minus.draw(screen)
         btn_att_plus.draw(screen)
 
+        # Lie Strategy Label & Buttons (how EXTREME mode picks its lie)
+        lbl_lie = font_label.render("Extreme Lie Strategy:", True, COLOR_ACCENT)
+        lbl_lie_rect = lbl_lie.get_rect(center=(center_x, lbl_lie_y))
+        screen.blit(lbl_lie, lbl_lie_rect)
+        for btn in lie_btns:
+            btn.draw(screen)
+
         # Bottom Buttons
         btn_edit_file.draw(screen)
         btn_back.draw(screen)
@@ -0,0 +1,192 @@
+"""
+Incremental solver state shared by the AI Solver, the PvE bot and hints.
+The candidate set is an array of ids into a shared feedback matrix, so each
+guess narrows it in one bulk operation instead of rebuilding word lists.
+"""
+import random
+import threading
+import zlib
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+
+from settings.Logic import (
+    FeedbackMatrix, Constraint, get_feedback_matrix, best_guess_for_ids,
+    pattern_to_code, score_lie_aware_ids, pick_best_guess
+)
+from settings.Profiler import PROFILER
+
+
+class SolverState:
+    """Candidate words of one game, narrowed by each (guess, feedback) pair."""
+
+    def __init__(self, matrix: FeedbackMatrix, candidate_ids: Optional[np.ndarray] = None) -> None:
+        self.matrix = matrix
+        if candidate_ids is None:
+            candidate_ids = np.arange(len(matrix.words))
+        self.candidate_ids = candidate_ids
+        self.history: List[Tuple[str, str]] = []
+        self._undo_stack: List[Any] = []
+
+    @classmethod
+    def from_words(cls, words: List[str]) -> "SolverState":
+        """Creates a state over the given words, sharing the dictionary's matrix."""
+        matrix, ids = get_feedback_matrix(words)
+        return cls(matrix, ids)
+
+    def __len__(self) -> int:
+        return len(self.candidate_ids)
+
+    @property
+    def word_length(self) -> int:
+        """Length of the words being solved."""
+        return self.matrix.word_length
+
+    @property
+    def words(self) -> List[str]:
+        """The remaining candidate words, in dictionary order."""
+        return [self.matrix.words[i] for i in self.candidate_ids]
+
+    @PROFILER.traced(category="solver")
+    def apply(self, guess_word: str, colour_pattern: str) -> None:
+        """Narrows the candidates with the feedback for one guess."""
+        constraint = Constraint(self.word_length)
+        constraint.add_feedback(guess_word, colour_pattern)
+        keep = constraint.mask(self.matrix.positions[self.candidate_ids],
+                               self.matrix.letter_counts[self.candidate_ids])
+
+        # Arrays are never modified in place, so undo only has to keep references.
+        self._undo_stack.append(self._snapshot())
+        self.candidate_ids = self.candidate_ids[keep]
+        self.history.append((guess_word.upper(), colour_pattern.lower()))
+
+    def _snapshot(self) -> Any:
+        """Returns what undo needs to restore the current step."""
+        return self.candidate_ids
+
+    def _restore(self, snapshot: Any) -> None:
+        """Restores a step saved by _snapshot."""
+        self.candidate_ids = snapshot
+
+    def undo(self) -> bool:
+        """Reverts the last applied feedback. Returns False if there was none."""
+        if not self._undo_stack:
+            return False
+        self._restore(self._undo_stack.pop())
+        self.history.pop()
+        return True
+
+    def reset(self) -> None:
+        """Reverts every applied feedback."""
+        if self._undo_stack:
+            self._restore(self._undo_stack[0])
+        self._undo_stack.clear()
+        self.history.clear()
+
+    def clone(self) -> "SolverState":
+        """Returns an independent copy that shares the matrix and id arrays."""
+        copy = self.__class__.__new__(self.__class__)
+        copy.__dict__.update(self.__dict__)
+        copy.history = list(self.history)
+        copy._undo_stack = list(self._undo_stack)
+        return copy
+
+    def random_candidate(self) -> str:
+        """Returns a random remaining candidate."""
+        return self.matrix.words[int(random.choice(self.candidate_ids))]
+
+    @PROFILER.traced(category="solver")
+    def best_guess(self, metric: str = "entropy", cancel: Optional[threading.Event] = None) -> str:
+        """Returns the best next guess (also used as a hint); cancel aborts it with Cancelled."""
+        return best_guess_for_ids(self.matrix, self.candidate_ids, metric, cancel)
+
+
+class ExtremeState(SolverState):
+    """
+    Candidates of an EXTREME game, where feedback may lie up to lie_budget times.
+    Each candidate keeps a count of the feedback it contradicts and a bitmask
+    of which turns those were.
+    """
+
+    LIE_PRIOR = 0.1
+    # Scoring cost grows with the states, so large sets are scored on a sample.
+    SAMPLE_LIMIT = 2048
+
+    def __init__(self, matrix: FeedbackMatrix, candidate_ids: Optional[np.ndarray] = None,
+                 lie_budget: int = 1) -> None:
+        super().__init__(matrix, candidate_ids)
+        self.lie_budget = lie_budget
+        self.errors = np.zeros(len(self.candidate_ids), dtype=np.uint8)
+        self.lie_turns = np.zeros(len(self.candidate_ids), dtype=np.uint64)
+
+    @classmethod
+    def from_words(cls, words: List[str], lie_budget: int = 1) -> "ExtremeState":
+        """Creates a state over the given words, sharing the dictionary's matrix."""
+        matrix, ids = get_feedback_matrix(words)
+        return cls(matrix, ids, lie_budget)
+
+    @PROFILER.traced(category="solver")
+    def apply(self, guess_word: str, colour_pattern: str) -> None:
+        """Counts the feedback against every candidate and drops those over budget."""
+        turn = len(self.history)
+        codes = self.matrix.row(guess_word.upper(), self.candidate_ids)
+        mismatch = codes != pattern_to_code(colour_pattern)
+
+        errors = self.errors + mismatch
+        lie_turns = self.lie_turns | (mismatch.astype(np.uint64) << np.uint64(turn))
+        keep = errors <= self.lie_budget
+
+        self._undo_stack.append(self._snapshot())
+        self.candidate_ids = self.candidate_ids[keep]
+        self.errors = errors[keep]
+        self.lie_turns = lie_turns[keep]
+        self.history.append((guess_word.upper(), colour_pattern.lower()))
+
+    def _snapshot(self) -> Any:
+        return self.candidate_ids, self.errors, self.lie_turns
+
+    def _restore(self, snapshot: Any) -> None:
+        self.candidate_ids, self.errors, self.lie_turns = snapshot
+
+    @PROFILER.traced(category="solver")
+    def best_guess(self, metric: str = "entropy", cancel: Optional[threading.Event] = None) -> str:
+        """
+        Returns the guess that best narrows the (word, lies used) states, so
+        spending a lie is scored as a possible outcome instead of ignored.
+        """
+        ids, errors = self.candidate_ids, self.errors
+        can_lie = errors < self.lie_budget
+        if not can_lie.any():
+            return best_guess_for_ids(self.matrix, ids, metric, cancel)
+        if len(ids) == 1:
+            return self.matrix.words[int(ids[0])]
+
+        if len(ids) > self.SAMPLE_LIMIT:
+            # Seeded by the history so the same game always gets the same guess.
+            seed = zlib.crc32(repr(self.history).encode())
+            sample = np.sort(np.random.default_rng(seed).choice(len(ids), self.SAMPLE_LIMIT, replace=False))
+            ids, errors, can_lie = ids[sample], errors[sample], can_lie[sample]
+
+        weights = self.LIE_PRIOR ** errors.astype(np.float64)
+        scores = score_lie_aware_ids(self.matrix, ids, can_lie, weights, metric, cancel)
+        return pick_best_guess(self.matrix, ids, scores)
+
+    def lie_turn_weights(self) -> np.ndarray:
+        """
+        For each past turn, the weight of candidates that imply it was a lie.
+        A candidate needing n lies weighs LIE_PRIOR ** n, so lies stay unlikely.
+        """
+        turns = np.arange(len(self.history), dtype=np.uint64)
+        blamed = (self.lie_turns[:, None] >> turns[None, :]) & np.uint64(1)
+        weights = self.LIE_PRIOR ** self.errors.astype(np.float64)
+        return (blamed * weights[:, None]).sum(axis=0)
+
+    def likely_lie_turn(self) -> Optional[int]:
+        """Index of the past turn most likely to have been a lie, or None if none was."""
+        if not self.history or len(self.candidate_ids) == 0:
+            return None
+        turn_weights = self.lie_turn_weights()
+        honest_weight = float((self.errors == 0).sum())
+        if turn_weights.max() <= honest_weight:
+            return None
+        return int(np.argmax(turn_weights))
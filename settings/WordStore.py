@@ -0,0 +1,185 @@
+"""
+Compiled binary dictionary.
+The word file is compiled into a versioned binary file with one shard per word
+length; each shard is an array of fixed-width byte records. The binary file is
+memory-mapped, so a shard is a zero-copy numpy view, and it is recompiled
+automatically when the text file's size, mtime or content hash changes.
+
+Compile by hand with: python -m settings.WordStore [words file]
+"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+STORE_MAGIC = b"WDICT"
+STORE_VERSION = 1
+
+# magic, version, source size, source mtime (ns), source hash, shard count
+HEADER = struct.Struct("<5sBQQ16sH")
+MTIME_OFFSET = struct.calcsize("<5sBQ")
+MTIME = struct.Struct("<Q")
+# word length, record width in bytes, word count, byte offset of the records
+SHARD = struct.Struct("<HHIQ")
+
+
+def store_path(words_file: str) -> str:
+    """Returns where the compiled form of a word file is kept (next to it)."""
+    return os.path.splitext(words_file)[0] + ".bin"
+
+
+def content_hash(data: bytes) -> bytes:
+    """Short content hash stored in the header to detect edited word files."""
+    return hashlib.sha256(data).hexdigest()[:16].encode("ascii")
+
+
+def parse_words(text: str) -> Dict[int, List[str]]:
+    """Groups the file's words by length, normalized like load_valid_words."""
+    shards: Dict[int, List[str]] = {}
+    for line in text.splitlines():
+        clean_word = line.strip().upper()
+        if clean_word.isalpha():
+            shards.setdefault(len(clean_word), []).append(clean_word)
+    return shards
+
+
+def compile_store(words_file: str, path: Optional[str] = None) -> str:
+    """Compiles a word file into its binary store and returns the store's path."""
+    path = path or store_path(words_file)
+    with open(words_file, "rb") as f:
+        data = f.read()
+    stat = os.stat(words_file)
+    shards = parse_words(data.decode("utf-8"))
+
+    # Records are padded to the shard's widest UTF-8 word (the length for ASCII).
+    encoded = {length: [w.encode("utf-8") for w in words] for length, words in shards.items()}
+    widths = {length: max(len(w) for w in words) for length, words in encoded.items()}
+
+    offset = HEADER.size + SHARD.size * len(shards)
+    table, body = [], []
+    for length in sorted(encoded):
+        records = np.array(encoded[length], dtype=f"S{widths[length]}")
+        table.append(SHARD.pack(length, widths[length], len(records), offset))
+        body.append(records.tobytes())
+        offset += records.nbytes
+
+    header = HEADER.pack(STORE_MAGIC, STORE_VERSION, stat.st_size, stat.st_mtime_ns,
+                         content_hash(data), len(shards))
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header + b"".join(table) + b"".join(body))
+    os.replace(temp_path, path)
+    return path
+
+
+class WordStore:
+    """A memory-mapped compiled dictionary; shards are read-only numpy views."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lists: Dict[int, List[str]] = {}
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.source_size, self.source_mtime_ns, self.source_hash, shard_count = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {STORE_VERSION} word store")
+
+        self.shards: Dict[int, Tuple[int, int, int]] = {}
+        for i in range(shard_count):
+            length, width, count, offset = SHARD.unpack_from(self._map, HEADER.size + i * SHARD.size)
+            self.shards[length] = (width, count, offset)
+
+    def records(self, length: int) -> np.ndarray:
+        """Zero-copy view of the fixed-width byte records for one word length."""
+        if length not in self.shards:
+            return np.zeros(0, dtype=f"S{max(length, 1)}")
+        width, count, offset = self.shards[length]
+        return np.frombuffer(self._map, dtype=f"S{width}", count=count, offset=offset)
+
+    def words(self, length: int) -> List[str]:
+        """Words of one length as strings, decoded once per store."""
+        if length not in self._lists:
+            self._lists[length] = [w.decode("utf-8") for w in self.records(length).tolist()]
+        return self._lists[length]
+
+    def is_current(self, words_file: str) -> bool:
+        """True if the store was compiled from the file as it is now."""
+        stat = os.stat(words_file)
+        if (stat.st_size, stat.st_mtime_ns) == (self.source_size, self.source_mtime_ns):
+            return True
+        # Touched but maybe not edited: compare contents before forcing a rebuild.
+        if stat.st_size != self.source_size:
+            return False
+        with open(words_file, "rb") as f:
+            if content_hash(f.read()) != self.source_hash:
+                return False
+        self.refresh_mtime(stat.st_mtime_ns)
+        return True
+
+    def refresh_mtime(self, mtime_ns: int) -> None:
+        """Records a new source mtime after an unchanged hash, so later checks skip hashing."""
+        self.source_mtime_ns = mtime_ns
+        try:
+            with open(self.path, "r+b") as f:
+                f.seek(MTIME_OFFSET)
+                f.write(MTIME.pack(mtime_ns))
+        except OSError:
+            pass  # The in-memory stat still spares this process the rehash.
+
+    def close(self) -> None:
+        """Releases the memory map (views taken from it must not be used after)."""
+        self._lists.clear()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Still exported to numpy views; freed with the last of them.
+
+
+_STORES: Dict[str, WordStore] = {}
+
+
+def get_word_store(words_file: str) -> WordStore:
+    """
+    Returns the process-wide store for a word file, compiling or recompiling it
+    when missing, from another format version, or out of date with the text file.
+    """
+    key = os.path.abspath(words_file)
+    store = _STORES.get(key)
+    if store is not None and store.is_current(words_file):
+        return store
+
+    # Release the stale map first: some platforms cannot replace a mapped file.
+    if store is not None:
+        del _STORES[key]
+        store.close()
+
+    path = store_path(words_file)
+    try:
+        fresh = WordStore(path)
+        if not fresh.is_current(words_file):
+            fresh.close()
+            fresh = WordStore(compile_store(words_file, path))
+    except (ValueError, struct.error, FileNotFoundError):
+        fresh = WordStore(compile_store(words_file, path))
+
+    _STORES[key] = fresh
+    return fresh
+
+
+def main() -> None:
+    """Compiles the word file given on the command line (or the game's default)."""
+    words_file = sys.argv[1] if len(sys.argv) > 1 else "Files/valid-wordle-words.txt"
+    store = WordStore(compile_store(words_file))
+    for length, (width, count, _) in sorted(store.shards.items()):
+        print(f"length {length}: {count} words, {width}-byte records")
+    print(f"wrote {store.path}")
+
+
+if __name__ == "__main__":
+    main()
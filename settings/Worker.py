@@ -0,0 +1,143 @@
+"""
+Background worker for solver computations.
+Jobs run on a worker thread and hand their results back through futures, so
+the pygame loop keeps drawing and handling events while a turn is computed.
+"""
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+import pygame
+
+from settings.Logic import Cancelled
+
+
+class SolverJob:
+    """One submitted computation: its future, cancel flag, timing and any error."""
+
+    def __init__(self) -> None:
+        self.future: Future = Future()
+        self.cancel_event = threading.Event()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[Exception] = None
+
+    def done(self) -> bool:
+        """True once the result is ready (or the job failed)."""
+        return self.future.done()
+
+    def cancel(self) -> None:
+        """Flags the job as cancelled; a running job's result is then discarded."""
+        self.cancel_event.set()
+        self.future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def result(self) -> Any:
+        """Returns the job's result, re-raising any exception it raised."""
+        return self.future.result()
+
+    def elapsed(self) -> float:
+        """Seconds spent running the job so far (not queued), or in total once it has finished."""
+        if self.started is None:
+            return 0.0
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+
+class SolverWorker:
+    """
+    Runs solver jobs one at a time on a background thread.
+    A thread (not a process) lets jobs share the feedback matrix; numpy
+    releases the GIL in its heavy loops, so the UI thread stays responsive.
+    """
+
+    def __init__(self) -> None:
+        self._executor = self._new_executor()
+        self.current: Optional[SolverJob] = None
+
+    @staticmethod
+    def _new_executor() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="solver")
+
+    def submit(self, fn: Callable[..., Any], *args: Any, cancellable: bool = False) -> SolverJob:
+        """
+        Cancels any pending job and starts fn(*args) in the background. A
+        cancellable fn also gets cancel=<threading.Event> and should stop
+        (raising Cancelled) once it is set.
+        """
+        self.cancel()
+        job = SolverJob()
+
+        def run() -> Any:
+            job.started = time.perf_counter()
+            try:
+                if job.cancelled:
+                    return None
+                if cancellable:
+                    return fn(*args, cancel=job.cancel_event)
+                return fn(*args)
+            except Cancelled:
+                return None
+            finally:
+                job.finished = time.perf_counter()
+
+        job.future = self._executor.submit(run)
+        self.current = job
+        return job
+
+    def poll(self) -> Optional[Tuple[SolverJob, Any]]:
+        """
+        Returns (job, result) once the current job is done, else None. A job
+        that raised is returned with a None result and its exception in job.error.
+        """
+        job = self.current
+        if job is None or not job.done():
+            return None
+        self.current = None
+        try:
+            return job, job.result()
+        except Exception as e:  # pylint: disable=broad-except
+            print(f"Solver job failed: {e!r}")
+            job.error = e
+            return job, None
+
+    @property
+    def busy(self) -> bool:
+        return self.current is not None
+
+    def cancel(self) -> None:
+        """
+        Cancels the current job, if any. A job that is already running is left
+        to stop on its own on a discarded thread, so the next job starts at once.
+        """
+        job = self.current
+        if job is None:
+            return
+        job.cancel()
+        self.current = None
+        if job.future.running():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_executor()
+
+    def shutdown(self) -> None:
+        """Cancels pending work and releases the thread without waiting for it."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def draw_spinner(screen: pygame.Surface, center: Tuple[int, int], radius: int,
+                 color: Tuple[int, int, int], elapsed: float) -> None:
+    """Draws a ring of dots whose bright head rotates with time."""
+    dots = 8
+    head = int(elapsed * 12) % dots
+    for i in range(dots):
+        angle = 2 * math.pi * i / dots
+        fade = ((i - head) % dots) / dots
+        shade = tuple(int(c * (1.0 - 0.75 * fade)) for c in color)
+        pos = (int(center[0] + radius * math.cos(angle)), int(center[1] + radius * math.sin(angle)))
+        pygame.draw.circle(screen, shade, pos, max(2, radius // 4))
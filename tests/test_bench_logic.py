@@ -0,0 +1,40 @@
+"""
+Unit tests for the Logic micro-benchmark suite.
+"""
+import random
+import unittest
+
+from benchmarks.bench_logic import synthetic_words, compare, time_case, case_colour_set
+
+
+class TestBenchLogic(unittest.TestCase):
+    """Tests for the synthetic dictionaries and the baseline comparison."""
+
+    def test_synthetic_words(self):
+        """Test that synthetic dictionaries are distinct words of the requested length."""
+        words = synthetic_words(500, 6, random.Random(1))
+        self.assertEqual(len(words), 500)
+        self.assertEqual(len(set(words)), 500)
+        self.assertTrue(all(len(w) == 6 and w.isalpha() and w.isupper() for w in words))
+        self.assertEqual(words, synthetic_words(500, 6, random.Random(1)))
+
+    def test_time_case(self):
+        """Test that a case reports its timings per call."""
+        result = time_case(case_colour_set, ["APPLE", "CRANE", "SLATE"], 0, 2)
+        self.assertEqual(result["calls"], 2000)
+        self.assertGreater(result["median_ms"], 0)
+
+    def test_compare_flags_regressions(self):
+        """Test that only slowdowns over the threshold and new failures are flagged."""
+        baseline = {"a": {"median_ms": 10.0}, "b": {"median_ms": 10.0}, "c": {"median_ms": 1.0},
+                    "d": {"error": "MemoryError"}}
+        current = {"a": {"median_ms": 12.0}, "b": {"median_ms": 14.0}, "c": {"error": "MemoryError"},
+                   "d": {"median_ms": 5.0}, "e": {"median_ms": 1.0}}
+        regressions = compare(current, baseline, 0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("b:"))
+        self.assertIn("now fails", regressions[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Unit tests for the deadline-bounded Gemini bot calls (against the fake endpoint).
+"""
+import threading
+import unittest
+from unittest.mock import patch
+
+from modes import PveMode
+from settings.BotCalls import BotCallPipeline
+from settings.FakeGemini import FakeGeminiClient
+
+
+class TestBotCallPipeline(unittest.TestCase):
+    """Tests for deadline-bounded Gemini moves against the fake endpoint."""
+
+    WORDS = {"APPLE", "CRANE", "SLATE"}
+
+    def setUp(self):
+        self.pipeline = BotCallPipeline(timeout=0.2)
+
+    def tearDown(self):
+        self.pipeline.shutdown()
+
+    def play(self, client):
+        """Starts a turn with the given fake client and waits for its decision."""
+        with patch('modes.PveMode.CLIENT', client):
+            turn = self.pipeline.start((), lambda: PveMode.get_gemini_guess([], 5),
+                                       lambda: "SLATE", lambda w: w in self.WORDS)
+            turn.remote.exception(timeout=5)
+            turn.local.result(timeout=5)
+            word = turn.poll()
+            while word is None:
+                word = turn.poll()
+        return word, turn.source
+
+    def test_fast_reply_is_used(self):
+        """Test that a valid on-time Gemini answer wins."""
+        client = FakeGeminiClient(latency=0.0, reply="crane")
+        self.assertEqual(self.play(client), ("CRANE", "remote"))
+        self.assertEqual(len(client.calls), 1)
+
+    def test_timeout_falls_back_to_local(self):
+        """Test that a call past its deadline is replaced by the local guess."""
+        self.pipeline.timeout = 0.05
+        client = FakeGeminiClient(latency=1.0, reply="CRANE")
+        turn = None
+        with patch('modes.PveMode.CLIENT', client):
+            turn = self.pipeline.start((), lambda: PveMode.get_gemini_guess([], 5),
+                                       lambda: "SLATE", lambda w: w in self.WORDS)
+            turn.local.result(timeout=5)
+            self.assertIsNone(turn.poll(now=turn.deadline - 0.01))
+            self.assertEqual(turn.poll(now=turn.deadline), "SLATE")
+        self.assertEqual(turn.source, "local")
+
+    def test_invalid_or_failed_reply_falls_back(self):
+        """Test that non-words and API errors use the local guess without waiting."""
+        self.assertEqual(self.play(FakeGeminiClient(reply="QWXYZ")), ("SLATE", "local"))
+        self.pipeline.cancel()
+        self.assertEqual(self.play(FakeGeminiClient(error=Exception("down"))), ("SLATE", "local"))
+
+    def test_hung_calls_never_block_the_fallback(self):
+        """Test that remote calls holding every worker still leave the local guess on time."""
+        hang = threading.Event()
+        self.addCleanup(hang.set)
+        self.pipeline.timeout = 0.05
+        for turn_number in range(6):
+            turn = self.pipeline.start(turn_number, hang.wait, lambda: "SLATE", bool)
+            turn.local.result(timeout=5)
+            self.assertEqual(turn.poll(now=turn.deadline), "SLATE")
+            self.assertEqual(turn.source, "local")
+
+    def test_fake_client_times_out(self):
+        """Test that the fake client gives up after its request timeout, like the real one."""
+        client = FakeGeminiClient(latency=30.0, reply="CRANE", timeout=0.01)
+        with self.assertRaises(TimeoutError):
+            client.models.generate_content(model="m", contents="")
+
+    def test_speculative_turn_is_reused(self):
+        """Test that asking again for the same position does not start a new call."""
+        first = self.pipeline.start(("CRANE",), lambda: "APPLE", lambda: "SLATE", bool)
+        again = self.pipeline.start(("CRANE",), lambda: "CRANE", lambda: "SLATE", bool)
+        self.assertIs(first, again)
+
+
+if __name__ == '__main__':
+    unittest.main()
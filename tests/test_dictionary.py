@@ -0,0 +1,53 @@
+"""
+Unit tests for the shared dictionary service.
+"""
+import os
+import tempfile
+import unittest
+
+from settings import WordStore
+from settings.Dictionary import Dictionary, get_dictionary
+
+
+class TestDictionary(unittest.TestCase):
+    """Tests for the shared dictionary service."""
+
+    def test_membership_ids_and_prefixes(self):
+        """Test O(1) lookups, stable ids and trie prefix counts."""
+        dictionary = Dictionary(["APPLE", "APPLY", "ANGLE", "CRANE"])
+        self.assertIn("APPLY", dictionary)
+        self.assertNotIn("APPLX", dictionary)
+        self.assertEqual(dictionary.word_id("ANGLE"), 2)
+        self.assertEqual(dictionary.word(3), "CRANE")
+        self.assertIsNone(dictionary.word_id("ZEBRA"))
+
+        self.assertEqual(dictionary.prefix_count(""), 4)
+        self.assertEqual(dictionary.prefix_count("AP"), 2)
+        self.assertEqual(dictionary.prefix_count("APPLE"), 1)
+        self.assertTrue(dictionary.has_prefix("CR"))
+        self.assertFalse(dictionary.has_prefix("CX"))
+
+    def test_shared_until_file_changes(self):
+        """Test that modes share one instance until the word file is edited."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            words_file = os.path.join(temp_dir, "words.txt")
+            with open(words_file, "w", encoding="utf-8") as f:
+                f.write("apple\ncrane\n")
+            os.utime(words_file, ns=(1_000_000_000, 1_000_000_000))
+            first = get_dictionary(5, words_file)
+            self.assertIs(get_dictionary(5, words_file), first)
+
+            with open(words_file, "w", encoding="utf-8") as f:
+                f.write("apple\nslate\n")
+            os.utime(words_file, ns=(2_000_000_000, 2_000_000_000))
+            second = get_dictionary(5, words_file)
+            self.assertIsNot(second, first)
+            self.assertIn("SLATE", second)
+
+            for store in WordStore._STORES.values():
+                store.close()
+            WordStore._STORES.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
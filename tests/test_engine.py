@@ -0,0 +1,232 @@
+"""
+Unit tests for the headless game engines (no pygame involved).
+"""
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+import settings.NeighborIndex
+from settings.Logic import colour_set, get_pattern_string, levenshtein_distances
+from settings.OpeningBook import words_hash
+from settings.Solver import SolverState
+from settings.NeighborIndex import NeighborIndex, serialize_index, get_neighbor_index
+from settings.Engine import (
+    PlayerEngine, SolverEngine, PveEngine, calculate_score, edit_bot_guess, get_edit_distance_guess,
+    TYPE, DELETE, ENTER, GUESS, NEXT, PATTERN, MARK, FEEDBACK, SUBMIT, RESOLVE, RESTART, BOT,
+    INVALID, WON, LOST
+)
+
+WORDS = ["APPLE", "CRANE", "SLATE", "PLANE", "GRAPE", "TRACE"]
+
+
+class TestPlayerEngine(unittest.TestCase):
+    """Tests for the single player rules."""
+
+    def setUp(self):
+        self.engine = PlayerEngine(WORDS, "NORMAL", 5, 6, rng=random.Random(0))
+        self.engine.secret_word = "APPLE"
+
+    def test_typing_and_invalid_word(self):
+        """Test that typing is capped and unknown words are rejected with an event."""
+        for letter in "ZZZZZZ":
+            state = self.engine.step((TYPE, letter))
+        self.assertEqual(state.current, "ZZZZZ")
+        state = self.engine.step((ENTER,))
+        self.assertEqual(state.event, INVALID)
+        self.assertEqual(state.guesses, ())
+        state = self.engine.step((DELETE,))
+        self.assertEqual(state.current, "ZZZZ")
+
+    def test_win_scores_and_next_round(self):
+        """Test that a win scores the round and NEXT starts a new one."""
+        self.engine.step((GUESS, "crane"))
+        state = self.engine.step((GUESS, "APPLE"))
+        self.assertEqual(state.event, WON)
+        self.assertEqual(state.round_points, calculate_score(5, 6, 2, "NORMAL"))
+        self.assertEqual(state.letters["A"], "g")
+        self.assertEqual(state.letters["C"], "x")
+        state = self.engine.step((TYPE, "A"))
+        self.assertEqual(state.current, "")
+        state = self.engine.step((NEXT,))
+        self.assertEqual(state.rounds_played, 2)
+        self.assertFalse(state.game_over)
+        self.assertEqual(state.session_score, calculate_score(5, 6, 2, "NORMAL"))
+
+    def test_loss_ends_session(self):
+        """Test that running out of attempts ends the session."""
+        for _ in range(6):
+            state = self.engine.step((GUESS, "CRANE"))
+        self.assertEqual(state.event, LOST)
+        self.assertTrue(state.session_over)
+        self.assertEqual(self.engine.step((NEXT,)).rounds_played, 1)
+
+    def test_extreme_lie(self):
+        """Test that the EXTREME lie turn scores against another word, never as a win."""
+        engine = PlayerEngine(WORDS, "EXTREME", 5, 6, rng=random.Random(1))
+        engine.secret_word = "APPLE"
+        engine.lie_index = 0
+        with unittest.mock.patch("settings.Engine.get_best_lie",
+                                 return_value=colour_set("CRANE", "TRACE", 5)) as lie:
+            state = engine.step((GUESS, "CRANE"))
+            lie.assert_called_once_with("CRANE", WORDS, 5, "window", "APPLE", [], engine.rng)
+            state = engine.step((GUESS, "APPLE"))
+            self.assertEqual(lie.call_count, 1)
+        self.assertEqual(state.guesses[0], tuple(colour_set("CRANE", "TRACE", 5)))
+        self.assertEqual(state.round_points, calculate_score(5, 6, 2, "EXTREME"))
+
+
+class TestSolverEngine(unittest.TestCase):
+    """Tests for the AI Solver rules."""
+
+    def test_pattern_entry(self):
+        """Test pattern keys, tile clicks and deletion."""
+        engine = SolverEngine(WORDS)
+        engine.step((PATTERN, "g"))
+        engine.step((PATTERN, "q"))
+        state = engine.step((MARK, 2))
+        self.assertEqual(state.pattern, "gxy")
+        state = engine.step((DELETE,))
+        self.assertEqual(state.pattern, "gx")
+
+    def test_turn_is_thinking_until_resolved(self):
+        """Test that a submitted turn waits for RESOLVE and then narrows the candidates."""
+        engine = SolverEngine(WORDS)
+        guess = engine.snapshot().suggestion
+        pattern = "".join(t[2] for t in colour_set(guess, "APPLE", 5))
+        if pattern == "ggggg":
+            self.skipTest("opener is the secret")
+        state = engine.step((FEEDBACK, pattern))
+        self.assertEqual(state.status, "THINKING")
+        self.assertEqual(state.history, ((guess, pattern),))
+        self.assertEqual(engine.step((PATTERN, "g")).pattern, "")
+        state = engine.step((RESOLVE, None))
+        self.assertIn(state.status, ("PLAYING", "WON"))
+        self.assertLess(state.words_left, len(WORDS))
+
+    def test_all_green_wins_and_restart(self):
+        """Test that an all-green pattern wins immediately and RESTART resets."""
+        engine = SolverEngine(WORDS)
+        for _ in range(5):
+            engine.step((PATTERN, "g"))
+        state = engine.step((SUBMIT,))
+        self.assertEqual(state.status, "WON")
+        state = engine.step((RESTART,))
+        self.assertEqual(state.status, "PLAYING")
+        self.assertEqual(state.history, ())
+        self.assertEqual(state.words_left, len(WORDS))
+
+
+class TestPveEngine(unittest.TestCase):
+    """Tests for the player vs bot rules."""
+
+    def setUp(self):
+        self.engine = PveEngine(WORDS, "EDIT", 5, 6, rng=random.Random(0))
+        self.engine.secret_word = "APPLE"
+
+    def test_each_guess_owes_a_bot_move(self):
+        """Test that the bot owes one move per valid player guess."""
+        state = self.engine.step((GUESS, "ZZZZZ"))
+        self.assertEqual((state.event, state.bot_owed), (INVALID, 0))
+        state = self.engine.step((GUESS, "CRANE"))
+        self.assertEqual(state.bot_owed, 1)
+        state = self.engine.step((BOT, "SLATE"))
+        self.assertEqual((state.bot_owed, len(state.bot_guesses)), (0, 1))
+        self.assertEqual(self.engine.step((BOT, "TRACE")).bot_guesses, state.bot_guesses)
+
+    def test_bot_plays_out_the_round(self):
+        """Test that the bot keeps playing after the player wins and the round then ends."""
+        state = self.engine.step((GUESS, "APPLE"))
+        self.assertTrue(state.player_won)
+        self.assertEqual(state.player_score, 5 * 10 + 5 * 20)
+        while not state.round_over:
+            self.assertEqual(state.bot_owed, 1)
+            state = self.engine.step((BOT, None))
+        self.assertTrue(state.bot_won or state.bot_lost)
+        self.assertEqual(state.status_msg, "ROUND COMPLETE")
+        self.assertEqual(self.engine.step((NEXT,)).rounds_played, 2)
+
+    def test_player_loss(self):
+        """Test that a lost round is reported and does not start another."""
+        for _ in range(6):
+            state = self.engine.step((GUESS, "CRANE"))
+            state = self.engine.step((BOT, "CRANE"))
+        self.assertTrue(state.round_over)
+        self.assertEqual(state.status_msg, "YOU LOST!")
+        self.assertTrue(self.engine.session_over)
+        self.assertEqual(self.engine.step((NEXT,)).rounds_played, 1)
+
+    def test_engines_do_not_import_pygame(self):
+        """Test that the engine module runs without pygame."""
+        code = "import sys, settings.Engine; print('pygame' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+
+class TestNeighborIndex(unittest.TestCase):
+    """Tests for the edit bot's neighbour index."""
+
+    WORDS = ["APPLE", "AMPLE", "ANGLE", "CRANE", "CRATE", "GRATE", "TRACE", "PLANE", "ZZZZZ"]
+
+    def setUp(self):
+        self.index = NeighborIndex(serialize_index(self.WORDS, "test"))
+
+    def test_neighbors_match_levenshtein(self):
+        """Test that every word's neighbours are exactly the words within distance 2."""
+        for word_id, word in enumerate(self.WORDS):
+            distances = levenshtein_distances(word, self.WORDS)
+            expected = {i: int(d) for i, d in enumerate(distances) if 0 < d <= 2}
+            ids, found = self.index.neighbors_of(word_id)
+            self.assertEqual(dict(zip(ids.tolist(), found.tolist())), expected, word)
+
+    def test_nearest_filters_by_candidates(self):
+        """Test that only remaining candidates are returned, closest first."""
+        crane = self.WORDS.index("CRANE")
+        candidates = [self.WORDS.index(w) for w in ("GRATE", "TRACE", "ZZZZZ")]
+        nearest = self.index.nearest(crane, sorted(candidates))
+        self.assertEqual([self.WORDS[i] for i in nearest], ["GRATE", "TRACE"])
+        self.assertIsNone(self.index.nearest(crane, [self.WORDS.index("ZZZZZ")]))
+
+    def test_background_rebuild_keyed_per_length(self):
+        """Test that a stale index is built off the calling thread and keyed on its own length's words."""
+        ready = threading.Event()
+        indexes = []
+
+        def on_ready(index):
+            indexes.append((index, threading.current_thread()))
+            ready.set()
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                unittest.mock.patch("settings.NeighborIndex.BOOK_DIR", temp_dir):
+            self.addCleanup(settings.NeighborIndex._INDEXES.clear)
+            self.assertIsNone(get_neighbor_index(self.WORDS, 5, on_ready=on_ready))
+            self.assertTrue(ready.wait(10))
+            index, thread = indexes[0]
+            self.assertIsNot(thread, threading.current_thread())
+            self.assertEqual(index.source_hash, words_hash(self.WORDS))
+
+            # Another length's words changing leaves the stored 5-letter index valid.
+            get_neighbor_index(["APPLES", "AMPLES"], 6)
+            settings.NeighborIndex._INDEXES.clear()
+            reloaded = get_neighbor_index(self.WORDS, 5, on_ready=on_ready)
+            self.assertIsNotNone(reloaded)
+            self.assertEqual(reloaded.source_hash, index.source_hash)
+
+    def test_edit_bot_guess_matches_the_scan(self):
+        """Test that the indexed edit bot picks from the same words as get_edit_distance_guess."""
+        state = SolverState.from_words(self.WORDS)
+        state.apply("CRANE", get_pattern_string(colour_set("CRANE", "GRATE", 5)))
+        for guess in ("CRANE", "APPLE", "ZZZZZ"):
+            scanned = {get_edit_distance_guess(state.words, guess, self.WORDS, random.Random(seed))
+                       for seed in range(20)}
+            indexed = {edit_bot_guess(state, guess, self.WORDS, random.Random(seed), self.index)
+                       for seed in range(20)}
+            self.assertEqual(indexed, scanned, guess)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,12 @@ import pygame
 from modes import AiMode, PlayerMode, PveMode
 from settings import DifficultyMenu, SettingsMenu, WordEditor, Leaderboard
 from settings.Constants import COLOR_CORRECT, WIDTH, HEIGHT
+from settings.Dictionary import Dictionary
+from settings.Logic import LIE_STRATEGIES
+from settings.RenderCache import RENDER_CACHE, RenderCache
+from settings.FrameLoop import FrameLoop
+from settings.Compositor import Compositor, merge_rects
+from settings.Profiler import PROFILER
 
 
 class TestVisualsAndLoops(unittest.TestCase):
@@ -27,6 +33,8 @@ class TestVisualsAndLoops(unittest.TestCase):
         self.real_screen = pygame.Surface((WIDTH, HEIGHT))
         self.mock_font = MagicMock()
         self.mock_font.render.return_value = pygame.Surface((10, 10))
+        # Fonts created under a patched SysFont must not leak between tests.
+        RENDER_CACHE.clear()
 
     def tearDown(self):
         """Clean up pygame events."""
@@ -72,7 +80,7 @@ class TestVisualsAndLoops(unittest.TestCase):
     @patch('pygame.draw.rect')
     def test_button_draw_states(self, mock_draw_rect, mock_mouse_pos):
         """Test button hover and draw states."""
-        from settings.Logic import Button
+        from settings.Button import Button
         btn = Button(10, 10, 100, 50, "Test", (100, 100, 100))
         mock_mouse_pos.return_value = (0, 0)
         btn.draw(self.mock_screen)
@@ -94,6 +102,11 @@ class TestVisualsAndLoops(unittest.TestCase):
         PlayerMode.draw_alphabet(self.real_screen, colors)
         self.assertGreater(mock_draw_rect.call_count, 20)
 
+        # Redrawing the same keyboard only blits cached key tiles.
+        mock_draw_rect.reset_mock()
+        PlayerMode.draw_alphabet(self.real_screen, colors)
+        self.assertEqual(mock_draw_rect.call_count, 0)
+
     @patch('pygame.draw.rect')
     @patch('pygame.font.SysFont')
     def test_playermode_draw_grid(self, mock_sysfont, mock_draw_rect):
@@ -103,7 +116,13 @@ class TestVisualsAndLoops(unittest.TestCase):
         mock_sysfont.return_value = mock_font_inst
         guesses = [[('A', 0, 'g'), ('P', 1, 'y'), ('P', 2, 'x'), ('L', 3, 'x'), ('E', 4, 'g')]]
         PlayerMode.draw_grid(self.real_screen, guesses, "PEA", 0, 5, 6)
-        self.assertGreater(mock_draw_rect.call_count, 50)
+        # Identical empty tiles are rendered once and then blitted from the cache.
+        self.assertGreater(mock_draw_rect.call_count, 10)
+        self.assertGreater(RENDER_CACHE.stats()["tile_hit_rate"], 0.5)
+
+        mock_draw_rect.reset_mock()
+        PlayerMode.draw_grid(self.real_screen, guesses, "PEA", 0, 5, 6)
+        self.assertEqual(mock_draw_rect.call_count, 0)
 
     @patch('pygame.draw.rect')
     @patch('pygame.font.SysFont')
@@ -136,15 +155,15 @@ class TestVisualsAndLoops(unittest.TestCase):
 
     @patch('pygame.display.get_surface')
     @patch('settings.JsonStats.save_score')
-    @patch('modes.PlayerMode.load_valid_words')
+    @patch('modes.PlayerMode.get_dictionary')
     @patch('pygame.event.get')
-    @patch('pygame.display.flip')
+    @patch('pygame.display.update')
     @patch('pygame.quit')
-    def test_run_game_winning_scenario(self, _quit, _flip, mock_events, mock_load_words, mock_save,
+    def test_run_game_winning_scenario(self, _quit, _update, mock_events, mock_get_dictionary, mock_save,
                                        mock_get_surface):
         """Test a complete winning game loop."""
         mock_get_surface.return_value = self.real_screen
-        mock_load_words.return_value = ["APPLE"]
+        mock_get_dictionary.return_value = Dictionary(["APPLE"])
         script = [
             [self.make_key_event(pygame.K_a, 'A')],
             [self.make_key_event(pygame.K_p, 'P')],
@@ -156,21 +175,24 @@ class TestVisualsAndLoops(unittest.TestCase):
             [self.make_quit_event()]
         ]
         mock_events.side_effect = script
-        with patch('settings.Logic.Button.is_clicked') as mock_click:
+        with patch('settings.Button.Button.is_clicked') as mock_click:
             mock_click.side_effect = [False, True]
             result = PlayerMode.run_game({"difficulty": "NORMAL"})
         self.assertEqual(result, "HOME")
         mock_save.assert_called_with("Player", 750)
 
     @patch('pygame.display.get_surface')
-    @patch('settings.Logic.load_valid_words')
+    @patch('modes.AiMode.load_decision_tree', return_value=None)
+    @patch('modes.AiMode.get_opening_book', return_value=None)
+    @patch('modes.AiMode.get_dictionary')
     @patch('pygame.event.get')
-    @patch('pygame.display.flip')
+    @patch('pygame.display.update')
     @patch('pygame.quit')
-    def test_run_ai_mode_flow(self, _quit, _flip, mock_events, mock_load_words, mock_get_surface):
+    def test_run_ai_mode_flow(self, _quit, _update, mock_events, mock_get_dictionary, _book, _tree,
+                              mock_get_surface):
         """Test the flow of the AI Solver mode."""
         mock_get_surface.return_value = self.real_screen
-        mock_load_words.return_value = ["APPLE"]
+        mock_get_dictionary.return_value = Dictionary(["APPLE"])
         script = [
             [self.make_key_event(pygame.K_g, 'g')],
             [self.make_key_event(pygame.K_g, 'g')],
@@ -182,7 +204,7 @@ class TestVisualsAndLoops(unittest.TestCase):
             [self.make_quit_event()]
         ]
         mock_events.side_effect = script
-        with patch('settings.Logic.Button.is_clicked') as mock_click:
+        with patch('settings.Button.Button.is_clicked') as mock_click:
             mock_click.side_effect = [False, True]
             result = AiMode.run_ai_mode("NORMAL")
         self.assertEqual(result, "HOME")
@@ -198,20 +220,22 @@ class TestVisualsAndLoops(unittest.TestCase):
         mock_settings.update({"player_name": "Test", "word_length": 5, "max_attempts": 6})
         mock_get_surface.return_value = self.real_screen
         click = MagicMock(type=pygame.MOUSEBUTTONDOWN, pos=(0, 0))
-        mock_events.side_effect = [[click], [click], [click], [click]]
+        mock_events.side_effect = [[click], [click], [click], [click], [click]]
 
-        # Flattened logic for button clicks
-        f1 = [False, False, False, True, False, False, False]
-        f2 = [False, False, False, False, False, True, False]
-        f3 = [False, True, False, False, False, False, False]
-        f4 = [True, False, False, False, False, False, False]
+        # Flattened logic for button clicks (back, edit, 3 lengths, +, -, 3 lie strategies)
+        f1 = [False, False, False, True, False, False, False, False, False, False]
+        f2 = [False, False, False, False, False, True, False, False, False, False]
+        f3 = [False, False, False, False, False, False, False, False, True, False]
+        f4 = [False, True, False, False, False, False, False, False, False, False]
+        f5 = [True, False, False, False, False, False, False, False, False, False]
 
-        with patch('settings.Logic.Button.is_clicked') as mock_btn:
-            mock_btn.side_effect = f1 + f2 + f3 + f4
+        with patch('settings.Button.Button.is_clicked') as mock_btn:
+            mock_btn.side_effect = f1 + f2 + f3 + f4 + f5
             SettingsMenu.settings_menu()
 
         self.assertEqual(mock_settings["word_length"], 6)
         self.assertEqual(mock_settings["max_attempts"], 7)
+        self.assertEqual(mock_settings["lie_strategy"], LIE_STRATEGIES[1])
         mock_run_editor.assert_called_once()
 
     @patch('pygame.event.get')
@@ -222,7 +246,7 @@ class TestVisualsAndLoops(unittest.TestCase):
         mock_get_surface.return_value = self.real_screen
         click = MagicMock(type=pygame.MOUSEBUTTONDOWN, pos=(0, 0))
         mock_events.side_effect = [[click], [self.make_quit_event()]]
-        with patch('settings.Logic.Button.is_clicked') as mock_btn:
+        with patch('settings.Button.Button.is_clicked') as mock_btn:
             mock_btn.side_effect = [True, False, False]
             self.assertEqual(DifficultyMenu.get_difficulty(), "NORMAL")
 
@@ -260,14 +284,14 @@ class TestVisualsAndLoops(unittest.TestCase):
     @patch('settings.JsonStats.load_leaderboard')
     @patch('pygame.event.get')
     @patch('pygame.display.get_surface')
-    @patch('pygame.display.flip')
-    def test_show_leaderboard_data(self, _flip, mock_get_surface, mock_events, mock_load_data):
+    @patch('pygame.display.update')
+    def test_show_leaderboard_data(self, _update, mock_get_surface, mock_events, mock_load_data):
         """Test displaying leaderboard data."""
         mock_get_surface.return_value = self.real_screen
         mock_load_data.return_value = [{'name': 'Winner', 'score': 1000}]
         click_back = MagicMock(type=pygame.MOUSEBUTTONDOWN, pos=(0, 0))
         mock_events.side_effect = [[click_back]]
-        with patch('settings.Logic.Button.is_clicked') as mock_btn_click:
+        with patch('settings.Button.Button.is_clicked') as mock_btn_click:
             mock_btn_click.return_value = True
             Leaderboard.show_leaderboard()
         mock_load_data.assert_called_once()
@@ -285,7 +309,158 @@ class TestVisualsAndLoops(unittest.TestCase):
             guesses=guesses, current_guess="TE",
             word_length=5, max_attempts=6, label="PLAYER"
         )
-        self.assertGreater(mock_draw_rect.call_count, 50)
+        self.assertGreater(mock_draw_rect.call_count, 10)
+        self.assertGreater(RENDER_CACHE.stats()["tile_hit_rate"], 0.5)
+
+
+
+class TestRenderCache(unittest.TestCase):
+    """Tests for the shared glyph and tile surface cache."""
+
+    def setUp(self):
+        pygame.init()
+        self.font = MagicMock()
+        self.font.render.return_value = pygame.Surface((10, 10))
+
+    def test_text_surfaces_are_reused(self):
+        """Test that identical text is rendered once and then served from the cache."""
+        cache = RenderCache()
+        first = cache.text("HELLO", self.font, (255, 255, 255))
+        self.assertIs(cache.text("HELLO", self.font, (255, 255, 255)), first)
+        cache.text("HELLO", self.font, (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 2)
+        self.assertAlmostEqual(cache.stats()["text_hit_rate"], 1 / 3)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used tile is evicted at capacity."""
+        cache = RenderCache(tile_capacity=2)
+        a = cache.tile("A", 40, (0, 0, 0), (9, 9, 9), font=self.font)
+        cache.tile("B", 40, (0, 0, 0), (9, 9, 9), font=self.font)
+        self.assertIs(cache.tile("A", 40, (0, 0, 0), (9, 9, 9), font=self.font), a)
+        cache.tile("C", 40, (0, 0, 0), (9, 9, 9), font=self.font)
+        keys = [key[0] for key in cache.tiles.items]
+        self.assertEqual(keys, ["A", "C"])
+
+    def test_frame_timing(self):
+        """Test that end_frame records the time since begin_frame."""
+        cache = RenderCache()
+        cache.end_frame()
+        self.assertEqual(cache.frame_ms, 0.0)
+        cache.begin_frame()
+        cache.end_frame(pygame.Surface((10, 10)))
+        self.assertGreaterEqual(cache.frame_ms, 0.0)
+        self.assertGreaterEqual(cache.stats()["average_frame_ms"], 0.0)
+
+
+
+class TestFrameLoop(unittest.TestCase):
+    """Tests for the shared frame pacing driver."""
+
+    def setUp(self):
+        pygame.init()
+
+    @patch('pygame.event.get', return_value=[])
+    @patch('pygame.event.wait')
+    def test_idle_blocks_on_event_wait(self, mock_wait, _get):
+        """Test that a static screen waits for input instead of spinning."""
+        mock_wait.return_value = pygame.event.Event(pygame.NOEVENT)
+        frame_loop = FrameLoop(idle_wait_ms=5)
+        frame_loop.events()  # First frame always draws.
+        self.assertFalse(mock_wait.called)
+        self.assertEqual(frame_loop.events(), [])
+        mock_wait.assert_called_once_with(5)
+        self.assertTrue(frame_loop.idle)
+
+    @patch('pygame.event.get', return_value=[])
+    @patch('pygame.event.wait')
+    def test_active_and_input_frames_are_paced(self, mock_wait, _get):
+        """Test that animations and the frame after input skip the idle wait."""
+        key = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode='a')
+        mock_wait.return_value = key
+        frame_loop = FrameLoop(fps=1000, idle_wait_ms=5)
+        frame_loop.events(active=True)
+        frame_loop.events(active=True)
+        self.assertFalse(mock_wait.called)
+        self.assertEqual(frame_loop.events(), [key])
+        frame_loop.events()
+        self.assertEqual(mock_wait.call_count, 1)
+
+    @patch('pygame.event.wait')
+    def test_profiler_hotkey_is_consumed(self, _wait):
+        """Test that F3 toggles the profiler without reaching the mode's event loop."""
+        frame_loop = FrameLoop(fps=1000)
+        enabled = PROFILER.enabled
+        keys = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3, unicode=''),
+                pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode='a')]
+        try:
+            with patch('pygame.event.get', return_value=keys):
+                events = frame_loop.events(active=True)
+            self.assertEqual([e.key for e in events], [pygame.K_a])
+            self.assertNotEqual(PROFILER.enabled, enabled)
+        finally:
+            PROFILER.enabled = enabled
+
+    def test_reports_fps_and_cpu(self):
+        """Test that FPS and CPU per frame are measured over a window."""
+        frame_loop = FrameLoop(fps=1000)
+        frame_loop._window_start -= 1.0
+        frame_loop.events(active=True)
+        stats = frame_loop.stats()
+        self.assertGreater(stats["fps"], 0)
+        self.assertGreaterEqual(stats["cpu_ms_per_frame"], 0)
+
+
+
+class TestCompositor(unittest.TestCase):
+    """Tests for the dirty-rectangle layered compositor."""
+
+    def setUp(self):
+        pygame.init()
+        self.screen = pygame.Surface((200, 100))
+        self.draws = []
+
+    def fill(self, rect, color):
+        def draw(surface):
+            self.draws.append(color)
+            surface.fill(color, rect)
+        return draw
+
+    @patch('pygame.display.update')
+    def test_only_changed_layers_are_pushed(self, mock_update):
+        """Test that unchanged frames push nothing and a changed layer pushes its rect."""
+        compositor = Compositor(background=(0, 0, 0))
+        for _ in range(2):
+            compositor.layer("a", (0, 0, 50, 50), 1, self.fill((0, 0, 50, 50), (255, 0, 0)), self.screen)
+            compositor.layer("b", (100, 0, 50, 50), 1, self.fill((100, 0, 50, 50), (0, 255, 0)), self.screen)
+            compositor.present(self.screen)
+        self.assertEqual(mock_update.call_count, 1)  # First frame: whole screen.
+        self.assertEqual(len(self.draws), 2)
+
+        compositor.layer("a", (0, 0, 50, 50), 1, self.fill((0, 0, 50, 50), (255, 0, 0)), self.screen)
+        compositor.layer("b", (100, 0, 50, 50), 2, self.fill((100, 0, 50, 50), (0, 0, 255)), self.screen)
+        rects = compositor.present(self.screen)
+        self.assertEqual(rects, [pygame.Rect(100, 0, 50, 50)])
+        self.assertEqual(self.screen.get_at((120, 20))[:3], (0, 0, 255))
+        self.assertEqual(self.screen.get_at((20, 20))[:3], (255, 0, 0))
+
+    @patch('pygame.display.update')
+    def test_layers_stack_and_removed_layers_clear(self, _update):
+        """Test that later layers draw on top and a dropped layer reveals what was below."""
+        compositor = Compositor(background=(1, 2, 3))
+        compositor.layer("base", (0, 0, 200, 100), 1, self.fill((0, 0, 200, 100), (255, 0, 0)), self.screen)
+        compositor.layer("top", (10, 10, 20, 20), 1, self.fill((10, 10, 20, 20), (0, 255, 0)), self.screen)
+        compositor.present(self.screen)
+        self.assertEqual(self.screen.get_at((15, 15))[:3], (0, 255, 0))
+
+        compositor.layer("base", (0, 0, 200, 100), 1, self.fill((0, 0, 200, 100), (255, 0, 0)), self.screen)
+        compositor.present(self.screen)
+        self.assertEqual(self.screen.get_at((15, 15))[:3], (255, 0, 0))
+
+    def test_merge_rects(self):
+        """Test that overlapping dirty rects are pushed once."""
+        merged = merge_rects([pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10),
+                              pygame.Rect(50, 50, 5, 5)])
+        self.assertEqual(sorted(map(tuple, merged)), [(0, 0, 15, 15), (50, 50, 5, 5)])
 
 
 if __name__ == '__main__':
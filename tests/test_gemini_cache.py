@@ -0,0 +1,120 @@
+"""
+Unit tests for the two-tier Gemini reply cache.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from modes import PveMode
+from settings.FakeGemini import FakeGeminiClient
+from settings.GeminiCache import GeminiCache, fingerprint
+
+
+class TestGeminiCache(unittest.TestCase):
+    """Tests for the two-tier Gemini reply cache."""
+
+    HISTORY = [[('C', 0, 'x'), ('R', 1, 'x'), ('A', 2, 'y'), ('N', 3, 'x'), ('E', 4, 'g')]]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "cache.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_fingerprint_is_normalized(self):
+        """Test that letter case does not change the key."""
+        self.assertEqual(fingerprint("m", 5, [("crane", "XXYXG")]), fingerprint("m", 5, [("CRANE", "xxyxg")]))
+        self.assertNotEqual(fingerprint("m", 5, []), fingerprint("m", 6, []))
+
+    def test_memory_then_disk_hits(self):
+        """Test that replies survive in memory and on disk, with counters."""
+        cache = GeminiCache(self.path, memory_size=1)
+        cache.put("a", "apple")
+        cache.put("b", "crane")
+        self.assertEqual(cache.get("b"), "CRANE")
+        self.assertEqual(cache.get("a"), "APPLE")
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual((cache.memory_hits, cache.disk_hits, cache.misses), (1, 1, 1))
+
+        reloaded = GeminiCache(self.path)
+        self.assertEqual(reloaded.get("a"), "APPLE")
+        self.assertEqual(reloaded.stats()["disk_hits"], 1)
+
+    def test_disk_size_eviction(self):
+        """Test that the oldest entries are evicted to keep the file small."""
+        cache = GeminiCache(self.path, max_disk_bytes=200)
+        for i in range(20):
+            cache.put(f"key-{i}", "SLATE")
+        self.assertLessEqual(os.path.getsize(self.path), 200)
+        reloaded = GeminiCache(self.path)
+        self.assertEqual(reloaded.get("key-19"), "SLATE")
+        self.assertIsNone(reloaded.get("key-0"))
+
+    def test_hits_keep_their_recency_on_disk(self):
+        """Test that a hit entry outlives newer ones after a restart."""
+        cache = GeminiCache(self.path, memory_size=1, max_disk_bytes=1000, flush_every=1)
+        for i in range(3):
+            cache.put(f"key-{i}", "SLATE")
+        self.assertEqual(cache.get("key-0"), "SLATE")
+
+        reloaded = GeminiCache(self.path, max_disk_bytes=100)
+        reloaded.put("key-3", "SLATE")
+        self.assertEqual(reloaded.get("key-0"), "SLATE")
+        self.assertIsNone(reloaded.get("key-1"))
+
+    def test_flush_writes_batched_hits(self):
+        """Test that hits below the batch size are written by flush."""
+        cache = GeminiCache(self.path, memory_size=1)
+        cache.put("a", "apple")
+        cache.put("b", "crane")
+        cache.get("a")
+        self.assertEqual(next(iter(GeminiCache(self.path)._load_disk())), "a")
+        cache.flush()
+        self.assertEqual(next(iter(GeminiCache(self.path)._load_disk())), "b")
+
+    def test_flags_are_bounded(self):
+        """Test that the oldest flags are dropped to keep the file within its budget."""
+        cache = GeminiCache(self.path, max_disk_bytes=200)
+        for i in range(20):
+            cache.flag(f"key-{i}", "QWXYZ")
+        self.assertLessEqual(os.path.getsize(self.path), 200)
+        reloaded = GeminiCache(self.path)
+        self.assertTrue(reloaded.is_flagged("key-19", "QWXYZ"))
+        self.assertFalse(reloaded.is_flagged("key-0", "QWXYZ"))
+
+    def test_flagged_reply_is_never_served(self):
+        """Test that a flagged reply is dropped and refused from then on."""
+        cache = GeminiCache(self.path)
+        cache.put("a", "QWXYZ")
+        cache.flag("a", "QWXYZ")
+        cache.put("a", "QWXYZ")
+        self.assertIsNone(cache.get("a"))
+        self.assertTrue(GeminiCache(self.path).is_flagged("a", "qwxyz"))
+
+    def test_gemini_guess_uses_cache(self):
+        """Test that a repeated position costs no second request and non-words are dropped."""
+        cache = GeminiCache(self.path)
+        client = FakeGeminiClient(reply="SLATE")
+        with patch('modes.PveMode.CLIENT', client):
+            self.assertEqual(PveMode.get_gemini_guess(self.HISTORY, 5, cache, {"SLATE"}), "SLATE")
+            self.assertEqual(PveMode.get_gemini_guess(self.HISTORY, 5, cache, {"SLATE"}), "SLATE")
+            self.assertEqual(len(client.calls), 1)
+
+            client.reply = "QWXYZ"
+            self.assertIsNone(PveMode.get_gemini_guess([], 5, cache, {"SLATE"}))
+            self.assertIsNone(cache.get(fingerprint(PveMode.cache_model(client), 5, [])))
+
+    def test_fake_replies_are_kept_apart(self):
+        """Test that replies from the offline fake are never served as Gemini's."""
+        cache = GeminiCache(self.path)
+        with patch('modes.PveMode.CLIENT', FakeGeminiClient(reply="SLATE")):
+            self.assertEqual(PveMode.get_gemini_guess(self.HISTORY, 5, cache), "SLATE")
+        moves = [("CRANE", "xxyxg")]
+        self.assertIsNone(cache.get(fingerprint(PveMode.GEMINI_MODEL, 5, moves)))
+        self.assertEqual(cache.get(fingerprint(PveMode.cache_model(FakeGeminiClient()), 5, moves)), "SLATE")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,27 @@
 """
 Unit tests for game logic, data handling, and algorithmic functions.
 """
+import os
+import random
+import sys
 import unittest
 from unittest.mock import patch, mock_open, MagicMock, call
 
+import numpy as np
+
 from settings import JsonStats, WordEditor, Logic
 from modes import PlayerMode, PveMode
 from settings.Logic import (
     colour_set, filter_words, get_best_word, lie_detector,
-    levenshtein_distance, triplets_maker, get_pattern_string,
+    levenshtein_distance, levenshtein_distances, nearest_words, triplets_maker, get_pattern_string,
     colour_value_helper, get_best_lie, load_valid_words,
-    init_extreme_candidates, remove_useless_words, Button
+    init_extreme_candidates, remove_useless_words,
+    pattern_to_code, code_to_pattern, feedback_row, FeedbackMatrix,
+    get_feedback_matrix, score_guesses, SCORING_METRICS,
+    Constraint, satisfies_hints, LIE_STRATEGIES, partition, partitions, partition_codes
 )
+from settings.Button import Button
+from settings.FakeGemini import FakeGeminiClient
 
 
 class TestFileOperationsAndData(unittest.TestCase):
@@ -81,6 +91,19 @@ class TestFileOperationsAndData(unittest.TestCase):
             key = PveMode.get_api_key()
             self.assertIsNone(key)
 
+    @patch('modes.PveMode._CLIENT_TRIED', False)
+    @patch('modes.PveMode.CLIENT', None)
+    def test_gemini_client_is_lazy(self):
+        """Test that the SDK is not imported without a key and the fake env var is honored."""
+        with patch.dict(os.environ, {}, clear=False), patch('modes.PveMode.get_api_key', return_value=None):
+            os.environ.pop("WORDLE_FAKE_GEMINI", None)
+            self.assertIsNone(PveMode.get_client())
+            self.assertNotIn("google.genai", sys.modules)
+
+        with patch.object(PveMode, "_CLIENT_TRIED", False), \
+                patch.dict(os.environ, {"WORDLE_FAKE_GEMINI": "0"}):
+            self.assertIsInstance(PveMode.get_client(), FakeGeminiClient)
+
     # --- 4. LOGIC EDGE CASES (Complex Filtering) ---
 
     def test_filter_words_yellow_conflict(self):
@@ -101,6 +124,13 @@ class TestFileOperationsAndData(unittest.TestCase):
 class TestWordleLogic(unittest.TestCase):
     """Tests for the core Wordle game logic (coloring, patterns, etc.)."""
 
+    def use_dictionary(self, words):
+        """Swap in a small dictionary for one test and return its feedback matrix."""
+        Logic.use_dictionary(words)
+        self.addCleanup(Logic._FEEDBACK_MATRICES.clear)
+        self.addCleanup(Logic._DICTIONARY_WORDS.clear)
+        return Logic.dictionary_matrix(len(words[0]))
+
     def test_colour_set_exact_match(self):
         """Test generation of Green patterns."""
         res = colour_set("APPLE", "APPLE", 5)
@@ -133,12 +163,98 @@ class TestWordleLogic(unittest.TestCase):
         filtered = filter_words("gxxxx", "APPLE", words)
         self.assertIn("ACORN", filtered)
 
+    def test_constraint_duplicate_letters(self):
+        """Test count bounds derived from a duplicate letter marked yellow and grey."""
+        constraint = Constraint.from_history([("SPEED", "xxyxx")], 5)
+        e_slot = ord("E") - ord("A")
+        self.assertEqual(constraint.min_counts[e_slot], 1)
+        self.assertEqual(constraint.max_counts[e_slot], 1)
+        self.assertTrue(constraint.allows("CRANE"))
+        self.assertFalse(constraint.allows("EERIE"))
+        self.assertFalse(constraint.allows("ABBEY"))
+
+    def test_satisfies_hints(self):
+        """Test checking a guess against every previous hint."""
+        history = [("CRANE", "xxyxx"), ("BALMS", "xgxxx")]
+        self.assertTrue(satisfies_hints("PATIO", history))
+        self.assertFalse(satisfies_hints("CATCH", history))
+        self.assertFalse(satisfies_hints("BALMS", history))
+
     def test_remove_useless_words(self):
         """Test optimization of word lists."""
         words = ["APPLE", "ZEBRA"]
         res = remove_useless_words("APPLE", "ZEBRA", words)
         self.assertIn("ZEBRA", res)
 
+    def test_pattern_code_round_trip(self):
+        """Test encoding patterns as base-3 feedback codes."""
+        self.assertEqual(pattern_to_code("ggggg"), 242)
+        self.assertEqual(pattern_to_code("xxxxx"), 0)
+        self.assertEqual(code_to_pattern(pattern_to_code("gyxgy"), 5), "gyxgy")
+
+    def test_feedback_matrix_matches_colour_set(self):
+        """Test that the matrix agrees with colour_set, including duplicate letters."""
+        words = ["SPEED", "EERIE", "AABBB", "ABBAA", "APPLE", "LLAMA", "ERROR"]
+        matrix = FeedbackMatrix(words)
+        ids = matrix.ids(words)
+        codes = matrix.submatrix(ids, ids)
+        for i, guess in enumerate(words):
+            for j, secret in enumerate(words):
+                expected = get_pattern_string(colour_set(guess, secret, 5))
+                self.assertEqual(code_to_pattern(int(codes[i, j]), 5), expected)
+
+    def test_uncached_matrix_matches_cached(self):
+        """Test that rows computed on demand agree with the stored ones, in blocks too."""
+        words = ["SPEED", "EERIE", "AABBB", "ABBAA", "APPLE", "LLAMA", "ERROR"]
+        cached = FeedbackMatrix(words)
+        uncached = FeedbackMatrix(words, cache_rows=False)
+        self.assertIsNone(uncached.codes)
+        guesses, answers = np.array([6, 0, 2, 0]), np.array([3, 1, 1])
+        with patch('settings.Logic.CHUNK_CELLS', 2):
+            for answer_ids in (answers, np.arange(len(words))):
+                self.assertEqual(uncached.submatrix(guesses, answer_ids).tolist(),
+                                 cached.submatrix(guesses, answer_ids).tolist())
+        for metric in SCORING_METRICS:
+            self.assertEqual(Logic.score_candidate_ids(uncached, answers, metric).tolist(),
+                             Logic.score_candidate_ids(cached, answers, metric).tolist())
+
+    def test_feedback_row_unknown_guess(self):
+        """Test scoring a guess that is not part of the word list."""
+        codes = feedback_row("ABBEY", ["BABES", "KEBAB"])
+        self.assertEqual(code_to_pattern(int(codes[0]), 5), "yyggx")
+        self.assertEqual(code_to_pattern(int(codes[1]), 5), "yygyx")
+
+    def test_partition(self):
+        """Test that candidates are bucketed by the feedback the guess gives them."""
+        words = ["CRANE", "TRACE", "GRATE", "CRATE", "SLATE", "PLANE", "BLAME", "FLAME"]
+        split = partition("SLATE", words)
+        self.assertEqual(split.sizes.sum(), len(words))
+        for bucket, group in enumerate(split.split(words)):
+            patterns = {get_pattern_string(colour_set("SLATE", word, 5)) for word in group}
+            self.assertEqual(patterns, {code_to_pattern(int(split.codes[bucket]), 5)})
+        self.assertEqual(split.sizes[split.bucket_of(pattern_to_code("xggxg"))], 3)
+        self.assertEqual(split.bucket_of(pattern_to_code("yyyyy")), -1)
+
+    def test_bucket_of_skips_empty_buckets(self):
+        """Test that a code no candidate gives is missing even when every code has a bucket."""
+        split = partition_codes(np.array([0, 0, 2]), 3)
+        self.assertEqual(split.codes.tolist(), [0, 1, 2])
+        self.assertEqual((split.bucket_of(0), split.bucket_of(1), split.bucket_of(2)), (0, -1, 2))
+        batched = partition_codes(np.array([[0, 0, 2], [0, 2, 2]]), 3)
+        self.assertEqual((batched.bucket_of(1), batched.bucket_of(2)), (-1, 2))
+
+    def test_partitions_batched(self):
+        """Test that the batched partition agrees with one guess at a time."""
+        words = ["CRANE", "TRACE", "GRATE", "CRATE", "SLATE", "PLANE", "BLAME", "FLAME"]
+        guesses = ["SLATE", "CRANE", "QUEUE"]
+        batch = partitions(guesses, words)
+        self.assertEqual(batch.buckets.shape, (3, len(words)))
+        for row, guess in enumerate(guesses):
+            single = partition(guess, words)
+            self.assertEqual(batch.codes[batch.buckets[row]].tolist(),
+                             single.codes[single.buckets].tolist())
+            self.assertEqual(sorted(batch.sizes[row][batch.sizes[row] > 0]), sorted(single.sizes))
+
     def test_triplets_maker(self):
         """Test helper for creating logic triplets."""
         t = triplets_maker("gx", "HI")
@@ -148,6 +264,22 @@ class TestWordleLogic(unittest.TestCase):
         """Test Levenshtein distance calculation."""
         self.assertEqual(levenshtein_distance("kitten", "sitting"), 3)
 
+    def test_levenshtein_distances_batched(self):
+        """Test that the batched kernel matches the pairwise distance, with and without a cutoff."""
+        words = ["SITTEN", "KITTEN", "BITTER", "SPRING", "MITTEN", "KNIGHT"]
+        exact = [levenshtein_distance(word, "SITTING") for word in words]
+        self.assertEqual(list(levenshtein_distances("SITTING", words)), exact)
+        for cutoff in range(4):
+            self.assertEqual(list(levenshtein_distances("SITTING", words, cutoff)),
+                             [min(d, cutoff + 1) for d in exact])
+
+    def test_nearest_words(self):
+        """Test that the closest words are returned in list order."""
+        words = ["CRANE", "CRATE", "GRATE", "TRACE", "BRINE"]
+        self.assertEqual(nearest_words("GRACE", words), ["GRATE", "TRACE"])
+        self.assertEqual(nearest_words("CRATE", words), ["CRATE"])
+        self.assertEqual(nearest_words("CRATE", []), [])
+
     def test_colour_value_helper(self):
         """Test heuristic value calculation for colors."""
         triplets = [('A', 0, 'g'), ('B', 1, 'y'), ('C', 2, 'x')]
@@ -159,12 +291,71 @@ class TestWordleLogic(unittest.TestCase):
         best = get_best_word(candidates)
         self.assertIn(best, candidates)
 
+    def test_get_best_word_uses_whole_dictionary(self):
+        """Test that a non-candidate guess is picked when it splits the candidates best."""
+        candidates = ["BILLS", "DILLS", "FILLS", "GILLS", "HILLS"]
+        self.use_dictionary(candidates + ["BDFGH", "ZZZZZ"])
+        for metric in SCORING_METRICS:
+            self.assertEqual(get_best_word(candidates, metric), "BDFGH")
+
+    def test_foreign_list_gets_a_private_matrix(self):
+        """Test that a list outside the dictionary never replaces the shared matrix."""
+        shared = self.use_dictionary(["BILLS", "DILLS", "FILLS", "BDFGH", "ZZZZZ"])
+        subset, ids = get_feedback_matrix(["DILLS", "FILLS"])
+        self.assertIs(subset, shared)
+        self.assertEqual(ids.tolist(), [1, 2])
+        foreign, ids = get_feedback_matrix(["DILLS", "QUACK"])
+        self.assertIsNot(foreign, shared)
+        self.assertIsNone(foreign.codes)
+        self.assertEqual(foreign.words, ["DILLS", "QUACK"])
+        self.assertIs(get_feedback_matrix(["BILLS"])[0], shared)
+        self.assertEqual(get_best_word(["BILLS", "DILLS", "FILLS"]), "BDFGH")
+
+    def test_score_guesses_metrics(self):
+        """Test that each metric rates a perfect splitter above a useless guess."""
+        candidates = ["BILLS", "DILLS", "FILLS"]
+        matrix = self.use_dictionary(candidates + ["BDFGH", "ZZZZZ"])
+        for metric in SCORING_METRICS:
+            _, scores = score_guesses(candidates, metric)
+            self.assertGreater(scores[matrix.index["BDFGH"]], scores[matrix.index["ZZZZZ"]])
+        with self.assertRaises(ValueError):
+            score_guesses(candidates, "unknown")
+
     def test_get_best_lie(self):
         """Test generating a lie for Ai Mode."""
         pool = ["APPLE", "ABUSE"]
         lie = get_best_lie("APPLE", pool, 5)
         self.assertTrue(isinstance(lie, list))
 
+    def test_lie_strategies(self):
+        """Test that every lie strategy hides the truth and the misleading one keeps the most words."""
+        pool = ["CRANE", "TRACE", "GRATE", "CRATE", "SLATE", "PLANE", "BLAME", "FLAME", "SHAME"]
+        truth = get_pattern_string(colour_set("SLATE", "CRANE", 5))
+        history = [("BLAME", get_pattern_string(colour_set("BLAME", "CRANE", 5)))]
+        for strategy in LIE_STRATEGIES:
+            for seed in range(5):
+                lie = get_best_lie("SLATE", pool, 5, strategy, "CRANE", history, random.Random(seed))
+                pattern = get_pattern_string(lie)
+                self.assertNotIn(pattern, (truth, "ggggg"), strategy)
+                if strategy == "plausible":
+                    kept = [w for w in filter_words(pattern, "SLATE", pool) if satisfies_hints(w, history)]
+                    self.assertTrue(kept, pattern)
+        lie = get_best_lie("SLATE", pool, 5, "misleading", "CRANE", rng=random.Random(0))
+        # 'xggxg' (PLANE, BLAME, FLAME) is the largest bucket.
+        self.assertEqual(get_pattern_string(lie), "xggxg")
+        with self.assertRaises(ValueError):
+            get_best_lie("SLATE", pool, 5, "honest")
+
+    def test_lie_fallback_never_tells_the_truth(self):
+        """Test that with no window or usable pool word the lie is still neither the truth nor a win."""
+        # APPLE and AMPLE score 12 and 15 against APPLE: nothing falls in the 3-7 window.
+        pool = ["APPLE", "AMPLE"]
+        truth = get_pattern_string(colour_set("APPLE", "AMPLE", 5))
+        for strategy in LIE_STRATEGIES:
+            for seed in range(20):
+                lie = get_best_lie("APPLE", pool, 5, strategy, "AMPLE", rng=random.Random(seed))
+                self.assertNotIn(get_pattern_string(lie), (truth, "ggggg"), strategy)
+
     def test_lie_detector(self):
         """Test logic to detect inconsistencies."""
         pool = {"APPLE": 0}
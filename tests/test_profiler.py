@@ -0,0 +1,94 @@
+"""
+Unit tests for the span profiler (no pygame involved).
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from settings.Profiler import Profiler, PROFILER, TURN_TRACK
+from settings.Engine import SolverEngine, FEEDBACK, RESOLVE
+
+WORDS = ["APPLE", "CRANE", "SLATE", "PLANE", "GRAPE", "TRACE"]
+
+
+class TestProfiler(unittest.TestCase):
+    """Tests for spans, frame phases and the Chrome trace export."""
+
+    def setUp(self):
+        self.profiler = Profiler()
+
+    def test_disabled_records_nothing(self):
+        """Test that a disabled profiler only calls through."""
+        traced = self.profiler.traced(category="test")(lambda x: x * 2)
+        self.assertEqual(traced(4), 8)
+        with self.profiler.span("block"):
+            pass
+        self.profiler.begin_frame()
+        self.profiler.end_frame()
+        self.assertEqual(len(self.profiler.spans), 0)
+        self.assertEqual(len(self.profiler.frames), 0)
+
+    def test_traced_calls_and_threads(self):
+        """Test that traced calls are recorded with their thread and latest duration."""
+        self.profiler.toggle()
+
+        @self.profiler.traced(category="solver")
+        def work():
+            time.sleep(0.002)
+            return "done"
+
+        self.assertEqual(work(), "done")
+        thread = threading.Thread(target=work, name="solver")
+        thread.start()
+        thread.join()
+        self.assertEqual([s.name for s in self.profiler.spans], ["work"] * 2)
+        self.assertNotEqual(self.profiler.spans[0].thread, self.profiler.spans[1].thread)
+        self.assertGreaterEqual(self.profiler.latest["work"], 2.0)
+
+    def test_frame_phases(self):
+        """Test that a frame is split into event handling and rendering."""
+        self.profiler.toggle()
+        self.profiler.begin_frame()
+        self.profiler.begin_render()
+        self.profiler.begin_render()
+        self.profiler.end_frame()
+        self.assertEqual([s.name for s in self.profiler.spans], ["events", "render"])
+        self.assertEqual(len(self.profiler.frames), 1)
+
+    def test_chrome_trace_export(self):
+        """Test the trace-event document written by export."""
+        self.profiler.toggle()
+        with self.profiler.span("block", "draw"):
+            pass
+        self.profiler.record("solver turn", "turn", time.perf_counter() - 0.01)
+        with tempfile.TemporaryDirectory() as folder:
+            path = self.profiler.export(os.path.join(folder, "trace.json"))
+            with open(path, "r", encoding="utf-8") as f:
+                trace = json.load(f)
+        spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        self.assertEqual([e["name"] for e in spans], ["block", "solver turn"])
+        self.assertEqual(spans[1]["tid"], TURN_TRACK)
+        self.assertGreaterEqual(spans[1]["dur"], 10000)
+        names = {e["args"]["name"] for e in trace["traceEvents"] if e["ph"] == "M"}
+        self.assertIn("turns", names)
+
+    def test_solver_turn_latency(self):
+        """Test that the AI Solver reports the latency of a turn from submit to resolve."""
+        enabled = PROFILER.enabled
+        PROFILER.enabled = True
+        try:
+            PROFILER.latest.pop("solver turn", None)
+            engine = SolverEngine(WORDS)
+            engine.step((FEEDBACK, "xxxxx"))
+            engine.step((RESOLVE, None))
+            self.assertIn("solver turn", PROFILER.latest)
+        finally:
+            PROFILER.enabled = enabled
+            PROFILER.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,322 @@
+"""
+Unit tests for the incremental solver state and the engines built on it.
+"""
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from settings import Logic, OpeningBook, DecisionTree
+from settings.Logic import colour_set, get_pattern_string, Cancelled
+from settings.Solver import SolverState, ExtremeState
+from settings.Worker import SolverWorker
+
+WORDS = ["APPLE", "ANGLE", "ADDLE", "CRANE", "SLATE", "BILLS", "HILLS"]
+
+
+def setUpModule():
+    """Makes WORDS the dictionary, so the solvers guess from it alone."""
+    Logic.use_dictionary(WORDS)
+
+
+def tearDownModule():
+    """Goes back to the word file's dictionary."""
+    Logic._DICTIONARY_WORDS.clear()
+    Logic._FEEDBACK_MATRICES.clear()
+
+
+class TestSolverState(unittest.TestCase):
+    """Tests for applying, undoing and cloning feedback steps."""
+
+    def test_apply_narrows_candidates(self):
+        """Test that feedback filters the candidate ids."""
+        state = SolverState.from_words(WORDS)
+        state.apply("APPLE", "gxxgg")
+        self.assertEqual(state.words, ["ANGLE", "ADDLE"])
+        self.assertEqual(state.history, [("APPLE", "gxxgg")])
+
+    def test_undo_and_reset(self):
+        """Test that undo restores the previous step and reset the first."""
+        state = SolverState.from_words(WORDS)
+        state.apply("APPLE", "gxxgg")
+        state.apply("ANGLE", "gxxgg")
+        self.assertEqual(state.words, ["ADDLE"])
+        self.assertTrue(state.undo())
+        self.assertEqual(len(state), 2)
+        state.reset()
+        self.assertEqual(len(state), len(WORDS))
+        self.assertFalse(state.undo())
+
+    def test_clone_is_independent(self):
+        """Test that a clone can move on without touching the original."""
+        state = SolverState.from_words(WORDS)
+        copy = state.clone()
+        copy.apply("BILLS", "xgggg")
+        self.assertEqual(copy.words, ["HILLS"])
+        self.assertEqual(len(state), len(WORDS))
+        self.assertIs(copy.matrix, state.matrix)
+
+    def test_best_guess_is_candidate_when_two_left(self):
+        """Test the hint when only two words remain."""
+        state = SolverState.from_words(WORDS)
+        state.apply("BILLS", "xgggg")
+        self.assertEqual(state.best_guess(), "HILLS")
+
+
+class TestExtremeState(unittest.TestCase):
+    """Tests for the lie-tolerant EXTREME engine."""
+
+    def test_one_lie_keeps_contradicting_words(self):
+        """Test that a word contradicting one feedback survives a budget of one."""
+        state = ExtremeState.from_words(WORDS, lie_budget=1)
+        state.apply("APPLE", "xxxxx")
+        self.assertIn("APPLE", state.words)
+        state.apply("APPLE", "xxxxx")
+        self.assertNotIn("APPLE", state.words)
+
+    def test_lie_budget_zero_matches_exact_feedback(self):
+        """Test that without lies only exactly matching words remain."""
+        state = ExtremeState.from_words(WORDS, lie_budget=0)
+        state.apply("BILLS", "xgggg")
+        self.assertEqual(state.words, ["HILLS"])
+
+    def test_likely_lie_turn(self):
+        """Test that the engine blames the turn that contradicts the rest."""
+        state = ExtremeState.from_words(WORDS, lie_budget=1)
+        state.apply("BILLS", "xgggg")
+        self.assertIsNone(state.likely_lie_turn())
+
+        state = ExtremeState.from_words(WORDS, lie_budget=1)
+        state.apply("CRANE", "ggggg")   # the lie: the answer is HILLS
+        state.apply("BILLS", "xgggg")
+        state.apply("SLATE", "yyxxx")
+        self.assertEqual(state.words, ["HILLS"])
+        self.assertEqual(state.likely_lie_turn(), 0)
+
+    def test_best_guess_without_lies_matches_solver(self):
+        """Test that lie-aware scoring reduces to normal scoring once no lie is left."""
+        state = ExtremeState.from_words(WORDS, lie_budget=0)
+        self.assertEqual(state.best_guess(), SolverState.from_words(WORDS).best_guess())
+
+    def test_best_guess_with_lies(self):
+        """Test that lie-aware guesses are dictionary words and stable when sampled."""
+        state = ExtremeState.from_words(WORDS, lie_budget=1)
+        state.apply("SLATE", "xxxxx")
+        for metric in ("entropy", "expected", "worst"):
+            self.assertIn(state.best_guess(metric), WORDS)
+
+        with patch.object(ExtremeState, "SAMPLE_LIMIT", 3):
+            self.assertEqual(state.best_guess(), state.best_guess())
+
+    def test_clone_keeps_error_counts(self):
+        """Test that clones carry their own error vectors."""
+        state = ExtremeState.from_words(WORDS, lie_budget=2)
+        copy = state.clone()
+        copy.apply("APPLE", "xxxxx")
+        self.assertEqual(int(state.errors.sum()), 0)
+        self.assertEqual(copy.lie_budget, 2)
+
+
+class TestOpeningBook(unittest.TestCase):
+    """Tests for building, storing and refreshing the opening book."""
+
+    def setUp(self):
+        """Use a temporary directory for the books."""
+        self.tmp = tempfile.TemporaryDirectory()
+        OpeningBook._BOOKS.clear()
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        OpeningBook._BOOKS.clear()
+        self.tmp.cleanup()
+
+    def test_replies_match_live_solver(self):
+        """Test that each stored reply equals the live best guess for its bucket."""
+        book = OpeningBook.build_opening_book(WORDS, "hash")
+        self.assertIn(book.opener, WORDS)
+        for pattern, reply in book.replies.items():
+            state = SolverState.from_words(WORDS)
+            state.apply(book.opener, pattern)
+            self.assertEqual(reply, state.best_guess())
+
+    def test_book_round_trip_and_rebuild(self):
+        """Test that the book is saved, reloaded and rebuilt when its word list changes."""
+        with patch("settings.OpeningBook.BOOK_DIR", self.tmp.name):
+            book = OpeningBook.get_opening_book(WORDS, 5)
+            path = OpeningBook.book_path(5)
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(OpeningBook.load_opening_book(path).to_dict(), book.to_dict())
+
+            rebuilt = OpeningBook.get_opening_book(WORDS + ["STEAL"], 5)
+            self.assertNotEqual(rebuilt.source_hash, book.source_hash)
+            self.assertEqual(OpeningBook.load_opening_book(path).source_hash, rebuilt.source_hash)
+
+    def test_background_rebuild(self):
+        """Test that a stale book is built off the calling thread and handed to on_ready."""
+        ready = threading.Event()
+        books = []
+
+        def on_ready(book):
+            books.append((book, threading.current_thread()))
+            ready.set()
+
+        with patch("settings.OpeningBook.BOOK_DIR", self.tmp.name):
+            self.assertIsNone(OpeningBook.get_opening_book(WORDS, 5, on_ready=on_ready))
+            self.assertTrue(ready.wait(10))
+            book, thread = books[0]
+            self.assertIsNot(thread, threading.current_thread())
+            self.assertEqual(book.source_hash, OpeningBook.words_hash(WORDS))
+            self.assertIs(OpeningBook.get_opening_book(WORDS, 5, on_ready=on_ready), book)
+
+    def test_books_are_keyed_per_length(self):
+        """Test that a change to another length's words keeps the book valid."""
+        with patch("settings.OpeningBook.BOOK_DIR", self.tmp.name):
+            book = OpeningBook.get_opening_book(WORDS, 5)
+            self.assertEqual(book.source_hash, OpeningBook.words_hash(WORDS))
+            OpeningBook.get_opening_book(["STEALS", "STAPLE"], 6)
+            OpeningBook.get_opening_book(["STEALS", "STAPLE", "GRATES"], 6)
+            OpeningBook._BOOKS.clear()
+            with patch("settings.OpeningBook.build_opening_book") as build:
+                self.assertEqual(OpeningBook.get_opening_book(WORDS, 5).to_dict(), book.to_dict())
+            build.assert_not_called()
+
+
+class TestDecisionTree(unittest.TestCase):
+    """Tests for building, serializing and walking the decision tree."""
+
+    def play(self, tree, secret):
+        """Walks the tree for one secret word and returns the guesses used."""
+        cursor = tree.cursor()
+        for turn in range(1, 10):
+            guess = WORDS[cursor.guess_id]
+            if guess == secret:
+                return turn
+            self.assertTrue(cursor.advance(get_pattern_string(colour_set(guess, secret, 5))))
+        self.fail("Tree did not solve the word.")
+
+    def test_tree_solves_every_word(self):
+        """Test that the serialized tree solves all words within its reported cost."""
+        for metric in DecisionTree.TREE_METRICS:
+            root = DecisionTree.build_tree(WORDS, metric, workers=1)
+            data = DecisionTree.serialize_tree(root, 5, metric, "0123456789abcdef", len(WORDS))
+            tree = DecisionTree.DecisionTree(data)
+            self.assertEqual(tree.metric, metric)
+            turns = [self.play(tree, secret) for secret in WORDS]
+            self.assertEqual(sum(turns), root.total)
+            self.assertEqual(max(turns), root.worst)
+
+    def test_unknown_feedback_leaves_tree(self):
+        """Test that feedback the tree never expects is reported."""
+        root = DecisionTree.build_tree(WORDS, workers=1)
+        tree = DecisionTree.DecisionTree(
+            DecisionTree.serialize_tree(root, 5, "expected", "0123456789abcdef", len(WORDS)))
+        self.assertFalse(tree.cursor().advance("yyyyy"))
+
+    def test_stored_tree_is_keyed_per_length(self):
+        """Test that the stored tree matches its own length's word list only."""
+        root = DecisionTree.build_tree(WORDS, workers=1)
+        data = DecisionTree.serialize_tree(root, 5, "expected", OpeningBook.words_hash(WORDS), len(WORDS))
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch("settings.DecisionTree.BOOK_DIR", temp_dir):
+            DecisionTree.save_tree(data, DecisionTree.tree_path(5))
+            self.assertIsNotNone(DecisionTree.load_decision_tree(WORDS, 5))
+            self.assertIsNone(DecisionTree.load_decision_tree(WORDS[:-1] + ["STEAL"], 5))
+
+    def test_rejects_other_files(self):
+        """Test that a file without the tree header is refused."""
+        with self.assertRaises(ValueError):
+            DecisionTree.DecisionTree(b"NOTATREE" + bytes(64))
+
+
+class TestSolverWorker(unittest.TestCase):
+    """Tests for the background solver worker."""
+
+    def setUp(self):
+        """Start a fresh worker for each test."""
+        self.worker = SolverWorker()
+
+    def tearDown(self):
+        """Stop the worker's thread."""
+        self.worker.shutdown()
+
+    def wait_for_result(self):
+        """Waits for the current job to finish and polls its result."""
+        concurrent.futures.wait([self.worker.current.future], timeout=10)
+        return self.worker.poll()
+
+    def test_result_is_handed_back(self):
+        """Test that a finished job is returned once with its timing."""
+        state = SolverState.from_words(WORDS)
+        self.worker.submit(lambda s: s.best_guess(), state)
+        job, guess = self.wait_for_result()
+        self.assertIn(guess, WORDS)
+        self.assertGreaterEqual(job.elapsed(), 0.0)
+        self.assertIsNone(self.worker.poll())
+        self.assertFalse(self.worker.busy)
+
+    def test_cancel_discards_pending_job(self):
+        """Test that a cancelled job never hands back its result."""
+        release = threading.Event()
+        self.worker.submit(release.wait)
+        queued = self.worker.submit(lambda: "STALE")
+        queued.cancel()
+        self.worker.cancel()
+        release.set()
+        self.assertTrue(queued.cancelled)
+        self.assertIsNone(self.worker.poll())
+
+    def test_cancel_interrupts_running_job(self):
+        """Test that a running cancellable job stops and does not hold up the next one."""
+        started = threading.Event()
+        stopped = threading.Event()
+
+        def solve(cancel):
+            started.set()
+            while not cancel.wait(0.01):
+                pass
+            stopped.set()
+            raise Cancelled()
+
+        stale = self.worker.submit(solve, cancellable=True)
+        self.assertTrue(started.wait(5))
+        self.worker.submit(lambda: "FRESH")
+        self.assertTrue(stale.cancelled)
+        self.assertTrue(stopped.wait(5))
+        job, result = self.wait_for_result()
+        self.assertEqual(result, "FRESH")
+
+    def test_cancel_event_stops_the_search(self):
+        """Test that a set cancel event aborts best_guess between scoring blocks."""
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(Cancelled):
+            SolverState.from_words(WORDS).best_guess(cancel=cancel)
+
+    def test_elapsed_counts_only_running_time(self):
+        """Test that time spent queued behind another job is not counted."""
+        release = threading.Event()
+        self.worker._executor.submit(release.wait)
+        job = self.worker.submit(lambda: "DONE")
+        time.sleep(0.2)
+        self.assertEqual(job.elapsed(), 0.0)
+        release.set()
+        job, _ = self.wait_for_result()
+        self.assertLess(job.elapsed(), 0.2)
+
+    def test_failed_job_is_reported_not_raised(self):
+        """Test that poll hands back a failed job with its error instead of raising."""
+        def fail():
+            raise ValueError("boom")
+
+        self.worker.submit(fail)
+        with patch("builtins.print"):
+            job, result = self.wait_for_result()
+        self.assertIsNone(result)
+        self.assertIsInstance(job.error, ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Unit tests for the bot tournament runner.
+"""
+import unittest
+
+from benchmarks.bench_tournament import Contestant, STRATEGIES, summarize, format_table
+from settings import Logic
+
+WORDS = ["APPLE", "CRANE", "SLATE", "PLANE", "GRAPE", "TRACE", "BRAKE", "FLAME"]
+
+
+def setUpModule():
+    """Makes WORDS the dictionary, so the solvers guess from it alone."""
+    Logic.use_dictionary(WORDS)
+
+
+def tearDownModule():
+    """Goes back to the word file's dictionary."""
+    Logic._DICTIONARY_WORDS.clear()
+    Logic._FEEDBACK_MATRICES.clear()
+
+
+class TestTournament(unittest.TestCase):
+    """Tests for the contestants and the report."""
+
+    def test_every_strategy_plays_to_the_end(self):
+        """Test that each strategy finishes a game and times every move."""
+        for strategy in STRATEGIES:
+            contestant = Contestant(strategy, WORDS, max_attempts=6)
+            for seed, secret in enumerate(WORDS[:3]):
+                guesses, move_times = contestant.play(secret, seed)
+                self.assertTrue(0 <= guesses <= 6, strategy)
+                self.assertEqual(len(move_times), guesses or 6)
+
+    def test_games_are_reproducible(self):
+        """Test that the same seed replays the same game."""
+        contestant = Contestant("random", WORDS)
+        self.assertEqual(contestant.play("GRAPE", 7)[0], contestant.play("GRAPE", 7)[0])
+
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with self.assertRaises(ValueError):
+            Contestant("oracle", WORDS)
+
+    def test_summarize(self):
+        """Test the distribution, failure rate and timing statistics."""
+        stats = summarize([3, 4, 0, 4], [0.001] * 10, 2.0, 6)
+        self.assertEqual(stats["distribution"], {"1": 0, "2": 0, "3": 1, "4": 2, "5": 0, "6": 0, "X": 1})
+        self.assertAlmostEqual(stats["failure_rate"], 0.25)
+        self.assertAlmostEqual(stats["mean_guesses"], 11 / 3)
+        self.assertAlmostEqual(stats["mean_move_ms"], 1.0)
+        self.assertAlmostEqual(stats["games_per_second"], 2.0)
+        self.assertIn("solver", format_table({"solver": stats}, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,7 +50,7 @@ class TestAppNavigation(unittest.TestCase):
     # --- MAIN MENU NAVIGATION ---
 
     @patch('pygame.quit')
-    @patch('settings.Logic.Button.is_clicked')
+    @patch('settings.Button.Button.is_clicked')
     @patch('pygame.event.get')
     @patch('wordle.SettingsMenu.settings_menu')
     def test_navigate_to_settings(self, mock_settings, mock_events, mock_btn, _mock_quit):
@@ -65,7 +65,7 @@ class TestAppNavigation(unittest.TestCase):
         mock_settings.assert_called_once()
 
     @patch('pygame.quit')
-    @patch('settings.Logic.Button.is_clicked')
+    @patch('settings.Button.Button.is_clicked')
     @patch('pygame.event.get')
     @patch('wordle.PveMode.run_pve')
     def test_navigate_to_pve(self, mock_pve, mock_events, mock_btn, _mock_quit):
@@ -80,7 +80,7 @@ class TestAppNavigation(unittest.TestCase):
         mock_pve.assert_called_once()
 
     @patch('pygame.quit')
-    @patch('settings.Logic.Button.is_clicked')
+    @patch('settings.Button.Button.is_clicked')
     @patch('pygame.event.get')
     @patch('wordle.Leaderboard.show_leaderboard')
     def test_navigate_to_ranklist(self, mock_rank, mock_events, mock_btn, _mock_quit):
@@ -0,0 +1,82 @@
+"""
+Unit tests for the compiled, memory-mapped word store.
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from settings import WordStore
+from settings.Logic import load_valid_words
+
+
+class TestWordStore(unittest.TestCase):
+    """Tests for the compiled, memory-mapped dictionary."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.words_file = os.path.join(self.temp_dir.name, "words.txt")
+        self.write_words("apple\nCRANE\nbad-1\nhello\nabcdef\n")
+
+    def tearDown(self):
+        for store in WordStore._STORES.values():
+            store.close()
+        WordStore._STORES.clear()
+        self.temp_dir.cleanup()
+
+    def write_words(self, text, mtime_ns=None):
+        with open(self.words_file, "w", encoding="utf-8") as f:
+            f.write(text)
+        if mtime_ns is not None:
+            os.utime(self.words_file, ns=(mtime_ns, mtime_ns))
+
+    def test_shards_match_text_loader(self):
+        """Test that the store returns what parsing the text file returns."""
+        words = load_valid_words(self.words_file, 5)
+        self.assertEqual(words, ["APPLE", "CRANE", "HELLO"])
+        self.assertEqual(load_valid_words(self.words_file, 6), ["ABCDEF"])
+        self.assertTrue(os.path.exists(WordStore.store_path(self.words_file)))
+
+        records = WordStore.get_word_store(self.words_file).records(5)
+        self.assertEqual(records.dtype.itemsize, 5)
+        self.assertFalse(records.flags.owndata)
+
+    def test_rebuilds_when_text_changes(self):
+        """Test that an edited word file is recompiled, and a touched one is not."""
+        self.write_words("apple\ncrane\n", mtime_ns=1_000_000_000)
+        self.assertEqual(load_valid_words(self.words_file, 5), ["APPLE", "CRANE"])
+
+        self.write_words("apple\nslate\n", mtime_ns=2_000_000_000)
+        self.assertEqual(load_valid_words(self.words_file, 5), ["APPLE", "SLATE"])
+
+        store = WordStore.get_word_store(self.words_file)
+        os.utime(self.words_file, ns=(3_000_000_000, 3_000_000_000))
+        self.assertIs(WordStore.get_word_store(self.words_file), store)
+
+    def test_touched_file_is_hashed_once(self):
+        """Test that a touch with unchanged contents is recorded, so later checks skip the hash."""
+        self.write_words("apple\ncrane\n", mtime_ns=1_000_000_000)
+        store = WordStore.get_word_store(self.words_file)
+        os.utime(self.words_file, ns=(2_000_000_000, 2_000_000_000))
+        self.assertIs(WordStore.get_word_store(self.words_file), store)
+
+        with patch('settings.WordStore.content_hash') as content_hash:
+            self.assertIs(WordStore.get_word_store(self.words_file), store)
+        content_hash.assert_not_called()
+        reopened = WordStore.WordStore(store.path)
+        self.assertEqual(reopened.source_mtime_ns, 2_000_000_000)
+        reopened.close()
+
+    def test_rejects_other_versions(self):
+        """Test that a store from another format version is recompiled."""
+        path = WordStore.compile_store(self.words_file)
+        with open(path, "r+b") as f:
+            f.seek(5)
+            f.write(bytes([WordStore.STORE_VERSION + 1]))
+        with self.assertRaises(ValueError):
+            WordStore.WordStore(path)
+        self.assertEqual(load_valid_words(self.words_file, 5), ["APPLE", "CRANE", "HELLO"])
+
+
+if __name__ == '__main__':
+    unittest.main()
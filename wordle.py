@@ -7,7 +7,7 @@ from typing import Optional, List, Dict, Any
 import pygame
 
 from modes import AiMode, PlayerMode, PveMode
-from settings.Logic import Button
+from settings.Button import Button
 from settings import SettingsMenu
 from settings import Leaderboard
 from settings import DifficultyMenu